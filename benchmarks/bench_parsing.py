@@ -0,0 +1,121 @@
+"""Compare response parsing strategies on a page of 1k threads.
+
+"trusted model_construct" is the rejected mode that builds the models
+without validation (leaving timestamps as strings); it is kept here so the
+comparison with `parse_response_body` can be rerun.
+
+Run from the repository root with: PYTHONPATH=. python benchmarks/bench_parsing.py
+"""
+
+import json
+import timeit
+import typing
+
+from pydantic import BaseModel, TypeAdapter
+
+from melodi.parsing import parse_response, parse_response_body
+from melodi.threads.data_models import ThreadsPagedResponse
+
+PAGE_SIZE = 1000
+MESSAGES_PER_THREAD = 6
+REPEAT = 5
+
+
+def _user(index: int) -> dict:
+    return {
+        "id": index,
+        "externalId": f"user-{index}",
+        "email": f"user-{index}@example.com",
+        "segments": [
+            {"id": 1, "name": "enterprise", "type": {"id": 1, "name": "plan"}},
+        ],
+    }
+
+
+def _feedback(index: int) -> dict:
+    return {
+        "id": index,
+        "projectId": 1,
+        "feedbackType": "POSITIVE",
+        "externalUser": _user(index),
+        "attributeOptions": [
+            {"id": 1, "name": "helpful", "attribute": {"id": 1, "name": "quality"}},
+        ],
+        "createdAt": "2024-05-01T12:00:00.000Z",
+        "updatedAt": "2024-05-01T12:00:00.000Z",
+    }
+
+
+def _message(index: int) -> dict:
+    return {
+        "id": index,
+        "externalId": f"message-{index}",
+        "role": "assistant" if index % 2 else "user",
+        "content": "Lorem ipsum dolor sit amet " * 8,
+        "metadata": {"model": "gpt-4o", "total_tokens": 512},
+        "issueAssociations": [
+            {
+                "id": index,
+                "issueId": 1,
+                "messageId": index,
+                "issue": {"id": 1, "name": "hallucination", "createdAt": "2024-05-01T12:00:00.000Z"},
+            }
+        ],
+        "externalFeedback": [_feedback(index)] if index % 3 == 0 else [],
+    }
+
+
+def _thread(index: int) -> dict:
+    return {
+        "id": index,
+        "organizationId": 1,
+        "externalId": f"thread-{index}",
+        "project": {"id": 1, "name": "bench"},
+        "externalUser": _user(index),
+        "messages": [_message(index * MESSAGES_PER_THREAD + i) for i in range(MESSAGES_PER_THREAD)],
+        "metadata": {"model": "gpt-4o"},
+        "createdAt": "2024-05-01T12:00:00.000Z",
+        "updatedAt": "2024-05-01T12:00:00.000Z",
+    }
+
+
+def _construct(annotation, value):
+    """Build `value` as `annotation` without validation, the prototyped 'trusted' mode."""
+    if value is None:
+        return None
+
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        # Optional[X]: build as the first non-None member
+        annotation = next(arg for arg in typing.get_args(annotation) if arg is not type(None))
+        origin = typing.get_origin(annotation)
+    if origin is list:
+        (item_type,) = typing.get_args(annotation)
+        return [_construct(item_type, item) for item in value]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation.model_construct(**{
+            name: _construct(field.annotation, value[name])
+            for name, field in annotation.model_fields.items()
+            if name in value
+        })
+    return value
+
+
+def main():
+    page = {"count": PAGE_SIZE, "rows": [_thread(i) for i in range(PAGE_SIZE)]}
+    body = json.dumps(page).encode()
+
+    strategies = {
+        "TypeAdapter per call": lambda: TypeAdapter(ThreadsPagedResponse).validate_python(json.loads(body)),
+        "parse_response": lambda: parse_response(ThreadsPagedResponse, json.loads(body)),
+        "parse_response_body": lambda: parse_response_body(ThreadsPagedResponse, body),
+        "trusted model_construct": lambda: _construct(ThreadsPagedResponse, json.loads(body)),
+    }
+
+    for name, strategy in strategies.items():
+        best = min(timeit.repeat(strategy, number=1, repeat=REPEAT))
+        print(f"{name:<24} {best * 1000:8.1f} ms / page of {PAGE_SIZE} threads")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Measure MessagesClient.get_many throughput and latency against the in-process fake API.
+
+Run from the repository root with: PYTHONPATH=. python benchmarks/bench_transport.py
+"""
+
+import statistics
+import time
+
+from melodi.melodi_client import MelodiClient
+from melodi.testing import FakeMelodiTransport
+
+MESSAGES = 2000
+LATENCY = 0.005
+ERROR_RATE = 0.01
+SEED = 1
+
+
+def _latency(rng) -> float:
+    # Mostly fast responses with a slow tail
+    return LATENCY * (10 if rng.random() < 0.01 else 1)
+
+
+def main():
+    transport = FakeMelodiTransport(latency=_latency, seed=SEED)
+    client = MelodiClient(api_key="bench", transport=transport)
+
+    message_ids = []
+    for index in range(MESSAGES // 2):
+        response = transport.request(
+            "POST",
+            f"{client.base_url}/api/external/threads?apiKey=bench",
+            json={
+                "externalId": f"thread-{index}",
+                "messages": [{"role": "user", "content": "Hello"}, {"role": "assistant", "content": "Hi"}],
+            },
+        )
+        message_ids.extend(message["id"] for message in response.json()["messages"])
+    transport.stats.clear()
+    transport.status_codes.clear()
+    transport.error_rate = ERROR_RATE
+
+    for max_workers in [1, 4, 16]:
+        start = time.monotonic()
+        results = client.messages.get_many(message_ids, max_workers=max_workers)
+        elapsed = time.monotonic() - start
+
+        latencies = sorted(latency for latencies in transport.stats.values() for latency in latencies)
+        failed = sum(not result.ok for result in results.values())
+        print(
+            f"max_workers={max_workers:<3} {len(message_ids) / elapsed:8.0f} messages/s"
+            f"  p50 {statistics.median(latencies) * 1000:5.1f} ms"
+            f"  p99 {latencies[int(len(latencies) * 0.99)] * 1000:5.1f} ms"
+            f"  failed {failed}"
+        )
+        transport.stats.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Columnar analytics over fetched threads.
+
+```python
+columns = to_columns(client.threads.iter_all(ThreadsQueryParams(projectId=1, includeFeedback=True)))
+for summary in summarize(columns, by="model"):
+    print(summary.key, summary.negative_feedback_rate, summary.total_tokens_p95)
+```
+
+Threads are flattened once into NumPy arrays, with selected metadata values
+promoted to typed columns, and every summary is computed with array
+operations over those columns. `to_dataframe` returns the same columns as a
+pandas DataFrame when pandas is installed.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from melodi.threads.data_models import ThreadResponse, ThreadsPagedResponse
+
+try:
+    import numpy as np
+except ImportError:
+    raise ModuleNotFoundError("numpy not installed, please run: 'pip install numpy'")
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+DEFAULT_METADATA_COLUMNS = {
+    "model": str,
+    "total_tokens": float,
+    "prompt_tokens": float,
+    "completion_tokens": float,
+    "latency_ms": float,
+}
+
+# Group keys that a thread can have several of, stored as (thread index, label) pairs
+_MULTI_VALUED_KEYS = ("segment", "issue", "intent")
+
+
+@dataclass
+class ThreadColumns:
+    id: "np.ndarray"
+    project_id: "np.ndarray"
+    created_at: "np.ndarray"
+    outcome: "np.ndarray"
+    message_count: "np.ndarray"
+    positive_feedback: "np.ndarray"
+    negative_feedback: "np.ndarray"
+    metadata: Dict[str, "np.ndarray"] = field(default_factory=dict)
+    # "segment" / "issue" / "intent" -> (thread index, label) arrays
+    associations: Dict[str, Tuple["np.ndarray", "np.ndarray"]] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+
+@dataclass
+class GroupSummary:
+    key: Optional[str]
+    threads: int
+    positive_feedback: int
+    negative_feedback: int
+    feedback_rate: float
+    negative_feedback_rate: float
+    total_tokens: float
+    total_tokens_p50: float
+    total_tokens_p95: float
+    latency_ms_p50: float
+    latency_ms_p95: float
+    outcomes: Dict[str, int]
+
+
+def to_columns(
+    threads: Iterable[Union[ThreadResponse, ThreadsPagedResponse]],
+    metadata_columns: Dict[str, type] = DEFAULT_METADATA_COLUMNS,
+) -> ThreadColumns:
+    """Flatten threads, or pages of threads, into `ThreadColumns`.
+
+    Each promoted metadata value is read from the thread metadata, falling
+    back to the latest message that has it. Float columns hold NaN where the
+    value is missing or not numeric, string columns hold None.
+    """
+    ids, project_ids, created_at, outcomes = [], [], [], []
+    message_counts, positive_feedback, negative_feedback = [], [], []
+    metadata = {name: [] for name in metadata_columns}
+    associations = {key: ([], []) for key in _MULTI_VALUED_KEYS}
+
+    for thread in _iter_threads(threads):
+        index = len(ids)
+        ids.append(thread.id)
+        project_ids.append(thread.project.id)
+        created_at.append(_utc(thread.createdAt))
+        outcomes.append(thread.outcome)
+        message_counts.append(len(thread.messages))
+
+        positive = negative = 0
+        # Ordered sets of labels: a label counts once per thread, however many of its messages carry it
+        labels = {key: {} for key in _MULTI_VALUED_KEYS}
+        for message in thread.messages:
+            for feedback in message.externalFeedback:
+                if feedback.feedbackType == "POSITIVE":
+                    positive += 1
+                elif feedback.feedbackType == "NEGATIVE":
+                    negative += 1
+            for association in message.issueAssociations:
+                labels["issue"][association.issue.name] = None
+            for association in message.intentAssociations:
+                labels["intent"][association.intent.name] = None
+        positive_feedback.append(positive)
+        negative_feedback.append(negative)
+
+        if thread.externalUser is not None:
+            for segment in thread.externalUser.segments:
+                labels["segment"][f"{segment.type.name}:{segment.name}"] = None
+
+        for key, thread_labels in labels.items():
+            for label in thread_labels:
+                _append_association(associations[key], index, label)
+
+        for name in metadata_columns:
+            metadata[name].append(_metadata_value(thread, name))
+
+    return ThreadColumns(
+        id=np.array(ids, dtype=np.int64),
+        project_id=np.array(project_ids, dtype=np.int64),
+        created_at=np.array(created_at, dtype="datetime64[us]"),
+        outcome=np.array(outcomes, dtype=object),
+        message_count=np.array(message_counts, dtype=np.int32),
+        positive_feedback=np.array(positive_feedback, dtype=np.int32),
+        negative_feedback=np.array(negative_feedback, dtype=np.int32),
+        metadata={
+            name: _typed_array(metadata[name], column_type)
+            for name, column_type in metadata_columns.items()
+        },
+        associations={
+            key: (np.array(indices, dtype=np.int64), np.array(labels, dtype=object))
+            for key, (indices, labels) in associations.items()
+        },
+    )
+
+
+def to_dataframe(columns: ThreadColumns) -> "pd.DataFrame":
+    """One row per thread, with promoted metadata as columns."""
+    if pd is None:
+        raise ModuleNotFoundError("pandas not installed, please run: 'pip install pandas'")
+
+    return pd.DataFrame({
+        "id": columns.id,
+        "projectId": columns.project_id,
+        "createdAt": columns.created_at,
+        "outcome": columns.outcome,
+        "messageCount": columns.message_count,
+        "positiveFeedback": columns.positive_feedback,
+        "negativeFeedback": columns.negative_feedback,
+        **columns.metadata,
+    })
+
+
+def summarize(columns: ThreadColumns, by: Optional[str] = None) -> List[GroupSummary]:
+    """Feedback rates, token usage, latency and outcomes per group.
+
+    `by` is None for a single summary over every thread, "project",
+    "outcome", a promoted metadata column such as "model", or one of
+    "segment", "issue" and "intent". A thread with several segments, issues
+    or intents counts towards each of them; threads without a value are
+    grouped under the key None.
+    """
+    thread_indices, labels = _group_labels(columns, by)
+    keys, codes = np.unique(labels, return_inverse=True)
+    group_count = len(keys)
+
+    positive = columns.positive_feedback[thread_indices]
+    negative = columns.negative_feedback[thread_indices]
+    threads = np.bincount(codes, minlength=group_count)
+    positive_sums = np.bincount(codes, weights=positive, minlength=group_count)
+    negative_sums = np.bincount(codes, weights=negative, minlength=group_count)
+    with_feedback = np.bincount(codes, weights=(positive + negative) > 0, minlength=group_count)
+    with_negative = np.bincount(codes, weights=negative > 0, minlength=group_count)
+
+    tokens = _float_column(columns, "total_tokens")[thread_indices]
+    latency = _float_column(columns, "latency_ms")[thread_indices]
+    token_sums = np.bincount(codes, weights=np.nan_to_num(tokens), minlength=group_count)
+    token_percentiles = _group_percentiles(codes, tokens, group_count, [50, 95])
+    latency_percentiles = _group_percentiles(codes, latency, group_count, [50, 95])
+
+    outcome_labels = _labels(columns.outcome[thread_indices])
+    outcome_keys, outcome_codes = np.unique(outcome_labels, return_inverse=True)
+    outcome_counts = np.zeros((group_count, len(outcome_keys)), dtype=np.int64)
+    np.add.at(outcome_counts, (codes, outcome_codes), 1)
+
+    return [
+        GroupSummary(
+            key=str(keys[group]) or None,
+            threads=int(threads[group]),
+            positive_feedback=int(positive_sums[group]),
+            negative_feedback=int(negative_sums[group]),
+            feedback_rate=float(with_feedback[group] / threads[group]),
+            negative_feedback_rate=float(with_negative[group] / threads[group]),
+            total_tokens=float(token_sums[group]),
+            total_tokens_p50=float(token_percentiles[group, 0]),
+            total_tokens_p95=float(token_percentiles[group, 1]),
+            latency_ms_p50=float(latency_percentiles[group, 0]),
+            latency_ms_p95=float(latency_percentiles[group, 1]),
+            outcomes={
+                str(outcome_keys[outcome]) or None: int(count)
+                for outcome, count in enumerate(outcome_counts[group])
+                if count
+            },
+        )
+        for group in range(group_count)
+    ]
+
+
+def _iter_threads(threads: Iterable[Union[ThreadResponse, ThreadsPagedResponse]]) -> Iterable[ThreadResponse]:
+    for item in threads:
+        if isinstance(item, ThreadsPagedResponse):
+            yield from item.rows
+        else:
+            yield item
+
+
+def _utc(value: datetime) -> datetime:
+    # NumPy datetimes are timezone naive
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _append_association(association: Tuple[list, list], index: int, label: str):
+    association[0].append(index)
+    association[1].append(label)
+
+
+def _metadata_value(thread: ThreadResponse, name: str):
+    if name in thread.metadata:
+        return thread.metadata[name]
+
+    for message in reversed(thread.messages):
+        if name in message.metadata:
+            return message.metadata[name]
+
+    return None
+
+
+def _typed_array(values: list, column_type: type) -> "np.ndarray":
+    if column_type is float or column_type is int:
+        return np.array([_to_float(value) for value in values], dtype=np.float64)
+
+    return np.array([None if value is None else str(value) for value in values], dtype=object)
+
+
+def _to_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _float_column(columns: ThreadColumns, name: str) -> "np.ndarray":
+    column = columns.metadata.get(name)
+    if column is None or column.dtype != np.float64:
+        return np.full(len(columns), np.nan)
+    return column
+
+
+def _labels(values: "np.ndarray") -> "np.ndarray":
+    """String labels for grouping, with missing values as the empty string."""
+    return np.array(["" if value is None else str(value) for value in values], dtype=str)
+
+
+def _group_labels(columns: ThreadColumns, by: Optional[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Return (thread index, label) pairs for grouping by `by`."""
+    all_threads = np.arange(len(columns))
+
+    if by is None:
+        return all_threads, np.full(len(columns), "all")
+    if by == "project":
+        return all_threads, columns.project_id.astype(str)
+    if by == "outcome":
+        return all_threads, _labels(columns.outcome)
+    if by in columns.metadata:
+        return all_threads, _labels(columns.metadata[by])
+    if by in columns.associations:
+        indices, labels = columns.associations[by]
+        # Threads without any association still count, under the key None
+        unassociated = np.setdiff1d(all_threads, indices)
+        return (
+            np.concatenate([indices, unassociated]),
+            np.concatenate([_labels(labels), np.full(len(unassociated), "")]),
+        )
+
+    raise ValueError(f"Cannot group threads by {by!r}")
+
+
+def _group_percentiles(
+    codes: "np.ndarray", values: "np.ndarray", group_count: int, percentiles: List[float]
+) -> "np.ndarray":
+    """Per-group percentiles of `values`, ignoring NaN; NaN for groups without values."""
+    result = np.full((group_count, len(percentiles)), np.nan)
+    present = ~np.isnan(values)
+    codes, values = codes[present], values[present]
+    if not len(values):
+        return result
+
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    boundaries = np.flatnonzero(np.diff(codes)) + 1
+    for group_values, group in zip(np.split(values, boundaries), codes[np.r_[0, boundaries]]):
+        result[group] = np.percentile(group_values, percentiles)
+
+    return result
@@ -0,0 +1,291 @@
+"""
+Append-only local archive of threads with random access by `id` and `externalId`.
+
+```python
+with ThreadArchiveWriter("threads.archive") as writer:
+    writer.write(client.threads.iter_all(ThreadsQueryParams(projectId=1)))
+
+with ThreadArchive("threads.archive") as archive:
+    thread = archive.get(1234)
+    for thread in archive:
+        ...
+```
+
+The archive is two files. `<path>` holds the records, each a fixed header
+(`id`, `externalId` length, payload length), the `externalId` and the
+thread as compact JSON. `<path>.idx` holds the record offsets sorted by
+`id` and by `externalId`, rewritten whenever a writer is closed. Both are
+memory mapped by `ThreadArchive`, so lookups are binary searches over the
+index and scans hand out views of the records without copying or decoding
+them. When the same thread is appended more than once, lookups return the
+latest copy.
+"""
+
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from melodi.parsing import parse_response_body
+from melodi.threads.data_models import ThreadResponse
+
+_DATA_MAGIC = b"MELODIA1"
+_INDEX_MAGIC = b"MELODIX1"
+
+# id, externalId length, payload length
+_RECORD_HEADER = struct.Struct("<qHI")
+# index magic, data file size covered by the index, id entry count, externalId entry count
+_INDEX_HEADER = struct.Struct("<8sQQQ")
+# id, payload offset, payload length
+_ID_ENTRY = struct.Struct("<qQI")
+# key offset in the key blob, key length, payload offset, payload length
+_EXTERNAL_ID_ENTRY = struct.Struct("<QHQI")
+
+# (id, externalId, payload offset, payload length)
+_Entry = Tuple[int, bytes, int, int]
+
+
+class ThreadArchiveWriter:
+    """Append `ThreadResponse` records to an archive, creating it if needed."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = path + ".idx"
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            _check_magic(path, _DATA_MAGIC)
+
+        self.file = open(path, "ab")
+        self._start = self.file.tell()
+        if self._start == 0:
+            self.file.write(_DATA_MAGIC)
+
+        self._entries: List[_Entry] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def append(self, thread: ThreadResponse):
+        external_id = (thread.externalId or "").encode("utf-8")
+        payload = thread.model_dump_json(exclude_defaults=True).encode("utf-8")
+
+        offset = self.file.tell() + _RECORD_HEADER.size + len(external_id)
+        self.file.write(_RECORD_HEADER.pack(thread.id, len(external_id), len(payload)))
+        self.file.write(external_id)
+        self.file.write(payload)
+        self._entries.append((thread.id, external_id, offset, len(payload)))
+
+    def write(self, threads: Iterable[ThreadResponse]) -> int:
+        written = 0
+        for thread in threads:
+            self.append(thread)
+            written += 1
+
+        return written
+
+    def close(self):
+        if self.file.closed:
+            return
+
+        self.file.close()
+        entries = self._existing_entries() + self._entries
+        _write_index(self.index_path, entries, os.path.getsize(self.path))
+
+    def _existing_entries(self) -> List[_Entry]:
+        if self._start <= len(_DATA_MAGIC):
+            return []
+
+        entries = _read_index_entries(self.index_path, self._start)
+        if entries is None:
+            # Missing or stale index, rebuild it from the record headers
+            entries = _scan_entries(self.path, self._start)
+
+        return entries
+
+
+class ThreadArchive:
+    """Read-only, memory mapped view of an archive written by `ThreadArchiveWriter`.
+
+    Views returned by `get_raw` and `scan` point into the mapping and must be
+    released before the archive is closed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+        _check_magic(path, _DATA_MAGIC)
+        self._data = _map(path)
+        self._index = _map(path + ".idx")
+
+        magic, self._data_size, self._id_count, self._external_id_count = _INDEX_HEADER.unpack_from(self._index)
+        if magic != _INDEX_MAGIC:
+            raise ValueError(f"{path}.idx is not a Melodi archive index")
+        if self._data_size > len(self._data):
+            raise ValueError(f"{path}.idx does not match {path}")
+
+        self._id_entries_start = _INDEX_HEADER.size
+        self._external_id_entries_start = self._id_entries_start + self._id_count * _ID_ENTRY.size
+        self._keys_start = self._external_id_entries_start + self._external_id_count * _EXTERNAL_ID_ENTRY.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+    def __len__(self) -> int:
+        """Number of records, including superseded copies of re-appended threads."""
+        return self._id_count
+
+    def __iter__(self) -> Iterator[ThreadResponse]:
+        for payload in self.scan():
+            yield parse_response_body(ThreadResponse, bytes(payload))
+
+    def get(self, thread_id: int) -> Optional[ThreadResponse]:
+        payload = self.get_raw(thread_id)
+        return parse_response_body(ThreadResponse, bytes(payload)) if payload is not None else None
+
+    def get_by_external_id(self, external_id: str) -> Optional[ThreadResponse]:
+        payload = self.get_raw_by_external_id(external_id)
+        return parse_response_body(ThreadResponse, bytes(payload)) if payload is not None else None
+
+    def get_raw(self, thread_id: int) -> Optional[memoryview]:
+        """JSON of the thread with `thread_id`, without decoding it."""
+        position = _bisect_right(self._id_count, lambda i: self._id_entry(i)[0] <= thread_id)
+        if position == 0:
+            return None
+
+        entry_id, offset, length = self._id_entry(position - 1)
+        return self._view(offset, length) if entry_id == thread_id else None
+
+    def get_raw_by_external_id(self, external_id: str) -> Optional[memoryview]:
+        key = external_id.encode("utf-8")
+        position = _bisect_right(self._external_id_count, lambda i: self._external_id_key(i) <= key)
+        if position == 0 or self._external_id_key(position - 1) != key:
+            return None
+
+        _, _, offset, length = self._external_id_entry(position - 1)
+        return self._view(offset, length)
+
+    def scan(self) -> Iterator[memoryview]:
+        """Views of every record's JSON in the order they were appended."""
+        position = len(_DATA_MAGIC)
+        while position < self._data_size:
+            _, external_id_length, length = _RECORD_HEADER.unpack_from(self._data, position)
+            offset = position + _RECORD_HEADER.size + external_id_length
+            yield self._view(offset, length)
+            position = offset + length
+
+    def _view(self, offset: int, length: int) -> memoryview:
+        return memoryview(self._data)[offset:offset + length]
+
+    def _id_entry(self, i: int) -> Tuple[int, int, int]:
+        return _ID_ENTRY.unpack_from(self._index, self._id_entries_start + i * _ID_ENTRY.size)
+
+    def _external_id_entry(self, i: int) -> Tuple[int, int, int, int]:
+        return _EXTERNAL_ID_ENTRY.unpack_from(
+            self._index, self._external_id_entries_start + i * _EXTERNAL_ID_ENTRY.size
+        )
+
+    def _external_id_key(self, i: int) -> bytes:
+        key_offset, key_length, _, _ = self._external_id_entry(i)
+        start = self._keys_start + key_offset
+        return self._index[start:start + key_length]
+
+
+def _map(path: str) -> mmap.mmap:
+    with open(path, "rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _check_magic(path: str, magic: bytes):
+    with open(path, "rb") as file:
+        if file.read(len(magic)) != magic:
+            raise ValueError(f"{path} is not a Melodi archive")
+
+
+def _bisect_right(count: int, is_at_or_before) -> int:
+    """Index of the first entry for which `is_at_or_before` is false, over entries sorted by key."""
+    low, high = 0, count
+    while low < high:
+        middle = (low + high) // 2
+        if is_at_or_before(middle):
+            low = middle + 1
+        else:
+            high = middle
+
+    return low
+
+
+def _scan_entries(path: str, end: int) -> List[_Entry]:
+    entries = []
+    with open(path, "rb") as file:
+        file.seek(len(_DATA_MAGIC))
+        position = len(_DATA_MAGIC)
+        while position < end:
+            thread_id, external_id_length, length = _RECORD_HEADER.unpack(file.read(_RECORD_HEADER.size))
+            external_id = file.read(external_id_length)
+            offset = position + _RECORD_HEADER.size + external_id_length
+            entries.append((thread_id, external_id, offset, length))
+            position = offset + length
+            file.seek(position)
+
+    return entries
+
+
+def _read_index_entries(index_path: str, data_size: int) -> Optional[List[_Entry]]:
+    """Entries of an index covering exactly `data_size` bytes of records, or None."""
+    if not os.path.exists(index_path):
+        return None
+
+    with open(index_path, "rb") as file:
+        index = file.read()
+
+    magic, covered_size, id_count, external_id_count = _INDEX_HEADER.unpack_from(index)
+    if magic != _INDEX_MAGIC or covered_size != data_size:
+        return None
+
+    # externalIds are only stored in the externalId section, keyed by payload offset
+    external_ids = {}
+    position = _INDEX_HEADER.size + id_count * _ID_ENTRY.size
+    keys_start = position + external_id_count * _EXTERNAL_ID_ENTRY.size
+    for key_offset, key_length, offset, _ in _EXTERNAL_ID_ENTRY.iter_unpack(index[position:keys_start]):
+        external_ids[offset] = index[keys_start + key_offset:keys_start + key_offset + key_length]
+
+    return sorted(
+        (
+            (thread_id, external_ids.get(offset, b""), offset, length)
+            for thread_id, offset, length in _ID_ENTRY.iter_unpack(
+                index[_INDEX_HEADER.size:_INDEX_HEADER.size + id_count * _ID_ENTRY.size]
+            )
+        ),
+        key=lambda entry: entry[2],
+    )
+
+
+def _write_index(index_path: str, entries: List[_Entry], data_size: int):
+    # Sorting by (key, offset) puts the latest copy of a key last, where lookups find it
+    by_id = sorted(entries, key=lambda entry: (entry[0], entry[2]))
+    by_external_id = sorted((entry for entry in entries if entry[1]), key=lambda entry: (entry[1], entry[2]))
+
+    temporary_path = index_path + ".tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(_INDEX_HEADER.pack(_INDEX_MAGIC, data_size, len(by_id), len(by_external_id)))
+        for thread_id, _, offset, length in by_id:
+            file.write(_ID_ENTRY.pack(thread_id, offset, length))
+
+        key_offset = 0
+        for _, external_id, offset, length in by_external_id:
+            file.write(_EXTERNAL_ID_ENTRY.pack(key_offset, len(external_id), offset, length))
+            key_offset += len(external_id)
+        for _, external_id, _, _ in by_external_id:
+            file.write(external_id)
+
+    os.replace(temporary_path, index_path)
@@ -1,5 +1,153 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Callable, Hashable, Optional, Tuple, Type, TypeVar
+
+import requests
+from pydantic import BaseModel
+
+from melodi.cache import ResponseCache
+from melodi.concurrency import AsyncSingleFlight, SingleFlight
+from melodi.conditional_cache import ConditionalCache, conditional_key
+from melodi.logging import _log_melodi_http_errors
+from melodi.parsing import parse_response_body
+from melodi.rate_limit import RateLimiter
+from melodi.retry import RetryPolicy
+from melodi.transport import RequestsTransport, Transport
+
+T = TypeVar("T")
+
+
 class BaseClient:
+    cache: Optional[ResponseCache] = None
+    conditional_cache: Optional[ConditionalCache] = None
+    retry_policy: RetryPolicy = RetryPolicy()
+    rate_limiter: Optional[RateLimiter] = None
+    # Created on first use unless set, e.g. by MelodiClient to share one across its clients
+    _transport: Optional[Transport] = None
+    # Identical GETs in flight at the same time share one request, across clients with the same transport
+    coalesce_gets: bool = True
+    _in_flight_gets = SingleFlight()
+    _in_flight_gets_async = AsyncSingleFlight()
+
+    @property
+    def transport(self) -> Transport:
+        if self._transport is None:
+            self._transport = RequestsTransport()
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport: Transport):
+        self._transport = transport
+
     @staticmethod
     def _get_headers():
         return {"Content-Type": "application/json"}
 
+    @staticmethod
+    def _get_query_params(api_key: str, query_params: BaseModel) -> dict:
+        params = {"apiKey": api_key}
+        for key, value in query_params.model_dump(exclude_none=True).items():
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, bool):
+                # JSON spelling, rather than Python's "True"/"False"
+                value = "true" if value else "false"
+            params[key] = value
+
+        return params
+
+    def _read_through(
+        self, endpoint: str, query_params: Optional[BaseModel], load: Callable[[], Tuple[Any, int]]
+    ) -> Any:
+        """Read through the response cache; `load` returns the value and the size of its response body."""
+        if self.cache is None:
+            return load()[0]
+
+        return self.cache.get_or_load(endpoint, query_params, load)
+
+    def _invalidate(self, *endpoints: str):
+        if self.cache is None:
+            return
+
+        for endpoint in endpoints:
+            self.cache.invalidate(endpoint)
+
+    def _request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """Send a request through the client's retry policy and raise for error statuses.
+
+        `idempotent` overrides the classification by HTTP method, e.g. for
+        POST endpoints that are safe to repeat.
+        """
+        def send() -> requests.Response:
+            # Every attempt, retries included, waits for the rate limit
+            if self.rate_limiter is None:
+                return self.transport.request(method, url, **kwargs)
+
+            self.rate_limiter.acquire(url)
+            response = self.transport.request(method, url, **kwargs)
+            self.rate_limiter.on_response(url, response.status_code)
+            return response
+
+        response = self.retry_policy.call(method, send, idempotent=idempotent)
+
+        _log_melodi_http_errors(self.logger, response)
+        response.raise_for_status()
+        return response
+
+    def _get_parsed(self, url: str, response_type: Type[T], params: Optional[dict] = None) -> T:
+        """GET `url` and parse the body into `response_type`.
+
+        Concurrent calls for the same url and params through the same
+        transport share one request and its parsed result, as do later calls
+        answered 304 from the conditional cache. Like `ResponseCache` hits,
+        the result is shared read-only and must not be mutated; copying it
+        for every caller would cost more than parsing the body again.
+        """
+        return self._get_parsed_sized(url, response_type, params)[0]
+
+    def _get_parsed_sized(self, url: str, response_type: Type[T], params: Optional[dict] = None) -> Tuple[T, int]:
+        """`_get_parsed`, also returning the size of the response body, e.g. for `_read_through`."""
+        def load() -> Tuple[T, int]:
+            if self.conditional_cache is None:
+                body = self._request("GET", url, params=params).content
+                return parse_response_body(response_type, body), len(body)
+            return self._get_conditional(url, response_type, params)
+
+        if not self.coalesce_gets:
+            return load()
+
+        return self._in_flight_gets.do(_request_key(url, params, response_type, self.transport), load)
+
+    def _get_conditional(self, url: str, response_type: Type[T], params: Optional[dict]) -> Tuple[T, int]:
+        key = conditional_key(url, params, response_type)
+        response = self._request("GET", url, params=params, headers=self.conditional_cache.request_headers(key))
+        if response.status_code == 304:
+            try:
+                return self.conditional_cache.not_modified(key, response_type)
+            except KeyError:
+                response = self._request("GET", url, params=params)
+
+        parsed = parse_response_body(response_type, response.content)
+        self.conditional_cache.store(
+            key, response.headers.get("ETag"), response.headers.get("Last-Modified"), response.content, parsed
+        )
+        return parsed, len(response.content)
+
+    async def _get_parsed_async(self, url: str, response_type: Type[T], params: Optional[dict] = None) -> T:
+        """`_get_parsed` for coroutines, sending the request from a worker thread."""
+        def load():
+            return asyncio.to_thread(self._get_parsed, url, response_type, params)
+
+        if not self.coalesce_gets:
+            return await load()
+
+        return await self._in_flight_gets_async.do(_request_key(url, params, response_type, self.transport), load)
+
+
+def _request_key(url: str, params: Optional[dict], response_type: type, transport: Transport) -> Hashable:
+    frozen_params = tuple(sorted(
+        (key, tuple(value) if isinstance(value, list) else value)
+        for key, value in (params or {}).items()
+    ))
+    # Clients with different transports may be talking to different servers
+    return url, frozen_params, response_type, transport
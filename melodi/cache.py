@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+DEFAULT_TTLS = {
+    "threads": 30.0,
+    "users": 60.0,
+    "user_segment_types": 300.0,
+}
+
+
+class ResponseCache:
+    """Read-through cache for the results of client read methods.
+
+    Entries are keyed by endpoint and normalized query params, expire after
+    the endpoint's TTL and are evicted least recently used first once the
+    size of the response bodies of all entries exceeds `max_bytes`. Cached
+    results are shared between callers and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 60.0,
+    ):
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+
+        # (endpoint, params) -> (expires_at, size, value)
+        self._entries = OrderedDict()
+        # endpoint -> number of invalidations, so loads racing a write are not stored
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(
+        self, endpoint: str, query_params: Optional[BaseModel], load: Callable[[], Tuple[Any, int]]
+    ) -> Any:
+        """Return the cached value, or the value returned by `load` along with the size of the body it was parsed from."""
+        key = (endpoint, query_params.model_dump_json() if query_params is not None else None)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+            generation = self._generations.get(endpoint, 0)
+
+        value, size = load()
+        expires_at = time.monotonic() + self.ttls.get(endpoint, self.default_ttl)
+
+        with self._lock:
+            if generation != self._generations.get(endpoint, 0):
+                return value
+
+            self._remove(key)
+            if size <= self.max_bytes:
+                self._entries[key] = (expires_at, size, value)
+                self.size_bytes += size
+
+            while self.size_bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+        return value
+
+    def invalidate(self, endpoint: str):
+        with self._lock:
+            self._generations[endpoint] = self._generations.get(endpoint, 0) + 1
+            for key in [key for key in self._entries if key[0] == endpoint]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry[1]
@@ -0,0 +1,322 @@
+"""
+Circuit breaker and spool for capturing threads without slowing callers down.
+
+```python
+client = MelodiClient(capture_breaker=CircuitBreaker(latency_threshold=0.5), capture_spool=ThreadSpool("spool.jsonl"))
+```
+
+The breaker watches the outcome and latency of the last `window_size`
+calls. Once at least `min_calls` were made and the share of failed calls
+reaches `failure_rate_threshold`, or the share of calls slower than
+`latency_threshold` seconds reaches `slow_call_rate_threshold`, it opens:
+calls are rejected immediately for `open_duration` seconds and captured
+threads are spooled, or dropped when there is no spool. It then lets
+`half_open_max_calls` probe calls through, closing again once they all
+succeed in time and reopening on the first that does not.
+
+With `call_timeout` set, calls run on a separate thread and the caller stops
+waiting after `call_timeout` seconds; the call is recorded as failed. When a
+MelodiClient has both a breaker and a spool, the spool is drained in the
+background every time the breaker closes.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, wait
+from typing import Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from melodi.parsing import parse_response_body
+from melodi.threads.data_models import Thread
+
+R = TypeVar("R")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreakerOpenError(Exception):
+    """Raised by `CircuitBreaker.call` when a call is rejected and there is no fallback."""
+    pass
+
+
+class CircuitBreakerTimeoutError(TimeoutError):
+    """Raised by `CircuitBreaker.call` when a call takes longer than `call_timeout`."""
+    pass
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        latency_threshold: float = 1.0,
+        slow_call_rate_threshold: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_max_calls: int = 1,
+        call_timeout: Optional[float] = None,
+        on_state_change: Optional[Callable[[str, str], None]] = None,
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.latency_threshold = latency_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+        self.call_timeout = call_timeout
+
+        # Called with (previous state, new state) while the breaker's lock is held
+        self._listeners: List[Callable[[str, str], None]] = []
+        if on_state_change is not None:
+            self._listeners.append(on_state_change)
+
+        self.state = CLOSED
+        # (failed, slow) per call, most recent last
+        self._window: Deque = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        # Probes let through, and probes that succeeded, since the breaker went half-open
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.failures = 0
+        self.slow_calls = 0
+        self.rejected = 0
+        self.state_changes = 0
+
+    def metrics(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "calls": self.calls,
+                "failures": self.failures,
+                "slow_calls": self.slow_calls,
+                "rejected": self.rejected,
+                "state_changes": self.state_changes,
+            }
+
+    def add_state_listener(self, listener: Callable[[str, str], None]):
+        """Call `listener(previous, state)` on every state change; it must not block."""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def call(self, func: Callable[[], R], fallback: Optional[Callable[[], R]] = None) -> R:
+        """Run `func` if the breaker allows it, otherwise run `fallback` without waiting.
+
+        Exceptions raised by `func` are recorded and re-raised. A call that
+        outlives `call_timeout` raises CircuitBreakerTimeoutError; `fallback`
+        is not run for it, since `func` may still complete.
+        """
+        if not self._allow():
+            if fallback is None:
+                raise CircuitBreakerOpenError("Circuit breaker is open")
+            return fallback()
+
+        start = time.monotonic()
+        try:
+            result = func() if self.call_timeout is None else self._call_with_timeout(func)
+        except Exception:
+            self._record(failed=True, duration=time.monotonic() - start)
+            raise
+
+        self._record(failed=False, duration=time.monotonic() - start)
+        return result
+
+    def _call_with_timeout(self, func: Callable[[], R]) -> R:
+        future: Future = Future()
+
+        def run():
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                future.set_exception(e)
+
+        # A daemon thread, so that a call that never returns does not hold up exit
+        threading.Thread(target=run, daemon=True).start()
+        if not wait([future], timeout=self.call_timeout).done:
+            raise CircuitBreakerTimeoutError(f"Call did not complete within {self.call_timeout} seconds")
+
+        return future.result()
+
+    def _allow(self) -> bool:
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_duration:
+                self._transition(HALF_OPEN)
+
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+
+            self.rejected += 1
+            return False
+
+    def _record(self, failed: bool, duration: float):
+        slow = duration >= self.latency_threshold
+
+        with self._lock:
+            self.calls += 1
+            self.failures += failed
+            self.slow_calls += slow
+
+            if self.state == HALF_OPEN:
+                if failed or slow:
+                    self._transition(OPEN)
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_max_calls:
+                        self._transition(CLOSED)
+                return
+
+            if self.state != CLOSED:
+                return
+
+            self._window.append((failed, slow))
+            if len(self._window) < self.min_calls:
+                return
+
+            failure_rate = sum(failed for failed, _ in self._window) / len(self._window)
+            slow_call_rate = sum(slow for _, slow in self._window) / len(self._window)
+            if failure_rate >= self.failure_rate_threshold or slow_call_rate >= self.slow_call_rate_threshold:
+                self._transition(OPEN)
+
+    def _transition(self, state: str):
+        previous, self.state = self.state, state
+        self.state_changes += 1
+        self._probes = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state == CLOSED:
+            self._window.clear()
+
+        logger.warning(f"Melodi circuit breaker {previous} -> {state}")
+        for listener in self._listeners:
+            listener(previous, state)
+
+
+class ThreadSpool:
+    """Bounded store for threads captured while the breaker is open.
+
+    Threads are kept in memory, or appended to a JSON lines file at `path`.
+    Once `max_size` threads are held, new threads are dropped.
+
+    Spooled threads stay in the file until they were sent, so a process
+    that stops mid-drain sends them again on the next drain.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_size: int = 10_000):
+        self.path = path
+        self.max_size = max_size
+
+        self.size = 0
+        self.dropped = 0
+        self._threads: Deque[Thread] = deque()
+        self._lock = threading.Lock()
+        # Held for a whole drain, so that concurrent drains do not send a thread twice
+        self._drain_lock = threading.Lock()
+
+        if path is not None:
+            try:
+                with open(path, encoding="utf-8") as spool_file:
+                    self.size = sum(1 for _ in spool_file)
+            except FileNotFoundError:
+                pass
+
+    def add(self, thread: Thread):
+        with self._lock:
+            if self.size >= self.max_size:
+                self.dropped += 1
+                return
+
+            if self.path is None:
+                self._threads.append(thread)
+            else:
+                with open(self.path, "a", encoding="utf-8") as spool_file:
+                    spool_file.write(thread.model_dump_json() + "\n")
+            self.size += 1
+
+    def drain(self, create: Callable[[Thread], object]) -> int:
+        """Pass every spooled thread to `create`, e.g. `client.threads.create`, returning how many were sent.
+
+        Threads for which `create` raises are kept for the next drain. If it
+        raises CircuitBreakerOpenError, the drain stops there and keeps every
+        thread not sent yet. Returns 0 without sending anything while another
+        drain is running.
+        """
+        if not self._drain_lock.acquire(blocking=False):
+            return 0
+
+        try:
+            with self._lock:
+                if self.path is None:
+                    threads = list(self._threads)
+                    self._threads.clear()
+                    self.size = 0
+                else:
+                    threads, offset = self._read_file()
+
+            failed = []
+            for index, thread in enumerate(threads):
+                try:
+                    create(thread)
+                except CircuitBreakerOpenError:
+                    logger.warning(f"Melodi circuit breaker opened, keeping {len(threads) - index} spooled threads")
+                    failed.extend(threads[index:])
+                    break
+                except Exception as e:
+                    logger.error(f"Could not send spooled Melodi thread: {repr(e)}")
+                    failed.append(thread)
+
+            if self.path is None:
+                for thread in failed:
+                    self.add(thread)
+            else:
+                with self._lock:
+                    self._rewrite_file(offset, failed)
+        finally:
+            self._drain_lock.release()
+
+        return len(threads) - len(failed)
+
+    def _read_file(self) -> Tuple[List[Thread], int]:
+        """The spooled threads and the size of the file they were read from."""
+        try:
+            with open(self.path, "rb") as spool_file:
+                content = spool_file.read()
+        except FileNotFoundError:
+            return [], 0
+
+        threads = [parse_response_body(Thread, line) for line in content.splitlines() if line.strip()]
+        return threads, len(content)
+
+    def _rewrite_file(self, offset: int, failed: List[Thread]):
+        """Replace the first `offset` bytes of the file, the threads just drained, with `failed`."""
+        try:
+            with open(self.path, "rb") as spool_file:
+                spool_file.seek(offset)
+                added = spool_file.read()
+        except FileNotFoundError:
+            added = b""
+
+        content = b"".join(thread.model_dump_json().encode("utf-8") + b"\n" for thread in failed) + added
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".spool-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(content)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        self.size = sum(1 for line in content.splitlines() if line.strip())
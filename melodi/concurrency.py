@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, Iterator, List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass
+class BulkItemResult(Generic[T, R]):
+    """Outcome of one item of a bulk operation."""
+
+    item: T
+    result: Optional[R] = None
+    error: Optional[Exception] = None
+    skipped: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def run_bounded(
+    func: Callable[[T], R], items: Iterable[T], max_workers: int = DEFAULT_MAX_WORKERS
+) -> List[BulkItemResult]:
+    """Call `func` on every item with at most `max_workers` calls in flight.
+
+    Results are returned in input order; an exception raised for one item is
+    reported on its result instead of aborting the others.
+    """
+    def call(item: T) -> BulkItemResult:
+        try:
+            return BulkItemResult(item=item, result=func(item))
+        except Exception as e:
+            return BulkItemResult(item=item, error=e)
+
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [call(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(call, items))
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class SingleFlight:
+    """Share one call between concurrent callers asking for the same key.
+
+    While a call for `key` is running, other callers of `do` with that key
+    wait for it and receive its result (or exception) instead of issuing
+    their own call.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], R]) -> R:
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            future.set_result(func())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+        return future.result()
+
+
+class AsyncSingleFlight:
+    """`SingleFlight` for coroutines: concurrent tasks awaiting the same key share one call.
+
+    Calls are shared between tasks of the same event loop only.
+    """
+
+    def __init__(self):
+        # event loop -> {key: future}
+        self._calls = weakref.WeakKeyDictionary()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[R]]) -> R:
+        calls = self._calls.setdefault(asyncio.get_running_loop(), {})
+        future = calls.get(key)
+        if future is not None:
+            # Shielded so that a cancelled caller does not cancel the shared call
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(func())
+        calls[key] = future
+        future.add_done_callback(lambda _: calls.pop(key, None))
+        return await asyncio.shield(future)
@@ -0,0 +1,193 @@
+"""
+Conditional requests for slow-changing resources.
+
+```python
+client = MelodiClient(conditional_cache=ConditionalCache("melodi-validators.json"))
+```
+
+GET responses carrying an `ETag` or `Last-Modified` header are remembered
+per url, query params and response type. The next identical GET sends them
+back as `If-None-Match` / `If-Modified-Since`, and when the API answers 304
+Not Modified the model parsed from the earlier response is reused.
+
+With a path, the cache is written to a JSON file holding the validators and
+the full response bodies, i.e. whatever the cached GETs returned: thread
+messages, user details and so on. The file is created readable and writable
+by its owner only, and is written on `save()`, on `clear()` and when the
+process exits, not on every response.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from melodi.parsing import parse_response_body
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    __slots__ = ("etag", "last_modified", "body", "value")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], body: bytes, value: Any = None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.value = value
+
+
+class ConditionalCache:
+    """Validators and parsed models of GET responses, most recently used first.
+
+    With `path` set, entries are reloaded from that JSON file on start, to
+    be parsed on their first reuse; a file that cannot be read is ignored
+    and the cache starts empty. Cached models are shared between callers and
+    must not be mutated.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 1024):
+        self.path = path
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes writes of the file, which happen outside `_lock`
+        self._save_lock = threading.Lock()
+        self._dirty = False
+
+        if path is not None:
+            if os.path.exists(path):
+                self._load()
+            _save_at_exit(self)
+
+    def request_headers(self, key: str) -> Dict[str, str]:
+        """Conditional headers to send for the request identified by `key`."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return {}
+
+            headers = {}
+            if entry.etag is not None:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                headers["If-Modified-Since"] = entry.last_modified
+            return headers
+
+    def not_modified(self, key: str, response_type: type) -> Tuple[Any, int]:
+        """The cached model for `key` and the size of its body, after the server answered 304.
+
+        Raises `KeyError` if the entry was evicted since its headers were sent.
+        """
+        with self._lock:
+            entry = self._entries[key]
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            if entry.value is None:
+                entry.value = parse_response_body(response_type, entry.body)
+            return entry.value, len(entry.body)
+
+    def store(self, key: str, etag: Optional[str], last_modified: Optional[str], body: bytes, value: Any):
+        with self._lock:
+            self.misses += 1
+            if etag is None and last_modified is None:
+                self._entries.pop(key, None)
+                return
+
+            self._entries[key] = _Entry(etag, last_modified, body, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+        self.save()
+
+    def save(self):
+        """Write the entries to `path`, if set and changed since the last save."""
+        if self.path is None:
+            return
+
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                entries = [
+                    (key, entry.etag, entry.last_modified, entry.body)
+                    for key, entry in self._entries.items()
+                ]
+                self._dirty = False
+
+            try:
+                self._write(entries)
+            except BaseException:
+                with self._lock:
+                    self._dirty = True
+                raise
+
+    def _load(self):
+        # Bodies are kept unparsed until reused, their response type is only known then
+        try:
+            with open(self.path, encoding="utf-8") as cache_file:
+                entries = {
+                    key: _Entry(entry["etag"], entry["last_modified"], entry["body"].encode("utf-8"))
+                    for key, entry in json.load(cache_file).items()
+                }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable Melodi conditional cache {self.path}: {repr(e)}")
+            return
+
+        self._entries.update(entries)
+
+    def _write(self, entries: list):
+        content = json.dumps({
+            key: {"etag": etag, "last_modified": last_modified, "body": body.decode("utf-8")}
+            for key, etag, last_modified, body in entries
+        })
+        # mkstemp creates the file with mode 0600, and a unique name so processes sharing `path` do not collide
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temporary_path = tempfile.mkstemp(dir=directory, prefix=".melodi-cache-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as cache_file:
+                cache_file.write(content)
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+
+def _save_at_exit(cache: ConditionalCache):
+    # Through a weak reference, so that registering does not keep the cache alive
+    reference = weakref.ref(cache)
+
+    def save():
+        cache = reference()
+        if cache is None:
+            return
+        try:
+            cache.save()
+        except Exception as e:
+            logger.error(f"Could not save Melodi conditional cache: {repr(e)}")
+
+    atexit.register(save)
+
+
+def conditional_key(url: str, params: Optional[dict], response_type: type) -> str:
+    """Key of a GET request; hashed, as params include the API key and entries may be written to disk."""
+    frozen_params = sorted((key, value) for key, value in (params or {}).items())
+    request = json.dumps([url, frozen_params, repr(response_type)], default=str)
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
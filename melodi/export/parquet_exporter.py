@@ -0,0 +1,238 @@
+"""
+Columnar export of threads to Parquet.
+
+Threads are normalized into one Parquet file per table, written in record
+batches so memory stays bounded by `batch_size` rows per table:
+
+- threads.parquet
+- messages.parquet
+- feedback.parquet
+- issue_associations.parquet
+- intent_associations.parquet
+
+Nested metadata and attribute options are stored as JSON strings.
+"""
+
+import json
+import logging
+import os
+from typing import Iterable
+
+from melodi.threads.data_models import ThreadResponse, ThreadsQueryParams
+from melodi.threads.threads_client import ThreadsClient
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    raise ModuleNotFoundError("pyarrow not installed, please run: 'pip install pyarrow'")
+
+logger = logging.getLogger(__name__)
+
+_TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+SCHEMAS = {
+    "threads": pa.schema([
+        ("id", pa.int64()),
+        ("organizationId", pa.int64()),
+        ("externalId", pa.string()),
+        ("projectId", pa.int64()),
+        ("projectName", pa.string()),
+        ("externalUserId", pa.int64()),
+        ("externalUserExternalId", pa.string()),
+        ("outcome", pa.string()),
+        ("metadata", pa.string()),
+        ("createdAt", _TIMESTAMP),
+        ("updatedAt", _TIMESTAMP),
+    ]),
+    "messages": pa.schema([
+        ("id", pa.int64()),
+        ("threadId", pa.int64()),
+        ("position", pa.int32()),
+        ("externalId", pa.string()),
+        ("type", pa.string()),
+        ("role", pa.string()),
+        ("content", pa.string()),
+        ("jsonContent", pa.string()),
+        ("metadata", pa.string()),
+    ]),
+    "feedback": pa.schema([
+        ("id", pa.int64()),
+        ("threadId", pa.int64()),
+        ("messageId", pa.int64()),
+        ("projectId", pa.int64()),
+        ("feedbackType", pa.string()),
+        ("feedbackText", pa.string()),
+        ("externalUserId", pa.int64()),
+        ("attributeOptions", pa.string()),
+        ("createdAt", _TIMESTAMP),
+        ("updatedAt", _TIMESTAMP),
+    ]),
+    "issue_associations": pa.schema([
+        ("id", pa.int64()),
+        ("threadId", pa.int64()),
+        ("messageId", pa.int64()),
+        ("issueId", pa.int64()),
+        ("issueName", pa.string()),
+        ("userId", pa.int64()),
+    ]),
+    "intent_associations": pa.schema([
+        ("id", pa.int64()),
+        ("threadId", pa.int64()),
+        ("messageId", pa.int64()),
+        ("intentId", pa.int64()),
+        ("intentName", pa.string()),
+        ("userId", pa.int64()),
+    ]),
+}
+
+
+class _TableBuffer:
+    def __init__(self, path: str, schema: "pa.Schema"):
+        self.schema = schema
+        self.columns = {name: [] for name in schema.names}
+        self.size = 0
+        self.writer = pq.ParquetWriter(path, schema)
+
+    def append(self, **values):
+        for name, column in self.columns.items():
+            column.append(values.get(name))
+        self.size += 1
+
+    def flush(self):
+        if not self.size:
+            return
+
+        batch = pa.RecordBatch.from_pydict(self.columns, schema=self.schema)
+        self.writer.write_batch(batch)
+        for column in self.columns.values():
+            column.clear()
+        self.size = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+class ThreadsParquetWriter:
+    """Normalize `ThreadResponse` objects into per-table Parquet files under `directory`."""
+
+    def __init__(self, directory: str, batch_size: int = 10_000):
+        self.batch_size = batch_size
+
+        os.makedirs(directory, exist_ok=True)
+        self.tables = {
+            name: _TableBuffer(os.path.join(directory, f"{name}.parquet"), schema)
+            for name, schema in SCHEMAS.items()
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, threads: Iterable[ThreadResponse]) -> int:
+        written = 0
+        for thread in threads:
+            self._append_thread(thread)
+            written += 1
+
+            for table in self.tables.values():
+                if table.size >= self.batch_size:
+                    table.flush()
+
+        return written
+
+    def close(self):
+        for table in self.tables.values():
+            table.close()
+
+    def _append_thread(self, thread: ThreadResponse):
+        external_user = thread.externalUser
+        self.tables["threads"].append(
+            id=thread.id,
+            organizationId=thread.organizationId,
+            externalId=thread.externalId,
+            projectId=thread.project.id,
+            projectName=thread.project.name,
+            externalUserId=external_user.id if external_user else None,
+            externalUserExternalId=external_user.externalId if external_user else None,
+            outcome=thread.outcome,
+            metadata=json.dumps(thread.metadata),
+            createdAt=thread.createdAt,
+            updatedAt=thread.updatedAt,
+        )
+
+        for position, message in enumerate(thread.messages):
+            self.tables["messages"].append(
+                id=message.id,
+                threadId=thread.id,
+                position=position,
+                externalId=message.externalId,
+                type=message.type,
+                role=message.role,
+                content=message.content,
+                jsonContent=json.dumps(message.jsonContent) if message.jsonContent is not None else None,
+                metadata=json.dumps(message.metadata),
+            )
+
+            for feedback in message.externalFeedback:
+                self.tables["feedback"].append(
+                    id=feedback.id,
+                    threadId=thread.id,
+                    messageId=message.id,
+                    projectId=feedback.projectId,
+                    feedbackType=feedback.feedbackType,
+                    feedbackText=feedback.feedbackText,
+                    externalUserId=feedback.externalUserId,
+                    attributeOptions=json.dumps([
+                        {"attribute": option.attribute.name, "option": option.name}
+                        for option in feedback.attributeOptions
+                    ]),
+                    createdAt=feedback.createdAt,
+                    updatedAt=feedback.updatedAt,
+                )
+
+            for association in message.issueAssociations:
+                self.tables["issue_associations"].append(
+                    id=association.id,
+                    threadId=thread.id,
+                    messageId=message.id,
+                    issueId=association.issueId,
+                    issueName=association.issue.name,
+                    userId=association.userId,
+                )
+
+            for association in message.intentAssociations:
+                self.tables["intent_associations"].append(
+                    id=association.id,
+                    threadId=thread.id,
+                    messageId=message.id,
+                    intentId=association.intentId,
+                    intentName=association.intent.name,
+                    userId=association.userId,
+                )
+
+
+def export_threads_to_parquet(
+    threads_client: ThreadsClient,
+    directory: str,
+    query_params: ThreadsQueryParams = ThreadsQueryParams(),
+    batch_size: int = 10_000,
+) -> int:
+    """Page through every thread matching `query_params` and write them as Parquet tables.
+
+    Feedback, issues and intents are always requested, as the tables for
+    them would otherwise be empty.
+    """
+    query_params = query_params.model_copy(update={
+        "includeFeedback": True,
+        "includeIssues": True,
+        "includeIntents": True,
+    })
+    with ThreadsParquetWriter(directory, batch_size=batch_size) as writer:
+        written = writer.write(threads_client.iter_all(query_params))
+
+    logger.info(f"Exported {written} threads to {directory}")
+    return written
@@ -0,0 +1,199 @@
+import json
+import logging
+import math
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import List, Optional, Set, Tuple
+
+from melodi.threads.data_models import ThreadResponse, ThreadsQueryParams
+from melodi.threads.threads_client import ThreadsClient
+
+Window = Tuple[datetime, datetime]
+
+# How far split windows reach past their shared boundaries; the API's `after`
+# and `before` are exclusive, and it keeps timestamps to the millisecond
+_BOUNDARY_OVERLAP = timedelta(milliseconds=1)
+
+
+class ThreadsExporter:
+    """Export every thread matching a query to a JSON lines file.
+
+    The `start`..`end` range is split into `after`/`before` windows holding
+    at most `max_window_count` threads each, based on the `count` reported
+    for each window. Windows are fetched in parallel and threads are written
+    once per `id`. Progress is saved to `checkpoint_path` after every window,
+    so an interrupted export resumes where it stopped when run again with the
+    same `start`, `end` and `query_params`.
+    """
+
+    def __init__(
+        self,
+        threads_client: ThreadsClient,
+        max_window_count: int = 5000,
+        page_size: int = 100,
+        max_workers: int = 4,
+    ):
+        self.threads_client = threads_client
+        self.max_window_count = max_window_count
+        self.page_size = page_size
+        self.max_workers = max_workers
+
+        self.logger = logging.getLogger(__name__)
+
+    def export(
+        self,
+        output_path: str,
+        start: datetime,
+        end: datetime,
+        query_params: ThreadsQueryParams = ThreadsQueryParams(),
+        checkpoint_path: Optional[str] = None,
+    ) -> int:
+        """Write the threads created between `start` and `end`, returning how many were written.
+
+        Raises `ValueError` if `checkpoint_path` holds the progress of an
+        export with a different range or query.
+        """
+        checkpoint_path = checkpoint_path or output_path + ".checkpoint"
+        scope = _checkpoint_scope(start, end, query_params)
+        completed, offset = self._load_checkpoint(checkpoint_path, scope)
+        seen_ids = self._restore_output(output_path, offset)
+        written = 0
+
+        with open(output_path, "a", encoding="utf-8") as output, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            if not _is_completed((start, end), completed):
+                pending.add(executor.submit(self._fetch_window, query_params, (start, end)))
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                failed = [future for future in done if future.exception() is not None]
+
+                # Checkpoint the windows that did finish before surfacing a failure
+                for future in done:
+                    if future in failed:
+                        continue
+
+                    window, windows, threads = future.result()
+
+                    for child in windows:
+                        if not _is_completed(child, completed):
+                            pending.add(executor.submit(self._fetch_window, query_params, child))
+
+                    if windows:
+                        continue
+
+                    for thread in threads:
+                        if thread.id in seen_ids:
+                            continue
+                        seen_ids.add(thread.id)
+                        output.write(thread.model_dump_json() + "\n")
+                        written += 1
+
+                    output.flush()
+                    completed.append(window)
+                    self._save_checkpoint(checkpoint_path, scope, completed, output.tell())
+
+                if failed:
+                    for future in pending:
+                        future.cancel()
+                    raise failed[0].exception()
+
+            if not _is_completed((start, end), completed):
+                completed.append((start, end))
+                self._save_checkpoint(checkpoint_path, scope, completed, output.tell())
+
+        self.logger.info(f"Exported {written} threads to {output_path}")
+        return written
+
+    def _fetch_window(
+        self, query_params: ThreadsQueryParams, window: Window
+    ) -> Tuple[Window, List[Window], List[ThreadResponse]]:
+        """Return the threads of `window`, or the windows to split it into when it is too large."""
+        after, before = window
+        window_params = query_params.model_copy(
+            update={"after": after, "before": before, "pageSize": self.page_size, "pageIndex": 0}
+        )
+        first_page = self.threads_client.get(window_params, use_cache=False)
+
+        if first_page.count > self.max_window_count:
+            parts = math.ceil(first_page.count / self.max_window_count)
+            step = (before - after) / parts
+            # Each window reaches past the boundaries it shares with its neighbours,
+            # so a thread created on one is not excluded by both; duplicates are
+            # dropped by id. Too narrow a window would not get any smaller.
+            if step > 2 * _BOUNDARY_OVERLAP:
+                bounds = [after + step * i for i in range(1, parts)]
+                windows = [
+                    (after if i == 0 else bounds[i - 1] - _BOUNDARY_OVERLAP,
+                     before if i == parts - 1 else bounds[i] + _BOUNDARY_OVERLAP)
+                    for i in range(parts)
+                ]
+                return window, windows, []
+
+        threads = list(first_page.rows)
+        page_count = math.ceil(first_page.count / self.page_size)
+        for page_index in range(1, page_count):
+            page = self.threads_client.get(
+                window_params.model_copy(update={"pageIndex": page_index}), use_cache=False
+            )
+            threads.extend(page.rows)
+
+        return window, [], threads
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: str, scope: dict) -> Tuple[List[Window], int]:
+        if not os.path.exists(checkpoint_path):
+            return [], 0
+
+        with open(checkpoint_path, encoding="utf-8") as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+
+        # Windows completed for another range or query would be silently skipped
+        if checkpoint.get("scope") != scope:
+            raise ValueError(
+                f"Checkpoint {checkpoint_path} belongs to an export with a different range or query, "
+                "remove it to start over"
+            )
+
+        completed = [
+            (datetime.fromisoformat(after), datetime.fromisoformat(before))
+            for after, before in checkpoint["completed"]
+        ]
+        return completed, checkpoint["offset"]
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: str, scope: dict, completed: List[Window], offset: int):
+        checkpoint = {
+            "scope": scope,
+            "completed": [[after.isoformat(), before.isoformat()] for after, before in completed],
+            "offset": offset,
+        }
+        temporary_path = checkpoint_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(temporary_path, checkpoint_path)
+
+    @staticmethod
+    def _restore_output(output_path: str, offset: int) -> Set[int]:
+        """Drop anything written after the last checkpoint and return the ids already exported."""
+        if not os.path.exists(output_path):
+            return set()
+
+        with open(output_path, "r+", encoding="utf-8") as output:
+            output.truncate(offset)
+
+        with open(output_path, encoding="utf-8") as output:
+            return {json.loads(line)["id"] for line in output}
+
+
+def _checkpoint_scope(start: datetime, end: datetime, query_params: ThreadsQueryParams) -> dict:
+    # Paging and window bounds are set per request by the exporter
+    query = query_params.model_dump(mode="json", exclude={"pageSize", "pageIndex", "after", "before"}, exclude_none=True)
+    return {"start": start.isoformat(), "end": end.isoformat(), "query": query}
+
+
+def _is_completed(window: Window, completed: List[Window]) -> bool:
+    after, before = window
+    return any(done_after <= after and before <= done_before for done_after, done_before in completed)
@@ -1,15 +1,21 @@
 import logging
+from collections import defaultdict
 from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
 
 import requests
-from pydantic import parse_obj_as
 
 from melodi.base_client import BaseClient
+from melodi.concurrency import (DEFAULT_MAX_WORKERS, BulkItemResult, chunked,
+                                run_bounded)
 from melodi.exceptions import MelodiAPIError
 from melodi.feedback.data_models import (Feedback,
                                          FeedbackCreateOrUpdateRequest,
                                          FeedbackResponse)
 from melodi.logging import _log_melodi_http_errors
+from melodi.parsing import parse_response
+from melodi.threads.data_models import ThreadsQueryParams
+from melodi.threads.threads_client import ThreadsClient
 
 
 def _empty_feedback_response() -> FeedbackResponse:
@@ -37,7 +43,90 @@ class FeedbackClient(BaseClient):
         self.logger = logging.getLogger(__name__)
 
     def create(self, feedback: Feedback) -> FeedbackResponse:
+        # Threads embed the feedback given on their messages
+        self._invalidate("threads")
         return _empty_feedback_response()
 
     def create_or_update(self, update: FeedbackCreateOrUpdateRequest) -> FeedbackResponse:
+        self._invalidate("threads")
         return _empty_feedback_response()
+
+    def create_many(
+        self,
+        feedback: List[Feedback],
+        batch_size: int = 100,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        threads_client: Optional[ThreadsClient] = None,
+    ) -> List[BulkItemResult[Feedback, FeedbackResponse]]:
+        """Create many feedback items, returning one result per item in input order.
+
+        Items are created concurrently, with at most `max_workers` requests in
+        flight. When `threads_client` is given, the `externalThreadId`s of
+        each batch of `batch_size` items are first looked up with one query
+        per project, and items whose thread or message does not exist fail
+        without being sent.
+        """
+        results: List[Optional[BulkItemResult[Feedback, FeedbackResponse]]] = [None] * len(feedback)
+        self.transport.reserve_connections(max_workers)
+
+        if threads_client is not None:
+            known = {}
+            lookups = run_bounded(
+                lambda batch: self._resolve_external_ids(batch, threads_client),
+                chunked(feedback, batch_size),
+                max_workers=max_workers,
+            )
+            for batch_index, lookup in enumerate(lookups):
+                if lookup.ok:
+                    known.update(lookup.result)
+                    continue
+                # Items of a batch whose lookup failed are not sent
+                for index in range(batch_index * batch_size, min((batch_index + 1) * batch_size, len(feedback))):
+                    results[index] = BulkItemResult(item=feedback[index], error=lookup.error)
+
+            for index, item in enumerate(feedback):
+                error = _unknown_external_id_error(item, known) if results[index] is None else None
+                if error is not None:
+                    results[index] = BulkItemResult(item=item, error=error)
+
+        to_create = [index for index, result in enumerate(results) if result is None]
+        for created in run_bounded(lambda index: self.create(feedback[index]), to_create, max_workers=max_workers):
+            results[created.item] = BulkItemResult(
+                item=feedback[created.item], result=created.result, error=created.error
+            )
+
+        return results
+
+    @staticmethod
+    def _resolve_external_ids(
+        batch: List[Feedback], threads_client: ThreadsClient
+    ) -> Dict[Tuple[Optional[int], str], Set[str]]:
+        """Map the (project, externalThreadId) pairs of `batch` that exist to their message externalIds."""
+        external_thread_ids = defaultdict(set)
+        for item in batch:
+            if item.externalThreadId is not None:
+                external_thread_ids[item.projectId].add(item.externalThreadId)
+
+        known = {}
+        for project_id, ids in external_thread_ids.items():
+            query_params = ThreadsQueryParams(projectId=project_id, externalIds=sorted(ids), pageSize=len(ids))
+            for thread in threads_client.iter_all(query_params):
+                known[(project_id, thread.externalId)] = {
+                    message.externalId for message in thread.messages if message.externalId
+                }
+
+        return known
+
+
+def _unknown_external_id_error(
+    item: Feedback, known: Dict[Tuple[Optional[int], str], Set[str]]
+) -> Optional[MelodiAPIError]:
+    if item.externalThreadId is None:
+        return None
+
+    message_ids = known.get((item.projectId, item.externalThreadId))
+    if message_ids is None:
+        return MelodiAPIError(f"Thread {item.externalThreadId} not found")
+    if item.externalMessageId is not None and item.externalMessageId not in message_ids:
+        return MelodiAPIError(f"Message {item.externalMessageId} not found in thread {item.externalThreadId}")
+    return None
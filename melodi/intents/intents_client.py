@@ -2,12 +2,12 @@ import logging
 from datetime import datetime
 
 import requests
-from pydantic import parse_obj_as
 
 from melodi.base_client import BaseClient
 from melodi.exceptions import MelodiAPIError
 from melodi.intents.data_models import IntentResponse, IntentUpsertRequest
 from melodi.logging import _log_melodi_http_errors
+from melodi.parsing import parse_response
 
 
 def _empty_intent_response() -> IntentResponse:
@@ -1,13 +1,22 @@
 import logging
 import os
-from typing import Optional
+import threading
+from typing import List, Optional
 
+from melodi.base_client import BaseClient
+from melodi.cache import ResponseCache
+from melodi.circuit_breaker import CLOSED, CircuitBreaker, ThreadSpool
+from melodi.conditional_cache import ConditionalCache
 from melodi.feedback.feedback_client import FeedbackClient
 from melodi.intents.intents_client import IntentsClient
 from melodi.issues.issues_client import IssuesClient
 from melodi.messages.messages_client import MessagesClient
 from melodi.projects.projects_client import ProjectsClient
+from melodi.rate_limit import RateLimiter
+from melodi.resolver import EntityResolver
+from melodi.retry import RetryPolicy
 from melodi.threads.threads_client import ThreadsClient
+from melodi.transport import RequestsTransport, Transport
 from melodi.user_internal_for_project.user_internal_for_project_client import \
     UserInternalForProjectClient
 from melodi.user_segment_types.user_segment_types_client import \
@@ -18,7 +27,18 @@ from .exceptions import MelodiAPIError
 
 
 class MelodiClient:
-    def __init__(self, api_key: Optional[str] = None, verbose=False):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        verbose=False,
+        cache: Optional[ResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        capture_breaker: Optional[CircuitBreaker] = None,
+        capture_spool: Optional[ThreadSpool] = None,
+        transport: Optional[Transport] = None,
+        conditional_cache: Optional[ConditionalCache] = None,
+    ):
         self.api_key = api_key or os.environ.get("MELODI_API_KEY")
 
         if not self.api_key:
@@ -40,12 +60,60 @@ class MelodiClient:
         self.user_internal_for_project = UserInternalForProjectClient(base_url=self.base_url, api_key=self.api_key)
         self.issues = IssuesClient(base_url=self.base_url, api_key=self.api_key)
         self.intents = IntentsClient(base_url=self.base_url, api_key=self.api_key)
+        self.resolver = EntityResolver(self.projects, self.issues, self.intents)
+
+        # Guards threads captured by the OpenAI wrapper, see melodi.circuit_breaker
+        self.capture_breaker = capture_breaker
+        self.capture_spool = capture_spool
+        if capture_breaker is not None and capture_spool is not None:
+            capture_breaker.add_state_listener(self._drain_capture_spool_on_close)
+
+        # Shared so that writes through one client invalidate reads cached by another
+        self.cache = cache
+        # One connection pool for every sub-client of this MelodiClient
+        self.transport = transport or RequestsTransport()
+        for client in self._sub_clients():
+            client.cache = cache
+            client.rate_limiter = rate_limiter
+            client.conditional_cache = conditional_cache
+            if retry_policy is not None:
+                client.retry_policy = retry_policy
+            client.transport = self.transport
 
         if verbose:
             logging.basicConfig(level=logging.INFO)
         else:
             logging.basicConfig(level=logging.ERROR)
 
+    def drain_capture_spool(self) -> int:
+        """Send the threads spooled while the capture breaker was open, returning how many were sent."""
+        if self.capture_spool is None:
+            return 0
+        if self.capture_breaker is None:
+            return self.capture_spool.drain(self.threads.create)
+
+        # Through the breaker, so that a drain stops at the first thread it rejects if it opens again
+        return self.capture_spool.drain(
+            lambda thread: self.capture_breaker.call(lambda: self.threads.create(thread))
+        )
+
+    def _drain_capture_spool_on_close(self, previous: str, state: str):
+        if state == CLOSED:
+            threading.Thread(target=self.drain_capture_spool, daemon=True).start()
+
+    def _sub_clients(self) -> List[BaseClient]:
+        return [
+            self.threads,
+            self.projects,
+            self.feedback,
+            self.users,
+            self.messages,
+            self.user_segment_types,
+            self.user_internal_for_project,
+            self.issues,
+            self.intents,
+        ]
+
     @staticmethod
     def _get_headers():
         return {"Content-Type": "application/json"}
@@ -1,17 +1,22 @@
 import logging
+from typing import Callable, Dict, Iterable, List, Tuple, TypeVar
 
 import requests
-from pydantic import parse_obj_as
 
 from melodi.base_client import BaseClient
+from melodi.concurrency import DEFAULT_MAX_WORKERS, BulkItemResult, run_bounded
 from melodi.exceptions import MelodiAPIError
 from melodi.intents.intents_client import _empty_intent_response
 from melodi.issues.issues_client import _empty_issue_response
-from melodi.logging import _log_melodi_http_errors
 from melodi.messages.data_models import (IntentMessageAssociation,
                                          IssueMessageAssociation,
                                          MessageResponse)
 
+R = TypeVar("R")
+
+# (issue or intent id, message id)
+AssociationPair = Tuple[int, int]
+
 
 class MessagesClient(BaseClient):
     def __init__(self, base_url: str, api_key: str):
@@ -35,18 +40,49 @@ class MessagesClient(BaseClient):
         self.logger = logging.getLogger(__name__)
 
     def get(self, message_id: int) -> MessageResponse:
+        """Fetch one message.
+
+        Concurrent calls for the same message share one request and the same
+        returned model, unless `coalesce_gets` is False. The model is shared
+        read-only, see `BaseClient._get_parsed`: copy it before changing it.
+        """
         url = f"{self.base_endpoint}/{message_id}?apiKey={self.api_key}"
 
         try:
-            response = requests.request("GET", url)
+            return self._get_parsed(url, MessageResponse)
+        except MelodiAPIError as e:
+            raise MelodiAPIError(e)
 
-            _log_melodi_http_errors(self.logger, response)
-            response.raise_for_status()
-            return parse_obj_as(MessageResponse, response.json())
+    async def get_async(self, message_id: int) -> MessageResponse:
+        """`get` for coroutines; concurrent tasks of one event loop share a request the same way."""
+        url = f"{self.base_endpoint}/{message_id}?apiKey={self.api_key}"
+
+        try:
+            return await self._get_parsed_async(url, MessageResponse)
         except MelodiAPIError as e:
             raise MelodiAPIError(e)
 
+    def get_many(
+        self, message_ids: Iterable[int], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> Dict[int, BulkItemResult[int, MessageResponse]]:
+        """Fetch several messages concurrently, keyed by message id.
+
+        Duplicate ids are fetched once, and ids already being fetched by
+        another call share that request (see `BaseClient._get_parsed`). A
+        failure is reported on the result of its id only.
+        """
+        unique_ids = list(dict.fromkeys(message_ids))
+        self.transport.reserve_connections(max_workers)
+        results = run_bounded(
+            self.get,
+            unique_ids,
+            max_workers=max_workers,
+        )
+        return {result.item: result for result in results}
+
     def add_issue_to_message(self, issue_id: int, message_id: int) -> IssueMessageAssociation:
+        # Threads embed the associations of their messages
+        self._invalidate("threads")
         return IssueMessageAssociation(
             id=0,
             issueId=issue_id,
@@ -56,9 +92,11 @@ class MessagesClient(BaseClient):
         )
 
     def remove_issue_from_message(self, issue_id: int, message_id: int) -> None:
+        self._invalidate("threads")
         return None
 
     def add_intent_to_message(self, intent_id: int, message_id: int) -> IntentMessageAssociation:
+        self._invalidate("threads")
         return IntentMessageAssociation(
             id=0,
             intentId=intent_id,
@@ -68,5 +106,45 @@ class MessagesClient(BaseClient):
         )
 
     def remove_intent_from_message(self, intent_id: int, message_id: int) -> None:
+        self._invalidate("threads")
         return None
 
+    def add_issues_to_messages(
+        self, pairs: List[AssociationPair], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> List[BulkItemResult[AssociationPair, IssueMessageAssociation]]:
+        """Associate many (issue id, message id) pairs, returning one result per pair in input order."""
+        return self._associate_many(self.add_issue_to_message, pairs, max_workers)
+
+    def remove_issues_from_messages(
+        self, pairs: List[AssociationPair], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> List[BulkItemResult[AssociationPair, None]]:
+        """Dissociate many (issue id, message id) pairs, returning one result per pair in input order."""
+        return self._associate_many(self.remove_issue_from_message, pairs, max_workers)
+
+    def add_intents_to_messages(
+        self, pairs: List[AssociationPair], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> List[BulkItemResult[AssociationPair, IntentMessageAssociation]]:
+        """Associate many (intent id, message id) pairs, returning one result per pair in input order."""
+        return self._associate_many(self.add_intent_to_message, pairs, max_workers)
+
+    def remove_intents_from_messages(
+        self, pairs: List[AssociationPair], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> List[BulkItemResult[AssociationPair, None]]:
+        """Dissociate many (intent id, message id) pairs, returning one result per pair in input order."""
+        return self._associate_many(self.remove_intent_from_message, pairs, max_workers)
+
+    def _associate_many(
+        self,
+        associate: Callable[[int, int], R], pairs: List[AssociationPair], max_workers: int
+    ) -> List[BulkItemResult[AssociationPair, R]]:
+        """Apply `associate` once per distinct pair, with at most `max_workers` calls in flight.
+
+        Repeated pairs share the result of their first occurrence.
+        """
+        unique_pairs = list(dict.fromkeys(pairs))
+        self.transport.reserve_connections(max_workers)
+        results = {
+            result.item: result
+            for result in run_bounded(lambda pair: associate(*pair), unique_pairs, max_workers=max_workers)
+        }
+        return [results[pair] for pair in pairs]
@@ -0,0 +1,45 @@
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+from pydantic import BaseModel
+
+DEFAULT_PREFETCH = 4
+
+
+def iter_all_pages(
+    get_page: Callable[[BaseModel], BaseModel],
+    query_params: BaseModel,
+    prefetch: int = DEFAULT_PREFETCH,
+) -> Iterator:
+    """Yield the rows of every page, starting at `query_params.pageIndex`.
+
+    The first page is fetched to learn the total `count`; the following
+    pages are fetched up to `prefetch` at a time while earlier rows are being
+    consumed. Rows are always yielded in page order.
+    """
+    first_page = get_page(query_params)
+    yield from first_page.rows
+
+    if query_params.pageSize <= 0:
+        return
+
+    page_count = math.ceil(first_page.count / query_params.pageSize)
+    next_index = query_params.pageIndex + 1
+    if next_index >= page_count:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max(prefetch, 1))
+    pending = deque()
+    try:
+        while pending or next_index < page_count:
+            while len(pending) < max(prefetch, 1) and next_index < page_count:
+                page_params = query_params.model_copy(update={"pageIndex": next_index})
+                pending.append(executor.submit(get_page, page_params))
+                next_index += 1
+
+            yield from pending.popleft().result().rows
+    finally:
+        # Pages the caller will not consume are not fetched
+        executor.shutdown(wait=False, cancel_futures=True)
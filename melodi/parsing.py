@@ -0,0 +1,132 @@
+import codecs
+import json
+import re
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, Type, TypeVar, Union
+
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+@lru_cache(maxsize=None)
+def _get_type_adapter(response_type) -> TypeAdapter:
+    """Build the validator for a response type once per process."""
+    return TypeAdapter(response_type)
+
+
+def parse_response(response_type: Type[T], data: Any) -> T:
+    """Validate an already decoded Melodi API response into `response_type`."""
+    return _get_type_adapter(response_type).validate_python(data)
+
+
+def parse_response_body(response_type: Type[T], body: Union[str, bytes]) -> T:
+    """Decode and validate a raw Melodi API response body in a single pass.
+
+    Preferred over `parse_response(response_type, response.json())` for large
+    responses, as no intermediate Python objects are built.
+    """
+    return _get_type_adapter(response_type).validate_json(body)
+
+
+def iter_paged_rows(
+    response_type: Type[T], chunks: Iterable[Union[str, bytes]], rows_key: str = "rows"
+) -> Iterator[T]:
+    """Incrementally decode the `rows` of a paged response body.
+
+    `chunks` is the response body as it arrives, e.g. from
+    `response.iter_content()`. Only the row being decoded is held in memory,
+    so peak memory does not grow with the page size.
+    """
+    reader = _JsonStreamReader(chunks)
+    reader.expect("{")
+    if reader.consume("}"):
+        return
+
+    while True:
+        key = reader.decode_value()
+        reader.expect(":")
+
+        if key == rows_key:
+            reader.expect("[")
+            if not reader.consume("]"):
+                while True:
+                    yield parse_response(response_type, reader.decode_value())
+                    if reader.consume("]"):
+                        break
+                    reader.expect(",")
+        else:
+            reader.decode_value()
+
+        if reader.consume("}"):
+            return
+        reader.expect(",")
+
+
+class _JsonStreamReader:
+    def __init__(self, chunks: Iterable[Union[str, bytes]]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int) -> bool:
+        """Read chunks until `size` characters are pending, returning False if the body ends first.
+
+        Chunks are collected and joined once, with what is left of the buffer,
+        so reading many chunks for a large row does not copy the buffer per chunk.
+        """
+        chunks = [self._buffer[self._pos:]]
+        available = len(chunks[0])
+        while available < size and not self._eof:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                chunk = self._decoder.decode(b"", final=True)
+            elif isinstance(chunk, bytes):
+                chunk = self._decoder.decode(chunk)
+            chunks.append(chunk)
+            available += len(chunk)
+
+        if len(chunks) > 1:
+            self._buffer = "".join(chunks)
+            self._pos = 0
+        return available >= size
+
+    def _skip_whitespace(self):
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill(1):
+                return
+
+    def consume(self, char: str) -> bool:
+        self._skip_whitespace()
+        if self._buffer.startswith(char, self._pos):
+            self._pos += 1
+            return True
+        return False
+
+    def expect(self, char: str):
+        if not self.consume(char):
+            raise ValueError(f"Expected '{char}' at position {self._pos} of the response body")
+
+    def decode_value(self):
+        self._skip_whitespace()
+        while True:
+            pending = len(self._buffer) - self._pos
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+                # A value ending with the buffer may be a truncated number or literal
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+
+            # Grow the pending data geometrically so large rows are not re-scanned per chunk
+            self._fill(2 * pending + 1)
@@ -1,12 +1,13 @@
 import logging
+from datetime import datetime
 from typing import List
 
 import requests
-from pydantic import parse_obj_as
 
 from melodi.base_client import BaseClient
 from melodi.exceptions import MelodiAPIError
 from melodi.logging import _log_melodi_http_errors
+from melodi.parsing import parse_response
 from melodi.projects.data_models import ProjectResponse
 
 
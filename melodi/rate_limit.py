@@ -0,0 +1,226 @@
+"""
+Client-side rate limiting of Melodi API requests.
+
+```python
+limiter = RateLimiter(rates={"threads": 20.0, "users": 5.0}, default_rate=10.0)
+client = MelodiClient(rate_limiter=limiter)
+```
+
+Requests are limited per endpoint group, the first path segment after
+`/api/external/` (threads, users, feedback, ...), by token buckets refilled
+at the group's rate in requests per second. Buckets are thread safe and
+expose `acquire_async` for asyncio tasks. With `directory` set, bucket state
+is kept in files guarded by `fcntl` locks so every process using the same
+directory shares the limit.
+
+On a 429 response the group's rate is halved, down to `min_rate`, and it
+then recovers additively with every successful request.
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_API_PREFIX = "/api/external/"
+
+
+def group_for_url(url: str) -> str:
+    """Endpoint group of a Melodi API url, e.g. "threads" for /api/external/threads/1."""
+    path = urlparse(url).path
+    if not path.startswith(_API_PREFIX):
+        return "default"
+    return path[len(_API_PREFIX):].split("/", 1)[0] or "default"
+
+
+class TokenBucket:
+    """In-process token bucket with AIMD adaptation of its rate."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None, min_rate: float = 0.1):
+        self.max_rate = rate
+        self.min_rate = min_rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+
+        self._state = {"rate": rate, "tokens": self.burst, "updated_at": time.time()}
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> float:
+        return self._state["rate"]
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_rate_limited(self):
+        with self._locked_state() as state:
+            state["rate"] = max(self.min_rate, state["rate"] / 2)
+
+    def on_success(self):
+        if self._state["rate"] >= self.max_rate:
+            return
+        with self._locked_state() as state:
+            # Recover to the configured rate over about `max_rate` successful requests
+            state["rate"] = min(self.max_rate, state["rate"] + 1.0)
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, without waiting."""
+        with self._locked_state() as state:
+            self._refill(state)
+            if state["tokens"] < 1:
+                return False
+            state["tokens"] -= 1
+            return True
+
+    def _reserve(self) -> float:
+        """Take a token, going into debt if none is left, and return how long to wait for it."""
+        with self._locked_state() as state:
+            self._refill(state)
+            state["tokens"] -= 1
+            return -state["tokens"] / state["rate"] if state["tokens"] < 0 else 0.0
+
+    def _refill(self, state: dict):
+        now = time.time()
+        state["tokens"] = min(self.burst, state["tokens"] + (now - state["updated_at"]) * state["rate"])
+        state["updated_at"] = now
+
+    def _locked_state(self):
+        return _LockedState(self._lock, self._state)
+
+
+class _LockedState:
+    def __init__(self, lock: threading.Lock, state: dict):
+        self.lock = lock
+        self.state = state
+
+    def __enter__(self) -> dict:
+        self.lock.acquire()
+        return self.state
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.lock.release()
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket whose state is shared between processes through a locked file."""
+
+    def __init__(self, path: str, rate: float, burst: Optional[float] = None, min_rate: float = 0.1):
+        if fcntl is None:
+            raise ModuleNotFoundError("fcntl is not available, file backed rate limits need a Unix system")
+
+        super().__init__(rate, burst=burst, min_rate=min_rate)
+        self.path = path
+
+        with self._locked_state():
+            pass
+
+    @property
+    def rate(self) -> float:
+        with self._locked_state() as state:
+            return state["rate"]
+
+    def on_success(self):
+        with self._locked_state() as state:
+            state["rate"] = min(self.max_rate, state["rate"] + 1.0)
+
+    def _locked_state(self):
+        return _FileLockedState(self._lock, self.path, self._state)
+
+
+class _FileLockedState:
+    def __init__(self, lock: threading.Lock, path: str, initial_state: dict):
+        self.lock = lock
+        self.path = path
+        self.initial_state = initial_state
+
+    def __enter__(self) -> dict:
+        self.lock.acquire()
+        try:
+            self.file = open(self.path, "a+", encoding="utf-8")
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+            self.file.seek(0)
+            content = self.file.read()
+            self.state = json.loads(content) if content else dict(self.initial_state)
+        except BaseException:
+            self._release()
+            raise
+        return self.state
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.file.seek(0)
+            self.file.truncate()
+            json.dump(self.state, self.file)
+            self.file.flush()
+        finally:
+            self._release()
+
+    def _release(self):
+        if getattr(self, "file", None) is not None:
+            self.file.close()
+        self.lock.release()
+
+
+class RateLimiter:
+    """Token buckets per endpoint group, created on first use."""
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, float]] = None,
+        default_rate: float = 10.0,
+        burst: Optional[float] = None,
+        min_rate: float = 0.1,
+        directory: Optional[str] = None,
+    ):
+        self.rates = rates or {}
+        self.default_rate = default_rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.directory = directory
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, group: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(group)
+            if bucket is None:
+                rate = self.rates.get(group, self.default_rate)
+                if self.directory is None:
+                    bucket = TokenBucket(rate, burst=self.burst, min_rate=self.min_rate)
+                else:
+                    os.makedirs(self.directory, exist_ok=True)
+                    path = os.path.join(self.directory, f"{group}.bucket")
+                    bucket = FileTokenBucket(path, rate, burst=self.burst, min_rate=self.min_rate)
+                self._buckets[group] = bucket
+
+            return bucket
+
+    def acquire(self, url: str):
+        self.bucket(group_for_url(url)).acquire()
+
+    async def acquire_async(self, url: str):
+        await self.bucket(group_for_url(url)).acquire_async()
+
+    def on_response(self, url: str, status_code: int):
+        bucket = self.bucket(group_for_url(url))
+        if status_code == 429:
+            bucket.on_rate_limited()
+        else:
+            bucket.on_success()
@@ -0,0 +1,124 @@
+import threading
+import time
+from typing import Hashable, Iterable, Optional
+
+import requests
+
+from melodi.concurrency import SingleFlight
+from melodi.intents.data_models import IntentResponse, IntentUpsertRequest
+from melodi.intents.intents_client import IntentsClient
+from melodi.issues.data_models import IssueResponse, IssueUpsertRequest
+from melodi.issues.issues_client import IssuesClient
+from melodi.projects.data_models import ProjectResponse
+from melodi.projects.projects_client import ProjectsClient
+
+_MISSING = object()
+
+
+class EntityResolver:
+    """Memoized name to entity resolution for projects, issues and intents.
+
+    Results of `ProjectsClient.get_by_name`, `IssuesClient.upsert` and
+    `IntentsClient.upsert` are cached per (project, name) for `ttl` seconds.
+    Projects that could not be found are remembered for `negative_ttl`
+    seconds, and concurrent misses for the same key share a single call.
+    """
+
+    def __init__(
+        self,
+        projects_client: ProjectsClient,
+        issues_client: IssuesClient,
+        intents_client: IntentsClient,
+        ttl: float = 600.0,
+        negative_ttl: float = 30.0,
+    ):
+        self.projects_client = projects_client
+        self.issues_client = issues_client
+        self.intents_client = intents_client
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        # (kind, project id, name) -> (expires_at, value)
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._in_flight = SingleFlight()
+
+    def project(self, name: str) -> Optional[ProjectResponse]:
+        """Return the project called `name`, or None if it does not exist."""
+        return self._resolve(("project", None, name), lambda: self._get_project(name))
+
+    def issue(self, issueUpsertRequest: IssueUpsertRequest) -> IssueResponse:
+        key = ("issue", issueUpsertRequest.projectId, issueUpsertRequest.name)
+        return self._resolve(key, lambda: self.issues_client.upsert(issueUpsertRequest))
+
+    def intent(self, intentUpsertRequest: IntentUpsertRequest) -> IntentResponse:
+        key = ("intent", intentUpsertRequest.projectId, intentUpsertRequest.name)
+        return self._resolve(key, lambda: self.intents_client.upsert(intentUpsertRequest))
+
+    def warm_up(
+        self,
+        issueUpsertRequests: Iterable[IssueUpsertRequest] = (),
+        intentUpsertRequests: Iterable[IntentUpsertRequest] = (),
+    ):
+        """Preload every project, and the issues and intents the caller expects to resolve."""
+        expires_at = time.monotonic() + self.ttl
+        projects = self.projects_client.get()
+        with self._lock:
+            for project in projects:
+                self._entries[("project", None, project.name)] = (expires_at, project)
+
+        for issueUpsertRequest in issueUpsertRequests:
+            self.issue(issueUpsertRequest)
+        for intentUpsertRequest in intentUpsertRequests:
+            self.intent(intentUpsertRequest)
+
+    def invalidate(self, kind: Optional[str] = None, project_id: Optional[int] = None, name: Optional[str] = None):
+        """Drop cached entries matching every given field, or everything when called without arguments."""
+        with self._lock:
+            for key in list(self._entries):
+                entry_kind, entry_project_id, entry_name = key
+                if kind is not None and entry_kind != kind:
+                    continue
+                if project_id is not None and entry_project_id != project_id:
+                    continue
+                if name is not None and entry_name != name:
+                    continue
+                del self._entries[key]
+
+    def _resolve(self, key: Hashable, load):
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+
+        def load_and_store():
+            # Another caller may have stored the entry while this one waited
+            value = self._lookup(key)
+            if value is not _MISSING:
+                return value
+
+            value = load()
+            ttl = self.ttl if value is not None else self.negative_ttl
+            with self._lock:
+                self._entries[key] = (time.monotonic() + ttl, value)
+            return value
+
+        return self._in_flight.do(key, load_and_store)
+
+    def _lookup(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            return entry[1]
+
+    def _get_project(self, name: str) -> Optional[ProjectResponse]:
+        try:
+            return self.projects_client.get_by_name(name)
+        except requests.HTTPError as e:
+            # Only a project that does not exist is remembered as missing
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
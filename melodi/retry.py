@@ -0,0 +1,177 @@
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, TypeVar
+
+import requests
+
+R = TypeVar("R")
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+# Retried for every request: the server did not process the request
+REJECTED_STATUS_CODES = {429, 503}
+# Only retried for idempotent requests, the server may have processed the request
+RETRYABLE_STATUS_CODES = {500, 502, 504}
+
+logger = logging.getLogger(__name__)
+
+
+class RetryBudget:
+    """Process-wide cap on retries as a ratio of requests.
+
+    Every request deposits `ratio` tokens and every retry withdraws one, so
+    during an outage retries add at most `ratio` extra load on top of the
+    requests themselves. `min_retries_per_second` keeps a trickle of
+    retries available to low-traffic processes.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 100.0, min_retries_per_second: float = 1.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.min_retries_per_second = min_retries_per_second
+
+        self._tokens = max_tokens
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_tokens, self._tokens + (now - self._updated_at) * self.min_retries_per_second)
+            self._updated_at = now
+
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+DEFAULT_RETRY_BUDGET = RetryBudget()
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, honouring `Retry-After`.
+
+    Idempotent requests are retried on connection errors, timeouts and
+    429/500/502/503/504 responses. Other requests are only retried when the
+    server cannot have processed them: failed connection attempts and
+    429/503 responses. Retries are drawn from `budget`, shared by every
+    client in the process by default.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.2,
+        max_delay: float = 20.0,
+        max_retry_after: float = 60.0,
+        budget: Optional[RetryBudget] = DEFAULT_RETRY_BUDGET,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.budget = budget
+
+    def call(self, method: str, send: Callable[[], R], idempotent: Optional[bool] = None) -> R:
+        """Call `send` until it returns a response that should not be retried, or attempts run out.
+
+        `send` may also be a client method returning a parsed result, which
+        signals error statuses by raising `requests.HTTPError`; those are
+        retried like the responses they carry.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        attempt = 0
+        while True:
+            attempt += 1
+            if self.budget is not None:
+                self.budget.record_request()
+
+            try:
+                response = send()
+            except requests.HTTPError as e:
+                if e.response is None or not self._should_retry_response(e.response, idempotent):
+                    raise
+                retry_after = _retry_after(e.response)
+                if retry_after is not None and retry_after > self.max_retry_after:
+                    raise
+                if not self._can_retry(attempt):
+                    raise
+                delay = max(retry_after or 0.0, self._backoff(attempt))
+                logger.warning(f"Retrying {method} in {delay:.2f}s after error: {e}")
+            except requests.RequestException as e:
+                if not self._should_retry_error(e, idempotent) or not self._can_retry(attempt):
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(f"Retrying {method} in {delay:.2f}s after error: {e}")
+            else:
+                if not isinstance(response, requests.Response) or not self._should_retry_response(response, idempotent):
+                    return response
+
+                retry_after = _retry_after(response)
+                if retry_after is not None and retry_after > self.max_retry_after:
+                    return response
+                if not self._can_retry(attempt):
+                    return response
+
+                delay = max(retry_after or 0.0, self._backoff(attempt))
+                logger.warning(f"Retrying {method} in {delay:.2f}s after status {response.status_code}")
+                response.close()
+
+            time.sleep(delay)
+
+    def _can_retry(self, attempt: int) -> bool:
+        if attempt >= self.max_attempts:
+            return False
+        if self.budget is not None and not self.budget.try_spend():
+            logger.warning("Retry budget exhausted, not retrying")
+            return False
+        return True
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def _should_retry_error(error: requests.RequestException, idempotent: bool) -> bool:
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return idempotent
+        return False
+
+    @staticmethod
+    def _should_retry_response(response: requests.Response, idempotent: bool) -> bool:
+        if response.status_code in REJECTED_STATUS_CODES:
+            return True
+        return idempotent and response.status_code in RETRYABLE_STATUS_CODES
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds to wait from a `Retry-After` header given in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
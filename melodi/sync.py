@@ -0,0 +1,293 @@
+"""
+Local SQLite mirror of Melodi threads.
+
+```python
+mirror = ThreadsMirror(client.threads, "melodi.db")
+mirror.sync(ThreadsQueryParams(projectId=1))
+threads = mirror.query_threads(feedback_type="NEGATIVE", metadata_field="model", metadata_value="gpt-4o")
+```
+
+Each `sync` only fetches threads created after the newest thread mirrored
+for the same query, less `resync_window`, so repeated syncs are incremental.
+Threads created within the window are fetched again, picking up feedback,
+issues and intents added to them after they were first mirrored; changes to
+older threads are only seen by a sync with a longer window.
+
+Timestamps are stored as UTC ISO 8601 text, so they sort chronologically.
+"""
+
+import json
+import logging
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import List, Literal, Optional
+
+from melodi.parsing import parse_response_body
+from melodi.threads.data_models import ThreadResponse, ThreadsQueryParams
+from melodi.threads.threads_client import ThreadsClient
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS threads (
+    id INTEGER PRIMARY KEY,
+    externalId TEXT,
+    projectId INTEGER,
+    externalUserId INTEGER,
+    outcome TEXT,
+    createdAt TEXT,
+    updatedAt TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS threads_external_id ON threads (externalId);
+CREATE INDEX IF NOT EXISTS threads_created_at ON threads (createdAt);
+
+CREATE TABLE IF NOT EXISTS thread_metadata (
+    threadId INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS thread_metadata_field_value ON thread_metadata (field, value);
+CREATE INDEX IF NOT EXISTS thread_metadata_thread_id ON thread_metadata (threadId);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    threadId INTEGER NOT NULL,
+    position INTEGER,
+    externalId TEXT,
+    role TEXT,
+    content TEXT
+);
+CREATE INDEX IF NOT EXISTS messages_thread_id ON messages (threadId);
+
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    externalId TEXT,
+    email TEXT,
+    name TEXT,
+    username TEXT
+);
+CREATE INDEX IF NOT EXISTS users_external_id ON users (externalId);
+
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY,
+    threadId INTEGER NOT NULL,
+    messageId INTEGER,
+    feedbackType TEXT,
+    feedbackText TEXT,
+    createdAt TEXT
+);
+CREATE INDEX IF NOT EXISTS feedback_type ON feedback (feedbackType, threadId);
+CREATE INDEX IF NOT EXISTS feedback_thread_id ON feedback (threadId);
+
+CREATE TABLE IF NOT EXISTS issue_associations (
+    id INTEGER PRIMARY KEY,
+    threadId INTEGER NOT NULL,
+    messageId INTEGER,
+    issueId INTEGER
+);
+CREATE INDEX IF NOT EXISTS issue_associations_issue_id ON issue_associations (issueId, threadId);
+CREATE INDEX IF NOT EXISTS issue_associations_thread_id ON issue_associations (threadId);
+
+CREATE TABLE IF NOT EXISTS intent_associations (
+    id INTEGER PRIMARY KEY,
+    threadId INTEGER NOT NULL,
+    messageId INTEGER,
+    intentId INTEGER
+);
+CREATE INDEX IF NOT EXISTS intent_associations_intent_id ON intent_associations (intentId, threadId);
+CREATE INDEX IF NOT EXISTS intent_associations_thread_id ON intent_associations (threadId);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_CHILD_TABLES = ["thread_metadata", "messages", "feedback", "issue_associations", "intent_associations"]
+
+_HIGH_WATER_MARK = "high_water_mark"
+# Set by `sync` itself, or only the starting point of the first sync
+_UNSCOPED_PARAMS = {"pageSize", "pageIndex", "after", "includeFeedback", "includeIssues", "includeIntents"}
+
+
+class ThreadsMirror:
+    def __init__(
+        self,
+        threads_client: ThreadsClient,
+        path: str,
+        commit_every: int = 500,
+        resync_window: timedelta = timedelta(days=1),
+    ):
+        self.threads_client = threads_client
+        self.commit_every = commit_every
+        self.resync_window = resync_window
+
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(_SCHEMA)
+
+        self.logger = logging.getLogger(__name__)
+
+    def close(self):
+        self.connection.close()
+
+    def high_water_mark(self, query_params: ThreadsQueryParams = ThreadsQueryParams()) -> Optional[datetime]:
+        """`createdAt` of the newest thread mirrored by a sync of `query_params`."""
+        row = self.connection.execute(
+            "SELECT value FROM sync_state WHERE key = ?", (_high_water_mark_key(query_params),)
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def sync(self, query_params: ThreadsQueryParams = ThreadsQueryParams()) -> int:
+        """Mirror the threads created since the last sync of the same query, returning how many were stored."""
+        key = _high_water_mark_key(query_params)
+        high_water_mark = self.high_water_mark(query_params)
+        query_params = query_params.model_copy(update={
+            "after": high_water_mark - self.resync_window if high_water_mark else query_params.after,
+            "includeFeedback": True,
+            "includeIssues": True,
+            "includeIntents": True,
+        })
+
+        synced = 0
+        for thread in self.threads_client.iter_all(query_params):
+            self._upsert_thread(thread)
+            synced += 1
+
+            created_at = _utc(thread.createdAt)
+            if high_water_mark is None or created_at > high_water_mark:
+                high_water_mark = created_at
+
+            if synced % self.commit_every == 0:
+                self.connection.commit()
+
+        # Pages are not guaranteed to be ordered by creation time, so the
+        # high-water mark only moves once every thread has been stored
+        if high_water_mark is not None:
+            self._save_high_water_mark(key, high_water_mark)
+        self.connection.commit()
+
+        self.logger.info(f"Synced {synced} threads")
+        return synced
+
+    def query_threads(
+        self,
+        external_ids: Optional[List[str]] = None,
+        issue_ids: Optional[List[int]] = None,
+        intent_ids: Optional[List[int]] = None,
+        feedback_type: Optional[Literal['POSITIVE', 'NEGATIVE']] = None,
+        metadata_field: Optional[str] = None,
+        metadata_value: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[ThreadResponse]:
+        """Return mirrored threads matching every given filter, newest first."""
+        conditions = []
+        params = []
+
+        if external_ids is not None:
+            conditions.append(f"externalId IN ({_placeholders(external_ids)})")
+            params.extend(external_ids)
+        if issue_ids is not None:
+            conditions.append(
+                f"id IN (SELECT threadId FROM issue_associations WHERE issueId IN ({_placeholders(issue_ids)}))"
+            )
+            params.extend(issue_ids)
+        if intent_ids is not None:
+            conditions.append(
+                f"id IN (SELECT threadId FROM intent_associations WHERE intentId IN ({_placeholders(intent_ids)}))"
+            )
+            params.extend(intent_ids)
+        if feedback_type is not None:
+            conditions.append("id IN (SELECT threadId FROM feedback WHERE feedbackType = ?)")
+            params.append(feedback_type)
+        if metadata_field is not None:
+            if metadata_value is not None:
+                conditions.append("id IN (SELECT threadId FROM thread_metadata WHERE field = ? AND value = ?)")
+                params.extend([metadata_field, metadata_value])
+            else:
+                conditions.append("id IN (SELECT threadId FROM thread_metadata WHERE field = ?)")
+                params.append(metadata_field)
+
+        query = "SELECT data FROM threads"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY createdAt DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        return [
+            parse_response_body(ThreadResponse, data)
+            for (data,) in self.connection.execute(query, params)
+        ]
+
+    def _save_high_water_mark(self, key: str, high_water_mark: datetime):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+            (key, high_water_mark.isoformat()),
+        )
+
+    def _upsert_thread(self, thread: ThreadResponse):
+        cursor = self.connection.cursor()
+        for table in _CHILD_TABLES:
+            cursor.execute(f"DELETE FROM {table} WHERE threadId = ?", (thread.id,))
+
+        external_user = thread.externalUser
+        cursor.execute(
+            "INSERT OR REPLACE INTO threads VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                thread.id,
+                thread.externalId,
+                thread.project.id,
+                external_user.id if external_user else None,
+                thread.outcome,
+                _utc(thread.createdAt).isoformat(),
+                _utc(thread.updatedAt).isoformat(),
+                thread.model_dump_json(),
+            ),
+        )
+        if external_user:
+            cursor.execute(
+                "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?, ?)",
+                (external_user.id, external_user.externalId, external_user.email, external_user.name, external_user.username),
+            )
+
+        cursor.executemany(
+            "INSERT INTO thread_metadata VALUES (?, ?, ?)",
+            [(thread.id, field, str(value)) for field, value in thread.metadata.items()],
+        )
+
+        for position, message in enumerate(thread.messages):
+            cursor.execute(
+                "INSERT OR REPLACE INTO messages VALUES (?, ?, ?, ?, ?, ?)",
+                (message.id, thread.id, position, message.externalId, message.role, message.content),
+            )
+            cursor.executemany(
+                "INSERT OR REPLACE INTO feedback VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (feedback.id, thread.id, message.id, feedback.feedbackType, feedback.feedbackText, _utc(feedback.createdAt).isoformat())
+                    for feedback in message.externalFeedback
+                ],
+            )
+            cursor.executemany(
+                "INSERT OR REPLACE INTO issue_associations VALUES (?, ?, ?, ?)",
+                [(association.id, thread.id, message.id, association.issueId) for association in message.issueAssociations],
+            )
+            cursor.executemany(
+                "INSERT OR REPLACE INTO intent_associations VALUES (?, ?, ?, ?)",
+                [(association.id, thread.id, message.id, association.intentId) for association in message.intentAssociations],
+            )
+
+
+def _high_water_mark_key(query_params: ThreadsQueryParams) -> str:
+    query = query_params.model_dump(mode="json", exclude=_UNSCOPED_PARAMS, exclude_none=True)
+    return f"{_HIGH_WATER_MARK}:{json.dumps(query, sort_keys=True)}"
+
+
+def _utc(value: datetime) -> datetime:
+    """`value` in UTC, naive datetimes being taken as UTC already."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _placeholders(values: list) -> str:
+    return ", ".join("?" for _ in values)
@@ -0,0 +1 @@
+from melodi.testing.fake_melodi import FakeMelodiState, FakeMelodiTransport
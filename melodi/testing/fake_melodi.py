@@ -0,0 +1,397 @@
+"""
+In-process fake of the Melodi external API.
+
+```python
+transport = FakeMelodiTransport(latency=0.02, error_rate=0.01, max_requests_per_second=200, seed=1)
+client = MelodiClient(api_key="test", transport=transport)
+```
+
+Requests never leave the process: the transport routes them to in-memory
+handlers for the `/api/external/*` routes and returns `requests.Response`
+objects. Latency, injected errors and throughput limits are configurable and
+seeded, so SDK throughput and tail latency can be measured reproducibly.
+Per-route request counts and latencies are recorded on `stats`. Successful
+GETs carry an `ETag` and are answered 304 when `If-None-Match` matches it.
+"""
+
+import hashlib
+import io
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from melodi.rate_limit import TokenBucket
+from melodi.transport import Transport
+
+_API_PREFIX = "/api/external"
+
+Handler = Callable[[dict, Optional[dict]], Tuple[int, object]]
+
+
+class FakeMelodiState:
+    """Objects stored by the fake API, keyed by id."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_id = 1
+
+        self.projects: Dict[int, dict] = {}
+        self.threads: Dict[int, dict] = {}
+        self.messages: Dict[int, dict] = {}
+        self.users: Dict[int, dict] = {}
+        self.feedback: Dict[int, dict] = {}
+        self.issues: Dict[int, dict] = {}
+        self.intents: Dict[int, dict] = {}
+        self.issue_associations: Dict[int, dict] = {}
+        self.intent_associations: Dict[int, dict] = {}
+        self.user_segment_types: Dict[int, dict] = {}
+        self.internal_users: Dict[int, set] = defaultdict(set)
+
+    def new_id(self) -> int:
+        new_id = self.next_id
+        self.next_id += 1
+        return new_id
+
+
+class FakeMelodiTransport(Transport):
+    def __init__(
+        self,
+        latency: Union[float, Callable[[random.Random], float]] = 0.0,
+        error_rate: float = 0.0,
+        error_status_codes: Tuple[int, ...] = (500, 502, 503),
+        max_requests_per_second: Optional[float] = None,
+        seed: Optional[int] = None,
+        state: Optional[FakeMelodiState] = None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status_codes = error_status_codes
+        self.state = state or FakeMelodiState()
+
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._throughput = TokenBucket(max_requests_per_second) if max_requests_per_second else None
+
+        # route -> list of latencies in seconds
+        self.stats: Dict[str, List[float]] = defaultdict(list)
+        self.status_codes: Dict[int, int] = defaultdict(int)
+        self._stats_lock = threading.Lock()
+
+        self._routes: List[Tuple[str, "re.Pattern", Handler]] = [
+            ("GET", re.compile(r"/threads"), self._get_threads),
+            ("POST", re.compile(r"/threads"), self._create_thread),
+            ("GET", re.compile(r"/messages/(?P<id>\d+)"), self._get_message),
+            ("GET", re.compile(r"/projects"), self._get_projects),
+            ("POST", re.compile(r"/projects"), self._create_project),
+            ("GET", re.compile(r"/users/segment-types"), self._get_user_segment_types),
+            ("GET", re.compile(r"/users"), self._get_users),
+            ("POST", re.compile(r"/users"), self._upsert_user),
+            ("POST", re.compile(r"/feedback"), self._create_feedback),
+            ("POST", re.compile(r"/issues"), self._upsert_issue),
+            ("POST", re.compile(r"/intents"), self._upsert_intent),
+            ("POST", re.compile(r"/issue-message-associations"), self._add_issue_association),
+            ("DELETE", re.compile(r"/issue-message-associations"), self._remove_issue_association),
+            ("POST", re.compile(r"/intent-message-associations"), self._add_intent_association),
+            ("DELETE", re.compile(r"/intent-message-associations"), self._remove_intent_association),
+            ("POST", re.compile(r"/user-internal-for-project/bulk"), self._set_users_internal),
+            ("DELETE", re.compile(r"/user-internal-for-project/bulk"), self._set_users_not_internal),
+        ]
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        start = time.monotonic()
+        method = method.upper()
+        parsed = urlparse(url)
+        query = {key: values if len(values) > 1 else values[0] for key, values in parse_qs(parsed.query).items()}
+        query.update(kwargs.get("params") or {})
+        body = kwargs.get("json")
+        if body is None and kwargs.get("data"):
+            body = json.loads(kwargs["data"])
+
+        route, status_code, payload, headers = self._dispatch(method, parsed.path, query, body)
+        if method == "GET" and status_code == 200:
+            etag = _etag(payload)
+            headers = {**headers, "ETag": etag}
+            if (kwargs.get("headers") or {}).get("If-None-Match") == etag:
+                status_code, payload = 304, None
+
+        delay = self._draw(self.latency) if callable(self.latency) else self.latency
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._stats_lock:
+            self.stats[route].append(time.monotonic() - start)
+            self.status_codes[status_code] += 1
+
+        return _response(method, url, status_code, payload, headers)
+
+    def _dispatch(self, method: str, path: str, query: dict, body: Optional[dict]):
+        if not path.startswith(_API_PREFIX):
+            return "unknown", 404, {"errors": [f"Unknown path {path}"]}, {}
+        path = path[len(_API_PREFIX):]
+
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if route_method != method or match is None:
+                continue
+
+            route = f"{method} {pattern.pattern}"
+            if not query.get("apiKey"):
+                return route, 401, {"errors": ["Missing apiKey"]}, {}
+            if self._throughput is not None and not self._throughput.try_acquire():
+                return route, 429, {"errors": ["Too many requests"]}, {"Retry-After": "1"}
+            if self.error_rate and self._draw(lambda rng: rng.random()) < self.error_rate:
+                return route, self._draw(lambda rng: rng.choice(self.error_status_codes)), {}, {}
+
+            with self.state.lock:
+                status_code, payload = handler({**query, **match.groupdict()}, body)
+            return route, status_code, payload, {}
+
+        return f"{method} {path}", 404, {"errors": [f"Unknown route {method} {path}"]}, {}
+
+    def _draw(self, draw: Callable[[random.Random], object]):
+        with self._random_lock:
+            return draw(self._random)
+
+    # Handlers run with the state lock held and return (status code, JSON payload)
+
+    def _get_threads(self, query: dict, body: Optional[dict]):
+        threads = list(self.state.threads.values())
+        if "projectId" in query:
+            threads = [thread for thread in threads if thread["project"]["id"] == int(query["projectId"])]
+        if "externalIds" in query:
+            external_ids = set(_as_list(query["externalIds"]))
+            threads = [thread for thread in threads if thread["externalId"] in external_ids]
+        if "ids" in query:
+            ids = {int(thread_id) for thread_id in _as_list(query["ids"])}
+            threads = [thread for thread in threads if thread["id"] in ids]
+        if "after" in query:
+            threads = [thread for thread in threads if thread["createdAt"] > query["after"]]
+        if "before" in query:
+            threads = [thread for thread in threads if thread["createdAt"] < query["before"]]
+
+        return 200, _page(threads, query)
+
+    def _create_thread(self, query: dict, body: dict):
+        project = self._project(body.get("projectId"), body.get("projectName"))
+        thread_id = self.state.new_id()
+        messages = []
+        for message in body.get("messages", []):
+            message = {
+                **message,
+                "id": self.state.new_id(),
+                "issueAssociations": [],
+                "intentAssociations": [],
+                "externalFeedback": [],
+            }
+            self.state.messages[message["id"]] = message
+            messages.append(message)
+
+        now = _now()
+        thread = {
+            "id": thread_id,
+            "organizationId": 1,
+            "externalId": body.get("externalId"),
+            "project": {"id": project["id"], "name": project["name"]},
+            "externalUser": self._user(body["externalUser"]) if body.get("externalUser") else None,
+            "messages": messages,
+            "metadata": body.get("metadata", {}),
+            "createdAt": body.get("createdAt") or now,
+            "updatedAt": now,
+        }
+        self.state.threads[thread_id] = thread
+        return 200, thread
+
+    def _get_message(self, query: dict, body: Optional[dict]):
+        message = self.state.messages.get(int(query["id"]))
+        return (200, message) if message else (404, {"errors": ["Message not found"]})
+
+    def _get_projects(self, query: dict, body: Optional[dict]):
+        projects = list(self.state.projects.values())
+        if "name" in query:
+            project = next((project for project in projects if project["name"] == query["name"]), None)
+            return (200, project) if project else (404, {"errors": ["Project not found"]})
+        return 200, projects
+
+    def _create_project(self, query: dict, body: dict):
+        return 200, self._project(None, body["name"])
+
+    def _get_user_segment_types(self, query: dict, body: Optional[dict]):
+        return 200, list(self.state.user_segment_types.values())
+
+    def _get_users(self, query: dict, body: Optional[dict]):
+        return 200, _page(list(self.state.users.values()), query)
+
+    def _upsert_user(self, query: dict, body: dict):
+        return 200, self._user(body)
+
+    def _create_feedback(self, query: dict, body: dict):
+        message = self._find_message(body.get("externalThreadId"), body.get("externalMessageId"))
+        if message is None:
+            return 404, {"errors": ["Thread or message not found"]}
+
+        now = _now()
+        feedback = {
+            "id": self.state.new_id(),
+            "projectId": body.get("projectId") or 1,
+            "feedbackType": body.get("feedbackType"),
+            "feedbackText": body.get("feedbackText"),
+            "attributeOptions": [],
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        self.state.feedback[feedback["id"]] = feedback
+        message["externalFeedback"].append(feedback)
+        return 200, feedback
+
+    def _upsert_issue(self, query: dict, body: dict):
+        return 200, self._named(self.state.issues, body)
+
+    def _upsert_intent(self, query: dict, body: dict):
+        return 200, self._named(self.state.intents, body)
+
+    def _add_issue_association(self, query: dict, body: dict):
+        return self._associate("issue", self.state.issues, self.state.issue_associations, body)
+
+    def _remove_issue_association(self, query: dict, body: dict):
+        return self._dissociate("issue", self.state.issue_associations, body)
+
+    def _add_intent_association(self, query: dict, body: dict):
+        return self._associate("intent", self.state.intents, self.state.intent_associations, body)
+
+    def _remove_intent_association(self, query: dict, body: dict):
+        return self._dissociate("intent", self.state.intent_associations, body)
+
+    def _set_users_internal(self, query: dict, body: dict):
+        internal_users = self.state.internal_users[body["projectId"]]
+        added = set(body["externalUserIds"]) - internal_users
+        internal_users.update(added)
+        return 200, {"count": len(added)}
+
+    def _set_users_not_internal(self, query: dict, body: dict):
+        self.state.internal_users[body["projectId"]].difference_update(body["externalUserIds"])
+        return 200, None
+
+    def _project(self, project_id: Optional[int], name: Optional[str]) -> dict:
+        if project_id is not None and int(project_id) in self.state.projects:
+            return self.state.projects[int(project_id)]
+        for project in self.state.projects.values():
+            if project["name"] == name:
+                return project
+
+        now = _now()
+        project = {
+            "id": int(project_id) if project_id is not None else self.state.new_id(),
+            "name": name or "default",
+            "organizationId": 1,
+            "isDeleted": False,
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        self.state.projects[project["id"]] = project
+        return project
+
+    def _user(self, body: dict) -> dict:
+        for user in self.state.users.values():
+            if user["externalId"] == body["externalId"]:
+                user.update({key: body[key] for key in ("email", "name", "username") if key in body})
+                return user
+
+        user = {
+            "id": self.state.new_id(),
+            "externalId": body["externalId"],
+            "email": body.get("email"),
+            "name": body.get("name"),
+            "username": body.get("username"),
+            "segments": [],
+        }
+        self.state.users[user["id"]] = user
+        return user
+
+    def _named(self, entities: Dict[int, dict], body: dict) -> dict:
+        for entity in entities.values():
+            if entity["name"] == body["name"] and entity["projectId"] == body["projectId"]:
+                return _public(entity)
+
+        entity = {"id": self.state.new_id(), "name": body["name"], "projectId": body["projectId"], "createdAt": _now()}
+        entities[entity["id"]] = entity
+        return _public(entity)
+
+    def _associate(self, kind: str, entities: Dict[int, dict], associations: Dict[int, dict], body: dict):
+        entity = entities.get(body[f"{kind}Id"])
+        message = self.state.messages.get(body["messageId"])
+        if entity is None or message is None:
+            return 404, {"errors": [f"{kind.title()} or message not found"]}
+
+        association = {
+            "id": self.state.new_id(),
+            f"{kind}Id": entity["id"],
+            "messageId": message["id"],
+            "userId": None,
+            kind: _public(entity),
+        }
+        associations[association["id"]] = association
+        message[f"{kind}Associations"].append(association)
+        return 200, association
+
+    def _dissociate(self, kind: str, associations: Dict[int, dict], body: dict):
+        for association_id, association in list(associations.items()):
+            if association[f"{kind}Id"] == body[f"{kind}Id"] and association["messageId"] == body["messageId"]:
+                del associations[association_id]
+                message = self.state.messages[association["messageId"]]
+                message[f"{kind}Associations"].remove(association)
+        return 200, None
+
+    def _find_message(self, external_thread_id: Optional[str], external_message_id: Optional[str]) -> Optional[dict]:
+        for thread in self.state.threads.values():
+            if thread["externalId"] != external_thread_id or not thread["messages"]:
+                continue
+            if external_message_id is None:
+                return thread["messages"][-1]
+            for message in thread["messages"]:
+                if message.get("externalId") == external_message_id:
+                    return message
+        return None
+
+
+def _page(rows: list, query: dict) -> dict:
+    page_size = int(query.get("pageSize", 50))
+    page_index = int(query.get("pageIndex", 0))
+    return {"count": len(rows), "rows": rows[page_index * page_size:(page_index + 1) * page_size]}
+
+
+def _as_list(value) -> list:
+    return value if isinstance(value, list) else [value]
+
+
+def _public(entity: dict) -> dict:
+    return {"id": entity["id"], "name": entity["name"], "createdAt": entity["createdAt"]}
+
+
+def _etag(payload) -> str:
+    return '"' + hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _response(method: str, url: str, status_code: int, payload, headers: dict) -> requests.Response:
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = HTTPStatus(status_code).phrase
+    response.url = url
+    response.headers.update({"Content-Type": "application/json", **headers})
+    response.raw = io.BytesIO(body)
+    response.request = requests.Request(method, url).prepare()
+    return response
@@ -1,16 +1,21 @@
 import logging
 from datetime import datetime
+from functools import partial
+from typing import Iterator, Tuple
 
 import requests
-from pydantic import parse_obj_as
 
 from melodi.base_client import BaseClient
 from melodi.exceptions import MelodiAPIError
 from melodi.logging import _log_melodi_http_errors
+from melodi.paging import DEFAULT_PREFETCH, iter_all_pages
+from melodi.parsing import iter_paged_rows, parse_response
 from melodi.threads.data_models import (SimpleProject, Thread, ThreadResponse,
                                         ThreadsPagedResponse,
                                         ThreadsQueryParams)
 
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 def _empty_thread_response() -> ThreadResponse:
     return ThreadResponse(
@@ -36,13 +41,40 @@ class ThreadsClient(BaseClient):
 
 
     def create(self, thread: Thread) -> ThreadResponse:
+        self._invalidate("threads")
         return _empty_thread_response()
 
     def create_or_update(self, thread: Thread) -> ThreadResponse:
+        self._invalidate("threads")
         return _empty_thread_response()
 
-    def get(self, query_params: ThreadsQueryParams = ThreadsQueryParams()) -> ThreadsPagedResponse:
+    def get(self, query_params: ThreadsQueryParams = ThreadsQueryParams(), use_cache: bool = True) -> ThreadsPagedResponse:
+        """Get one page. With `use_cache=False` the response cache is bypassed, as bulk reads do so they do not flush it."""
+        if not use_cache:
+            return self._get(query_params)[0]
+        return self._read_through("threads", query_params, lambda: self._get(query_params))
+
+    def _get(self, query_params: ThreadsQueryParams) -> Tuple[ThreadsPagedResponse, int]:
+        """The page and the size of the response body it was parsed from."""
         return ThreadsPagedResponse(
             count=0,
             rows=[]
-        )
+        ), 0
+
+    def iter_all(self, query_params: ThreadsQueryParams = ThreadsQueryParams(), prefetch: int = DEFAULT_PREFETCH) -> Iterator[ThreadResponse]:
+        """Yield the threads of every page, fetching up to `prefetch` pages ahead."""
+        return iter_all_pages(partial(self.get, use_cache=False), query_params, prefetch=prefetch)
+
+    def get_stream(self, query_params: ThreadsQueryParams = ThreadsQueryParams()) -> Iterator[ThreadResponse]:
+        """Yield the threads of one page as they are decoded from the response body.
+
+        Unlike `get`, the page is never fully loaded in memory, which keeps
+        large `pageSize` values with full message histories affordable.
+        """
+        params = self._get_query_params(self.api_key, query_params)
+
+        try:
+            with self._request("GET", self.base_endpoint, params=params, stream=True) as response:
+                yield from iter_paged_rows(ThreadResponse, response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+        except MelodiAPIError as e:
+            raise MelodiAPIError(e)
@@ -0,0 +1,52 @@
+import threading
+from abc import ABC, abstractmethod
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+
+from melodi.concurrency import DEFAULT_MAX_WORKERS
+
+
+class Transport(ABC):
+    """Sends the HTTP requests of the Melodi clients.
+
+    Implementations take the same arguments as `requests.request` and
+    return a `requests.Response`, so the clients do not depend on how or
+    where requests are sent, e.g. to the in-process fake API of
+    `melodi.testing.FakeMelodiTransport`.
+    """
+
+    @abstractmethod
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        ...
+
+    def reserve_connections(self, count: int):
+        """Prepare for up to `count` concurrent requests, e.g. by growing a connection pool."""
+        pass
+
+
+class RequestsTransport(Transport):
+    """Sends requests with a pooled `requests.Session`.
+
+    The pool keeps `pool_maxsize` connections per host, and grows when a
+    bulk call reserves more so that its workers do not discard connections.
+    """
+
+    def __init__(self, pool_maxsize: int = DEFAULT_MAX_WORKERS):
+        self.session = requests.Session()
+        self.pool_maxsize = pool_maxsize
+        self._adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        self._lock = threading.Lock()
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self.session.request(method, url, **kwargs)
+
+    def reserve_connections(self, count: int):
+        with self._lock:
+            if count <= self.pool_maxsize:
+                return
+            # Swaps in a larger pool manager; requests in flight finish on the old one
+            self._adapter.init_poolmanager(DEFAULT_POOLSIZE, count)
+            self.pool_maxsize = count
@@ -1,15 +1,23 @@
 import logging
-from typing import List
+import threading
+from typing import Callable, List, Optional
 
 import requests
-from pydantic import parse_obj_as
 
 from melodi.base_client import BaseClient
+from melodi.concurrency import DEFAULT_MAX_WORKERS, run_bounded
 from melodi.exceptions import MelodiAPIError
 from melodi.logging import _log_melodi_http_errors
+from melodi.parsing import parse_response
 from melodi.user_internal_for_project.data_models import (
     BulkUserInternalForProjectRequest, BulkUserInternalForProjectResponse)
 
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_MAX_CHUNK_BYTES = 256 * 1024
+
+# Called with (users submitted so far, total users) after every chunk
+ProgressCallback = Callable[[int, int], None]
+
 
 def _empty_bulk_user_internal_for_project_response() -> BulkUserInternalForProjectResponse:
     return BulkUserInternalForProjectResponse(
@@ -17,6 +25,25 @@ def _empty_bulk_user_internal_for_project_response() -> BulkUserInternalForProje
     )
 
 
+def _chunk_user_ids(user_ids: List[int], max_count: int, max_bytes: int) -> List[List[int]]:
+    """Split `user_ids` into chunks of at most `max_count` ids and about `max_bytes` of JSON."""
+    chunks = []
+    chunk, chunk_bytes = [], 0
+    for user_id in user_ids:
+        # The id and its separating comma
+        id_bytes = len(str(user_id)) + 1
+        if chunk and (len(chunk) >= max_count or chunk_bytes + id_bytes > max_bytes):
+            chunks.append(chunk)
+            chunk, chunk_bytes = [], 0
+        chunk.append(user_id)
+        chunk_bytes += id_bytes
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
 class UserInternalForProjectClient(BaseClient):
     def __init__(self, base_url: str, api_key: str):
         self.api_key = api_key
@@ -31,10 +58,90 @@ class UserInternalForProjectClient(BaseClient):
 
         self.logger = logging.getLogger(__name__)
 
-    def set_users_internal(self, project_id: int, user_ids: List[int]) -> BulkUserInternalForProjectResponse:
+    def set_users_internal(
+        self,
+        project_id: int,
+        user_ids: List[int],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> BulkUserInternalForProjectResponse:
+        """Mark users as internal, returning how many were updated across all chunks.
+
+        `user_ids` is sent in requests of at most `chunk_size` ids and about
+        `max_chunk_bytes` of JSON, up to `max_workers` at a time. Chunks are
+        retried by the client's retry policy, as repeating one is harmless,
+        and `on_progress` is called after every chunk that succeeds.
+        """
+        responses = self._submit_chunked(
+            self._set_users_internal_chunk, "POST", project_id, user_ids,
+            chunk_size, max_chunk_bytes, max_workers, on_progress,
+        )
+        return BulkUserInternalForProjectResponse(count=sum(response.count for response in responses))
+
+    def set_users_not_internal(
+        self,
+        project_id: int,
+        user_ids: List[int],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_chunk_bytes: int = DEFAULT_MAX_CHUNK_BYTES,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> None:
+        self._submit_chunked(
+            self._set_users_not_internal_chunk, "DELETE", project_id, user_ids,
+            chunk_size, max_chunk_bytes, max_workers, on_progress,
+        )
+        return None
+
+    def _set_users_internal_chunk(self, project_id: int, user_ids: List[int]) -> BulkUserInternalForProjectResponse:
         return BulkUserInternalForProjectResponse(
             count=0,
         )
 
-    def set_users_not_internal(self, project_id: int, user_ids: List[int]) -> None:
+    def _set_users_not_internal_chunk(self, project_id: int, user_ids: List[int]) -> None:
         return None
+
+    def _submit_chunked(
+        self,
+        submit: Callable[[int, List[int]], object],
+        method: str,
+        project_id: int,
+        user_ids: List[int],
+        chunk_size: int,
+        max_chunk_bytes: int,
+        max_workers: int,
+        on_progress: Optional[ProgressCallback],
+    ) -> list:
+        """Submit `user_ids` in chunks on a bounded worker pool.
+
+        Each chunk goes through the client's retry policy as an idempotent
+        `method` request, since marking the same users again changes nothing.
+        Every chunk is attempted; if any fails, a MelodiAPIError is raised
+        once the others have finished.
+        """
+        chunks = _chunk_user_ids(user_ids, chunk_size, max_chunk_bytes)
+        submitted = 0
+        progress_lock = threading.Lock()
+
+        def submit_chunk(chunk: List[int]):
+            nonlocal submitted
+            response = self.retry_policy.call(method, lambda: submit(project_id, chunk), idempotent=True)
+
+            if on_progress is not None:
+                with progress_lock:
+                    submitted += len(chunk)
+                    on_progress(submitted, len(user_ids))
+            return response
+
+        self.transport.reserve_connections(max_workers)
+        results = run_bounded(submit_chunk, chunks, max_workers=max_workers)
+
+        failed = [result for result in results if not result.ok]
+        if failed:
+            raise MelodiAPIError(
+                f"{len(failed)} of {len(chunks)} chunks failed, first error: {failed[0].error}"
+            ) from failed[0].error
+
+        return [result.result for result in results]
@@ -0,0 +1,97 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from melodi.user_segment_types.data_models import UserSegmentTypesQueryParams
+from melodi.user_segment_types.user_segment_types_client import \
+    UserSegmentTypesClient
+
+
+class UserSegmentIndex:
+    """In-memory lookup from (segment type name, segment name) to ids.
+
+    Built from `UserSegmentTypesClient.get` and rebuilt once older than
+    `ttl` seconds. A lookup miss also triggers a rebuild, at most once every
+    `miss_refresh_interval` seconds, so newly created segments are found
+    without refetching the definitions on every unknown name.
+    """
+
+    def __init__(
+        self,
+        user_segment_types_client: UserSegmentTypesClient,
+        query_params: UserSegmentTypesQueryParams = UserSegmentTypesQueryParams(),
+        ttl: float = 300.0,
+        miss_refresh_interval: float = 10.0,
+    ):
+        self.user_segment_types_client = user_segment_types_client
+        self.query_params = query_params
+        self.ttl = ttl
+        self.miss_refresh_interval = miss_refresh_interval
+
+        # (type name, segment name) -> (type id, segment id)
+        self._index: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.Lock()
+        # Held while refreshing from `resolve`, so concurrent lookups of a stale index refresh it once
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self):
+        # Past the response cache, whose TTL would otherwise outlast `miss_refresh_interval`
+        definitions = self.user_segment_types_client.get(self.query_params, use_cache=False)
+        index = {
+            (segment_type.name, segment.name): (segment_type.id, segment.id)
+            for segment_type in definitions
+            for segment in segment_type.segments
+        }
+
+        with self._lock:
+            self._index = index
+            self._refreshed_at = time.monotonic()
+
+    def resolve(self, type_name: str, segment_name: str) -> Optional[Tuple[int, int]]:
+        """Return `(segment type id, segment id)`, or None if the segment does not exist."""
+        self._refresh_if_older_than(self.ttl)
+
+        ids = self._index.get((type_name, segment_name))
+        if ids is None:
+            self._refresh_if_older_than(self.miss_refresh_interval)
+            ids = self._index.get((type_name, segment_name))
+
+        return ids
+
+    def segment_id(self, type_name: str, segment_name: str) -> Optional[int]:
+        ids = self.resolve(type_name, segment_name)
+        return ids[1] if ids else None
+
+    def segment_ids(self, segments: Dict[str, List[str]]) -> List[int]:
+        """Resolve `User.segments`-style names to segment ids, e.g. for `ThreadsQueryParams.userSegmentIds`.
+
+        Unknown segments are left out.
+        """
+        segment_ids = []
+        for type_name, segment_names in segments.items():
+            for segment_name in segment_names:
+                segment_id = self.segment_id(type_name, segment_name)
+                if segment_id is not None:
+                    segment_ids.append(segment_id)
+
+        return segment_ids
+
+    def _refresh_if_older_than(self, max_age: float):
+        """Refresh the index unless it was (re)built within `max_age` seconds."""
+        if not self._is_older_than(max_age):
+            return
+
+        with self._refresh_lock:
+            # Another caller may have refreshed it while this one waited
+            if self._is_older_than(max_age):
+                self.refresh()
+
+    def _is_older_than(self, max_age: float) -> bool:
+        age = self._age()
+        return age is None or age > max_age
+
+    def _age(self) -> Optional[float]:
+        if self._refreshed_at is None:
+            return None
+        return time.monotonic() - self._refreshed_at
@@ -1,12 +1,12 @@
 import logging
-from typing import List
+from typing import List, Tuple
 
 import requests
-from pydantic import parse_obj_as
 
 from melodi.base_client import BaseClient
 from melodi.exceptions import MelodiAPIError
 from melodi.logging import _log_melodi_http_errors
+from melodi.parsing import parse_response
 from melodi.user_segment_types.data_models import (UserSegmentTypeDefinition,
                                                    UserSegmentTypesQueryParams)
 
@@ -25,5 +25,14 @@ class UserSegmentTypesClient(BaseClient):
 
         self.logger = logging.getLogger(__name__)
 
-    def get(self, query_params: UserSegmentTypesQueryParams = UserSegmentTypesQueryParams()) -> List[UserSegmentTypeDefinition]:
-        return []
+    def get(
+        self, query_params: UserSegmentTypesQueryParams = UserSegmentTypesQueryParams(), use_cache: bool = True
+    ) -> List[UserSegmentTypeDefinition]:
+        """Get the segment types. With `use_cache=False` the response cache is bypassed, e.g. to see new segments."""
+        if not use_cache:
+            return self._get(query_params)[0]
+        return self._read_through("user_segment_types", query_params, lambda: self._get(query_params))
+
+    def _get(self, query_params: UserSegmentTypesQueryParams) -> Tuple[List[UserSegmentTypeDefinition], int]:
+        """The segment types and the size of the response body they were parsed from."""
+        return [], 0
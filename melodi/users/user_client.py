@@ -1,11 +1,17 @@
+import hashlib
 import logging
+import threading
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import requests
-from pydantic import parse_obj_as
 
 from melodi.base_client import BaseClient
+from melodi.concurrency import DEFAULT_MAX_WORKERS, BulkItemResult, run_bounded
 from melodi.exceptions import MelodiAPIError
 from melodi.logging import _log_melodi_http_errors
+from melodi.paging import DEFAULT_PREFETCH, iter_all_pages
+from melodi.parsing import parse_response
 from melodi.users.data_models import (User, UserResponse, UsersPagedResponse,
                                       UsersQueryParams)
 
@@ -32,16 +38,71 @@ class UserClient(BaseClient):
             self.base_endpoint + f"?apiKey={self.api_key}"
         )
 
+        # externalId -> content hash of the last user upserted by create_or_update_many
+        self.synced_hashes: Dict[str, str] = {}
+        self._synced_hashes_lock = threading.Lock()
+
         self.logger = logging.getLogger(__name__)
 
-    def get(self, query_params: UsersQueryParams = UsersQueryParams()) -> UsersPagedResponse:
+    def get(self, query_params: UsersQueryParams = UsersQueryParams(), use_cache: bool = True) -> UsersPagedResponse:
+        """Get one page. With `use_cache=False` the response cache is bypassed, as bulk reads do so they do not flush it."""
+        if not use_cache:
+            return self._get(query_params)[0]
+        return self._read_through("users", query_params, lambda: self._get(query_params))
+
+    def _get(self, query_params: UsersQueryParams) -> Tuple[UsersPagedResponse, int]:
+        """The page and the size of the response body it was parsed from."""
         return UsersPagedResponse(
             count=0,
             rows=[]
-        )
+        ), 0
+
+    def iter_all(self, query_params: UsersQueryParams = UsersQueryParams(), prefetch: int = DEFAULT_PREFETCH) -> Iterator[UserResponse]:
+        """Yield the users of every page, fetching up to `prefetch` pages ahead."""
+        return iter_all_pages(partial(self.get, use_cache=False), query_params, prefetch=prefetch)
+
+    def create_or_update_many(
+        self,
+        users: List[User],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        synced_hashes: Optional[Dict[str, str]] = None,
+    ) -> List[BulkItemResult[User, UserResponse]]:
+        """Upsert many users, returning one result per user in input order.
+
+        Users are upserted concurrently, with at most `max_workers` requests
+        in flight. Users whose content is unchanged since they were last
+        upserted are skipped. `synced_hashes` (by default `self.synced_hashes`)
+        maps external ids to content hashes and is updated in place, so it can
+        be persisted between runs.
+        """
+        if synced_hashes is None:
+            synced_hashes = self.synced_hashes
+
+        content_hashes = [hashlib.sha256(user.model_dump_json().encode()).hexdigest() for user in users]
+        changed = [
+            index for index, user in enumerate(users)
+            if synced_hashes.get(user.externalId) != content_hashes[index]
+        ]
+
+        def upsert(index: int) -> UserResponse:
+            response = self.create_or_update(users[index])
+            with self._synced_hashes_lock:
+                synced_hashes[users[index].externalId] = content_hashes[index]
+            return response
+
+        results = [BulkItemResult(item=user, skipped=True) for user in users]
+        self.transport.reserve_connections(max_workers)
+        for upserted in run_bounded(upsert, changed, max_workers=max_workers):
+            results[upserted.item] = BulkItemResult(
+                item=users[upserted.item], result=upserted.result, error=upserted.error
+            )
+        return results
 
     def create_or_update(self, user: User) -> UserResponse:
+        # Threads embed their external user
+        self._invalidate("users", "threads")
         return _empty_user_response()
 
     def update(self, user: User) -> User:
+        self._invalidate("users", "threads")
         return user
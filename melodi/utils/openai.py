@@ -17,6 +17,7 @@ from typing import Optional, Callable
 from packaging.version import Version
 from wrapt import wrap_function_wrapper
 
+from melodi.circuit_breaker import CircuitBreaker
 from melodi.melodi_client import MelodiClient
 from melodi.utils.openai_nonstream_extractor import (
     create_melodi_thread_from_openai_response,
@@ -77,7 +78,9 @@ def _wrap(
     melodi_client = melodi_initialize_func()
     arg_extractor = OpenAiKwargsExtractor(**kwargs)
 
-    prompt_messages = _get_melodi_messages_from_openai_prompt(kwargs, openai_resource)
+    prompt_messages, prompt_metadata = _get_melodi_messages_from_openai_prompt(
+        kwargs, openai_resource
+    ) or ([], {})
     try:
         openai_response = wrapped(**arg_extractor.get_openai_args())
 
@@ -88,6 +91,7 @@ def _wrap(
                     openai_response=openai_response,
                     melodi_client=melodi_client,
                     prompt_messages=prompt_messages,
+                    prompt_metadata=prompt_metadata,
                 )
             except Exception as ex:
                 logger.error(f"Could not create Melodi thread out of streamed response: {repr(ex)}")
@@ -96,6 +100,7 @@ def _wrap(
                 openai_resource=openai_resource,
                 openai_response=openai_response,
                 prompt_messages=prompt_messages,
+                prompt_metadata=prompt_metadata,
                 melodi_client=melodi_client,
             )
 
@@ -105,6 +110,7 @@ def _wrap(
         create_error_melodi_thread(
             melodi_client=melodi_client,
             prompt_messages=prompt_messages,
+            prompt_metadata=prompt_metadata,
             model=kwargs.get("model"),
             exception=str(ex),
         )
@@ -121,7 +127,9 @@ async def _wrap_async(
     melodi_client = melodi_initialize_func()
     arg_extractor = OpenAiKwargsExtractor(**kwargs)
 
-    prompt_messages = _get_melodi_messages_from_openai_prompt(kwargs, openai_resource)
+    prompt_messages, prompt_metadata = _get_melodi_messages_from_openai_prompt(
+        kwargs, openai_resource
+    ) or ([], {})
 
     try:
         openai_response = await wrapped(**arg_extractor.get_openai_args())
@@ -133,6 +141,7 @@ async def _wrap_async(
                     openai_response=openai_response,
                     melodi_client=melodi_client,
                     prompt_messages=prompt_messages,
+                    prompt_metadata=prompt_metadata,
                 )
             except Exception as ex:
                 logger.error(f"Could not create Melodi thread out of streamed response: {repr(ex)}")
@@ -141,6 +150,7 @@ async def _wrap_async(
                 openai_resource=openai_resource,
                 openai_response=openai_response,
                 prompt_messages=prompt_messages,
+                prompt_metadata=prompt_metadata,
                 melodi_client=melodi_client,
             )
 
@@ -150,19 +160,29 @@ async def _wrap_async(
         create_error_melodi_thread(
             melodi_client=melodi_client,
             prompt_messages=prompt_messages,
+            prompt_metadata=prompt_metadata,
             model=kwargs.get("model"),
             exception=str(ex),
         )
         raise ex
 
 
+def _capture_breaker() -> Optional[CircuitBreaker]:
+    """A breaker for thread capture when `MELODI_CAPTURE_BREAKER` is set, see melodi.circuit_breaker."""
+    if os.getenv("MELODI_CAPTURE_BREAKER", "").lower() not in ("1", "true"):
+        return None
+    return CircuitBreaker(call_timeout=float(os.getenv("MELODI_CAPTURE_TIMEOUT", "5")))
+
+
 class OpenAIMelodi:
     melodi_client: Optional[MelodiClient] = None
 
     def initialize(self):
         if self.melodi_client is None:
             self.melodi_client = MelodiClient(
-                api_key=os.getenv("MELODI_API_KEY"), verbose=True
+                api_key=os.getenv("MELODI_API_KEY"),
+                verbose=True,
+                capture_breaker=_capture_breaker(),
             )
 
         return self.melodi_client
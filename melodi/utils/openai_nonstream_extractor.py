@@ -1,4 +1,5 @@
-from melodi.messages.data_models import Message
+from typing import Optional
+
 from melodi.utils.openai_utils import (
     OpenAiDefinition,
     _is_openai_v1,
@@ -9,6 +10,7 @@ from melodi.utils.openai_utils import (
     COMPLETION_USAGE_PROMPT_TOKENS_KEYS,
     NON_STREAM_MESSAGE_KEYS, parse_metadata_value,
 )
+from melodi.utils.records import MessageRecord
 from melodi.utils.utils import create_melodi_thread, handle_melodi_failure
 
 
@@ -18,6 +20,7 @@ def create_melodi_thread_from_openai_response(
     openai_response,
     melodi_client,
     prompt_messages: list,
+    prompt_metadata: Optional[dict] = None,
 ):
     melodi_messages, response_id = _get_melodi_messages_from_openai_response(
         resource=openai_resource,
@@ -28,6 +31,7 @@ def create_melodi_thread_from_openai_response(
         melodi_messages=melodi_messages,
         response_id=response_id,
         prompt_messages=prompt_messages,
+        prompt_metadata=prompt_metadata,
     )
 
 
@@ -72,7 +76,7 @@ def _get_melodi_messages_from_openai_response(resource: OpenAiDefinition, respon
         metadata.update(**response_metadata)
 
         melodi_messages.append(
-            Message(
+            MessageRecord(
                 externalId=f'{metadata.get("id")}{id_suffix}',
                 role=metadata.get("role").title(),
                 content=content,
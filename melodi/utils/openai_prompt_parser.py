@@ -1,11 +1,12 @@
 from openai import NotGiven
 
-from melodi.messages.data_models import Message
 from melodi.utils.openai_utils import (
     GENERATION_PARAMETERS_DEFAULTS,
     parse_metadata_value,
     OpenAiDefinition,
 )
+from melodi.utils.records import MessageRecord
+from melodi.utils.schema_cache import serialize_schema
 from melodi.utils.utils import handle_melodi_failure
 
 
@@ -13,39 +14,37 @@ from melodi.utils.utils import handle_melodi_failure
 def _get_melodi_messages_from_openai_prompt(
     kwargs: dict, openai_resource: OpenAiDefinition
 ):
-    """Convert the OpenAI prompt in Melodi messages."""
+    """Convert the OpenAI prompt in Melodi messages and the metadata they share.
+
+    Generation parameters and tool schemas are the same for every prompt
+    message, so they are returned once to be stored on the thread.
+    """
     if openai_resource.type == "completion":
         prompt = kwargs.get("prompt", {})
     elif openai_resource.type == "chat":
         prompt = _extract_chat_prompt(kwargs)
     else:
         # Currently only chat and completion objects are supported
-        return []
+        return [], {}
 
     if not prompt.get("messages"):
-        return []
-
-    generation_metadata = _get_generation_metadata(kwargs)
+        return [], {}
 
-    prompt_messages = prompt.pop("messages")
-    message_metadata = {
-        "type": "input_message",
-    }
-    message_metadata.update(**prompt)
-    message_metadata.update(**generation_metadata)
+    thread_metadata = {key: value for key, value in prompt.items() if key != "messages"}
+    thread_metadata.update(**_get_generation_metadata(kwargs))
 
     melodi_messages = []
-    for message in prompt_messages:
+    for message in prompt["messages"]:
         melodi_messages.append(
-            Message(
+            MessageRecord(
                 externalId=f"input_{len(melodi_messages)}",
                 role=message["role"].title(),
                 content=message["content"],
-                metadata=message_metadata,
+                metadata={"type": "input_message"},
             )
         )
 
-    return melodi_messages
+    return melodi_messages, thread_metadata
 
 
 def _get_generation_metadata(kwargs: dict):
@@ -71,7 +70,7 @@ def _extract_chat_prompt(kwargs: dict):
         if not kwargs.get(key):
             continue
 
-        prompt[key] = parse_metadata_value(kwargs.get(key))
+        prompt.update(serialize_schema(key, kwargs.get(key)))
 
     prompt_messages = [
         _process_prompt_message(message) for message in kwargs.get("messages", [])
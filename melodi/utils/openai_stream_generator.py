@@ -1,7 +1,7 @@
 from collections import defaultdict
+from typing import Optional
 
 from melodi.melodi_client import MelodiClient
-from melodi.messages.data_models import Message
 from melodi.utils.openai_nonstream_extractor import to_dict
 from melodi.utils.openai_utils import (
     OpenAiDefinition,
@@ -9,6 +9,7 @@ from melodi.utils.openai_utils import (
     _is_openai_v1,
     parse_metadata_value,
 )
+from melodi.utils.records import MessageRecord
 from melodi.utils.utils import create_melodi_thread
 
 
@@ -114,7 +115,7 @@ def _extract_streamed_openai_response(resource: OpenAiDefinition, chunks: list):
         "tool_calls": parse_metadata_value(completion.get("tool_calls")),
     }
 
-    melodi_message = Message(
+    melodi_message = MessageRecord(
         externalId=response_id,
         role=completion["role"].title() if completion["role"] else None,
         content=completion["content"] if completion["role"] else None,
@@ -132,6 +133,7 @@ class MelodiResponseGeneratorSync:
         openai_response,
         melodi_client: MelodiClient,
         prompt_messages: list,
+        prompt_metadata: Optional[dict] = None,
     ):
         self.items = []
 
@@ -139,6 +141,7 @@ class MelodiResponseGeneratorSync:
         self.openai_response = openai_response
         self.melodi_client = melodi_client
         self.prompt_messages = prompt_messages
+        self.prompt_metadata = prompt_metadata
 
     def __iter__(self):
         try:
@@ -177,6 +180,7 @@ class MelodiResponseGeneratorSync:
             melodi_messages=[melodi_message],
             response_id=response_id,
             prompt_messages=self.prompt_messages,
+            prompt_metadata=self.prompt_metadata,
         )
 
 
@@ -188,6 +192,7 @@ class MelodiResponseGeneratorAsync:
         openai_response,
         melodi_client: MelodiClient,
         prompt_messages: list,
+        prompt_metadata: Optional[dict] = None,
     ):
         self.items = []
 
@@ -195,6 +200,7 @@ class MelodiResponseGeneratorAsync:
         self.openai_response = openai_response
         self.melodi_client = melodi_client
         self.prompt_messages = prompt_messages
+        self.prompt_metadata = prompt_metadata
 
     async def __aiter__(self):
         try:
@@ -233,6 +239,7 @@ class MelodiResponseGeneratorAsync:
             melodi_messages=[melodi_message],
             response_id=response_id,
             prompt_messages=self.prompt_messages,
+            prompt_metadata=self.prompt_metadata,
         )
 
     async def close(self) -> None:
@@ -0,0 +1,59 @@
+from typing import Any, Optional
+
+from melodi.messages.data_models import Message
+
+
+class MessageRecord:
+    """Unvalidated capture of a message, built on the hot path of a wrapped call.
+
+    Mirrors the fields of `Message`; conversion and validation happen in
+    `to_message` when the thread is sent or spooled.
+    """
+
+    __slots__ = ("externalId", "type", "role", "content", "jsonContent", "metadata")
+
+    def __init__(
+        self,
+        externalId: Optional[str] = None,
+        role: Optional[str] = None,
+        content: Optional[str] = None,
+        metadata: Optional[dict] = None,
+        type: str = "markdown",
+        jsonContent: Optional[Any] = None,
+    ):
+        self.externalId = externalId
+        self.type = type
+        self.role = role
+        self.content = content
+        self.jsonContent = jsonContent
+        self.metadata = metadata if metadata is not None else {}
+
+    def to_message(self) -> Message:
+        return Message(
+            externalId=self.externalId,
+            type=self.type,
+            role=self.role,
+            content=self.content,
+            jsonContent=self.jsonContent,
+            metadata=self.metadata,
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, MessageRecord):
+            return NotImplemented
+
+        return all(
+            getattr(self, slot) == getattr(other, slot) for slot in self.__slots__
+        )
+
+    def __repr__(self):
+        fields = ", ".join(f"{slot}={getattr(self, slot)!r}" for slot in self.__slots__)
+        return f"MessageRecord({fields})"
+
+
+def to_messages(records: list) -> list:
+    """Convert captured records to `Message` objects, passing `Message` through."""
+    return [
+        record.to_message() if isinstance(record, MessageRecord) else record
+        for record in records
+    ]
@@ -0,0 +1,108 @@
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Tuple
+
+from melodi.utils.openai_utils import parse_metadata_value
+
+SCHEMA_CACHE_SIZE = 256
+
+
+def _reference_schemas_by_hash() -> bool:
+    return os.getenv("MELODI_REFERENCE_SCHEMAS_BY_HASH", "").lower() in ("1", "true")
+
+
+class SchemaCache:
+    """Bounded LRU of serialized tool and function schemas.
+
+    Entries are looked up by object identity first, so passing the same
+    `tools` object on every request skips serialization. An identity hit is
+    only used while the object still equals the copy taken when it was
+    serialized, so schemas mutated in place are serialized again. Equal
+    schemas passed as different objects share one serialized string, keyed
+    by its content hash.
+    """
+
+    def __init__(self, maxsize: int = SCHEMA_CACHE_SIZE):
+        self.maxsize = maxsize
+        # id(value) -> (value, snapshot, serialized, digest); holding the value keeps its id stable
+        self._by_identity = OrderedDict()
+        # digest -> serialized
+        self._by_digest = OrderedDict()
+        # digests of schemas embedded in a thread that was created
+        self._sent = set()
+        self._lock = threading.Lock()
+
+    def serialize(self, value: Any) -> Tuple[str, str]:
+        """Return the serialized schema and its content hash."""
+        with self._lock:
+            entry = self._by_identity.get(id(value))
+            # Comparing to the snapshot is much cheaper than serializing and hashing again
+            if entry is not None and entry[0] is value and entry[1] == value:
+                self._by_identity.move_to_end(id(value))
+                self._by_digest.move_to_end(entry[3])
+                return entry[2], entry[3]
+
+        serialized = parse_metadata_value(value)
+        digest = hashlib.sha256(serialized.encode()).hexdigest()
+        snapshot = copy.deepcopy(value)
+
+        with self._lock:
+            serialized = self._by_digest.setdefault(digest, serialized)
+            self._by_digest.move_to_end(digest)
+            self._by_identity[id(value)] = (value, snapshot, serialized, digest)
+
+            while len(self._by_identity) > self.maxsize:
+                self._by_identity.popitem(last=False)
+            while len(self._by_digest) > self.maxsize:
+                evicted, _ = self._by_digest.popitem(last=False)
+                self._sent.discard(evicted)
+
+        return serialized, digest
+
+    def is_sent(self, digest: str) -> bool:
+        with self._lock:
+            return digest in self._sent
+
+    def mark_sent(self, digest: str):
+        with self._lock:
+            if digest in self._by_digest:
+                self._sent.add(digest)
+
+    def clear(self):
+        with self._lock:
+            self._by_identity.clear()
+            self._by_digest.clear()
+            self._sent.clear()
+
+
+schema_cache = SchemaCache()
+
+
+def serialize_schema(key: str, value: Any) -> dict:
+    """Serialize a `tools`/`functions`/`function_call` prompt value into metadata.
+
+    When MELODI_REFERENCE_SCHEMAS_BY_HASH is set, the schema is embedded
+    until a thread carrying it was created, see `mark_schemas_sent`;
+    afterwards threads refer to it through `<key>_hash`.
+    """
+    if not isinstance(value, (list, dict)):
+        return {key: parse_metadata_value(value)}
+
+    serialized, digest = schema_cache.serialize(value)
+    if not _reference_schemas_by_hash():
+        return {key: serialized}
+
+    metadata = {f"{key}_hash": digest}
+    if not schema_cache.is_sent(digest):
+        metadata[key] = serialized
+    return metadata
+
+
+def mark_schemas_sent(metadata: dict):
+    """Record the schemas embedded in the metadata of a created thread, so later threads only reference them."""
+    for key, value in metadata.items():
+        if key.endswith("_hash") and key[:-len("_hash")] in metadata:
+            schema_cache.mark_sent(value)
@@ -1,12 +1,43 @@
 import logging
 import os
+from typing import Callable
 
 from melodi.threads.data_models import Thread
 from melodi.utils.openai_utils import time_now
+from melodi.utils.records import to_messages
+from melodi.utils.schema_cache import mark_schemas_sent
 
 logger = logging.getLogger("melodi")
 
 
+def _capture_thread(melodi_client, build_thread: Callable[[], Thread]):
+    """Create the thread, unless the client's capture breaker is open, in which case it is spooled or dropped.
+
+    `build_thread` validates the captured records into a `Thread` and is only
+    called once the thread is sent or spooled, so with a breaker
+    `call_timeout` that work runs off the caller's thread too.
+    """
+    def create():
+        thread = build_thread()
+        melodi_client.threads.create(thread)
+        mark_schemas_sent(thread.metadata)
+
+    breaker = melodi_client.capture_breaker
+    if breaker is None:
+        create()
+        return
+
+    spool = melodi_client.capture_spool
+
+    def shed():
+        if spool is not None:
+            spool.add(build_thread())
+        else:
+            logger.warning("Melodi circuit breaker is open, dropping thread")
+
+    breaker.call(create, fallback=shed)
+
+
 def handle_melodi_failure(value):
     def decorate(wrapped_func):
         def applicator(*args, **kwargs):
@@ -22,39 +53,52 @@ def handle_melodi_failure(value):
 
 
 @handle_melodi_failure("Could not create a Melodi thread")
-def create_melodi_thread(melodi_client, melodi_messages, response_id, prompt_messages):
+def create_melodi_thread(
+    melodi_client, melodi_messages, response_id, prompt_messages, prompt_metadata=None
+):
     logger.info("Creating Melodi thread ...")
-    thread_metadata = {
-        "created": time_now(as_string=True),
-        "response_id": response_id,
-    }
-    # Create Melodi thread
-    thread = Thread(
-        projectId=os.getenv("MELODI_PROJECT_ID"),
-        externalId=response_id,
-        messages=prompt_messages + melodi_messages,
-        metadata=thread_metadata,
+    # Metadata shared by the prompt messages is stored once, on the thread
+    thread_metadata = dict(prompt_metadata or {})
+    thread_metadata.update(
+        created=time_now(as_string=True),
+        response_id=response_id,
     )
-    melodi_client.threads.create(thread)
+
+    def build_thread() -> Thread:
+        # Validates the records captured during the call
+        return Thread(
+            projectId=os.getenv("MELODI_PROJECT_ID"),
+            externalId=response_id,
+            messages=to_messages(prompt_messages + melodi_messages),
+            metadata=thread_metadata,
+        )
+
+    _capture_thread(melodi_client, build_thread)
     logger.info("Done creating Melodi thread.")
 
 
 @handle_melodi_failure("Could not create a Melodi thread")
-def create_error_melodi_thread(melodi_client, prompt_messages, model, exception):
+def create_error_melodi_thread(
+    melodi_client, prompt_messages, model, exception, prompt_metadata=None
+):
     logger.warning("Creating Melodi error thread ...")
-    metadata = {
-        "completion_tokens": 0,
-        "prompt_tokens": 0,
-        "total_tokens": 0,
-        "openai_error": exception,
-        "created": time_now(as_string=True),
-    }
+    metadata = dict(prompt_metadata or {})
+    metadata.update(
+        completion_tokens=0,
+        prompt_tokens=0,
+        total_tokens=0,
+        openai_error=exception,
+        created=time_now(as_string=True),
+    )
     if model:
         metadata["model"] = model
-    melodi_error_thread = Thread(
-        projectId=os.getenv("MELODI_PROJECT_ID"),
-        messages=prompt_messages,
-        metadata=metadata,
-    )
-    melodi_client.threads.create(melodi_error_thread)
+
+    def build_thread() -> Thread:
+        return Thread(
+            projectId=os.getenv("MELODI_PROJECT_ID"),
+            messages=to_messages(prompt_messages),
+            metadata=metadata,
+        )
+
+    _capture_thread(melodi_client, build_thread)
     logger.warning("Done creating Melodi error thread.")
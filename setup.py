@@ -11,11 +11,13 @@ setup(
     packages=find_packages(),
     install_requires=[
         'requests',
-        'pydantic',
+        'pydantic>=2',
         'email-validator'
     ],
     extra_require={
         'openai': ['openai', 'wrapt'],
+        'parquet': ['pyarrow'],
+        'analytics': ['numpy', 'pandas'],
     },
     author='Melodi Ltd',
     author_email='info@melodi.fyi',
@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone
+
+try:
+    import pyarrow.parquet as pq
+
+    from melodi.export.parquet_exporter import (ThreadsParquetWriter,
+                                                export_threads_to_parquet)
+except ModuleNotFoundError:
+    pq = None
+
+from melodi.threads.data_models import ThreadResponse, ThreadsQueryParams
+from test.helpers import (feedback_payload, issue_association_payload,
+                          make_thread, message_payload)
+
+
+def _thread(thread_id: int) -> ThreadResponse:
+    message_id = thread_id * 10 + 1
+    return make_thread(thread_id, project_id=2, messages=[
+        message_payload(thread_id * 10, role="user", content="Hello", metadata={"model": "gpt-4o"}),
+        message_payload(
+            message_id,
+            feedback=[feedback_payload(thread_id, "NEGATIVE", project_id=2)],
+            issue_associations=[issue_association_payload(thread_id, 3, message_id, name="hallucination")],
+        ),
+    ])
+
+
+@unittest.skipIf(pq is None, "pyarrow not installed")
+class TestParquetExporter(unittest.TestCase):
+    def test_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with ThreadsParquetWriter(directory, batch_size=3) as writer:
+                self.assertEqual(writer.write(_thread(thread_id) for thread_id in range(5)), 5)
+
+            threads = pq.read_table(os.path.join(directory, "threads.parquet")).to_pylist()
+            messages = pq.read_table(os.path.join(directory, "messages.parquet")).to_pylist()
+            feedback = pq.read_table(os.path.join(directory, "feedback.parquet")).to_pylist()
+            issues = pq.read_table(os.path.join(directory, "issue_associations.parquet")).to_pylist()
+            intents = pq.read_table(os.path.join(directory, "intent_associations.parquet")).to_pylist()
+
+        self.assertEqual([thread["id"] for thread in threads], list(range(5)))
+        self.assertEqual(threads[0]["projectName"], "test")
+        self.assertEqual(threads[0]["createdAt"], datetime(2024, 5, 1, 12, tzinfo=timezone.utc))
+        self.assertEqual(len(messages), 10)
+        self.assertEqual(messages[0]["metadata"], '{"model": "gpt-4o"}')
+        self.assertEqual(messages[1]["position"], 1)
+        self.assertEqual([row["threadId"] for row in feedback], list(range(5)))
+        self.assertEqual(feedback[0]["feedbackType"], "NEGATIVE")
+        self.assertEqual(issues[0]["issueName"], "hallucination")
+        self.assertEqual(intents, [])
+
+    def test_export_requests_feedback_issues_and_intents(self):
+        queries = []
+
+        class ThreadsClient:
+            def iter_all(self, query_params):
+                queries.append(query_params)
+                thread = _thread(1)
+                # Like the API, leave out what was not asked for
+                for message in thread.messages:
+                    if not query_params.includeFeedback:
+                        message.externalFeedback = []
+                    if not query_params.includeIssues:
+                        message.issueAssociations = []
+                return iter([thread])
+
+        with tempfile.TemporaryDirectory() as directory:
+            export_threads_to_parquet(ThreadsClient(), directory, ThreadsQueryParams(projectId=2))
+
+            feedback = pq.read_table(os.path.join(directory, "feedback.parquet")).to_pylist()
+            issues = pq.read_table(os.path.join(directory, "issue_associations.parquet")).to_pylist()
+
+        self.assertEqual(len(feedback), 1)
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(queries[0].projectId, 2)
+        self.assertTrue(queries[0].includeIntents)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from melodi.export.threads_exporter import ThreadsExporter
+from melodi.threads.data_models import (ThreadResponse, ThreadsPagedResponse,
+                                        ThreadsQueryParams)
+from test.helpers import make_thread
+
+START = datetime(2024, 1, 1)
+
+
+def _thread(thread_id: int) -> ThreadResponse:
+    return make_thread(thread_id, messages=[], created_at=(START + timedelta(minutes=thread_id)).isoformat())
+
+
+class _FakeThreadsClient:
+    """Serves threads with inclusive `after`/`before` bounds, or exclusive ones like the API."""
+
+    def __init__(self, threads, fail_after_calls=None, exclusive_bounds=False):
+        self.threads = threads
+        self.fail_after_calls = fail_after_calls
+        self.exclusive_bounds = exclusive_bounds
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def get(self, query_params, use_cache=True):
+        with self.lock:
+            self.calls += 1
+            if self.fail_after_calls is not None and self.calls > self.fail_after_calls:
+                raise RuntimeError("Melodi API unavailable")
+
+        if self.exclusive_bounds:
+            rows = [
+                thread for thread in self.threads
+                if query_params.after < thread.createdAt < query_params.before
+            ]
+        else:
+            rows = [
+                thread for thread in self.threads
+                if query_params.after <= thread.createdAt <= query_params.before
+            ]
+        start = query_params.pageIndex * query_params.pageSize
+        return ThreadsPagedResponse(count=len(rows), rows=rows[start:start + query_params.pageSize])
+
+
+class TestThreadsExporter(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.directory.name, "threads.jsonl")
+        self.threads = [_thread(thread_id) for thread_id in range(500)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _exported_ids(self):
+        with open(self.output_path) as output:
+            return [json.loads(line)["id"] for line in output]
+
+    def test_export(self):
+        exporter = ThreadsExporter(_FakeThreadsClient(self.threads), max_window_count=60, page_size=25)
+
+        written = exporter.export(self.output_path, START, START + timedelta(minutes=500))
+
+        self.assertEqual(written, 500)
+        self.assertEqual(sorted(self._exported_ids()), list(range(500)))
+
+    def test_export_with_exclusive_bounds(self):
+        # Threads fall exactly on the boundaries of the split windows
+        threads = [_thread(thread_id) for thread_id in range(1, 600)]
+        exporter = ThreadsExporter(_FakeThreadsClient(threads, exclusive_bounds=True), max_window_count=60)
+
+        written = exporter.export(self.output_path, START, START + timedelta(minutes=600))
+
+        self.assertEqual(written, 599)
+        self.assertEqual(sorted(self._exported_ids()), list(range(1, 600)))
+
+    def test_export_resumes_from_checkpoint(self):
+        failing_client = _FakeThreadsClient(self.threads, fail_after_calls=15)
+        exporter = ThreadsExporter(failing_client, max_window_count=60, page_size=25, max_workers=1)
+
+        with self.assertRaises(RuntimeError):
+            exporter.export(self.output_path, START, START + timedelta(minutes=500))
+        exported_before_crash = len(self._exported_ids())
+        self.assertGreater(exported_before_crash, 0)
+
+        client = _FakeThreadsClient(self.threads)
+        written = ThreadsExporter(client, max_window_count=60, page_size=25).export(
+            self.output_path, START, START + timedelta(minutes=500)
+        )
+
+        self.assertEqual(written, 500 - exported_before_crash)
+        self.assertEqual(sorted(self._exported_ids()), list(range(500)))
+
+        # A finished export is not fetched again
+        client.calls = 0
+        ThreadsExporter(client).export(self.output_path, START, START + timedelta(minutes=500))
+        self.assertEqual(client.calls, 0)
+
+    def test_export_rejects_checkpoint_of_another_export(self):
+        client = _FakeThreadsClient(self.threads)
+        ThreadsExporter(client).export(self.output_path, START, START + timedelta(minutes=500))
+        client.calls = 0
+
+        with self.assertRaises(ValueError):
+            ThreadsExporter(client).export(self.output_path, START, START + timedelta(minutes=600))
+        with self.assertRaises(ValueError):
+            ThreadsExporter(client).export(
+                self.output_path, START, START + timedelta(minutes=500), ThreadsQueryParams(projectId=2)
+            )
+        self.assertEqual(client.calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import threading
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from melodi.exceptions import MelodiAPIError
+from melodi.feedback.data_models import Feedback, FeedbackResponse
+from melodi.feedback.feedback_client import FeedbackClient
+from melodi.threads.data_models import ThreadResponse
+from test.helpers import make_thread, message_payload
+
+
+def _create(feedback):
+    if feedback.feedbackText == "broken":
+        raise ValueError("Invalid feedback")
+    return FeedbackResponse(
+        id=1,
+        projectId=feedback.projectId,
+        feedbackType=feedback.feedbackType,
+        createdAt=datetime.now(),
+        updatedAt=datetime.now(),
+    )
+
+
+def _thread(external_id: str) -> ThreadResponse:
+    return make_thread(1, externalId=external_id, messages=[message_payload(10, externalId=f"{external_id}-message")])
+
+
+class TestFeedbackClient(unittest.TestCase):
+    def setUp(self):
+        self.client = FeedbackClient(base_url="http://localhost", api_key="test")
+
+    def test_create_many(self):
+        feedback = [Feedback(projectId=1, feedbackType="POSITIVE") for _ in range(5)]
+        feedback.append(Feedback(projectId=1, feedbackText="broken"))
+
+        with patch.object(self.client, "create", side_effect=_create) as create_patch:
+            results = self.client.create_many(feedback, batch_size=2, max_workers=2)
+
+        self.assertEqual([result.item for result in results], feedback)
+        self.assertEqual(create_patch.call_count, 6)
+        self.assertEqual(results[0].result.feedbackType, "POSITIVE")
+        self.assertIsInstance(results[-1].error, ValueError)
+
+    def test_create_many_resolves_external_ids(self):
+        threads_client = MagicMock()
+        threads_client.iter_all.side_effect = lambda query_params: [
+            _thread(external_id) for external_id in query_params.externalIds if external_id != "missing"
+        ]
+        feedback = [
+            Feedback(projectId=1, externalThreadId="a", externalMessageId="a-message"),
+            Feedback(projectId=1, externalThreadId="missing"),
+            Feedback(projectId=1, externalThreadId="b", externalMessageId="a-message"),
+            Feedback(projectId=1, externalThreadId="a"),
+        ]
+
+        with patch.object(self.client, "create", side_effect=_create) as create_patch:
+            results = self.client.create_many(feedback, threads_client=threads_client)
+
+        self.assertEqual(threads_client.iter_all.call_count, 1)
+        self.assertEqual(threads_client.iter_all.call_args[0][0].externalIds, ["a", "b", "missing"])
+        self.assertEqual(create_patch.call_count, 2)
+        self.assertEqual([result.ok for result in results], [True, False, False, True])
+        self.assertIsInstance(results[1].error, MelodiAPIError)
+
+    def test_create_many_is_concurrent(self):
+        feedback = [Feedback(projectId=1, feedbackType="POSITIVE") for _ in range(4)]
+        barrier = threading.Barrier(4, timeout=5)
+
+        def create(item):
+            # Only returns once all four creates are in flight together
+            barrier.wait()
+            return _create(item)
+
+        with patch.object(self.client, "create", side_effect=create):
+            results = self.client.create_many(feedback, batch_size=100, max_workers=4)
+
+        self.assertTrue(all(result.ok for result in results))
+
+    def test_create_many_failed_lookup(self):
+        threads_client = MagicMock()
+        threads_client.iter_all.side_effect = [ConnectionError("Unavailable"), [_thread("c")]]
+        feedback = [Feedback(projectId=1, externalThreadId=external_id) for external_id in ("a", "b", "c")]
+
+        with patch.object(self.client, "create", side_effect=_create) as create_patch:
+            results = self.client.create_many(feedback, batch_size=2, max_workers=1, threads_client=threads_client)
+
+        self.assertEqual(create_patch.call_count, 1)
+        self.assertIsInstance(results[0].error, ConnectionError)
+        self.assertIsInstance(results[1].error, ConnectionError)
+        self.assertTrue(results[2].ok)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Builders of the responses and API payloads shared by the tests."""
+import io
+import json
+from typing import Iterable, Optional
+
+import requests
+
+from melodi.parsing import parse_response
+from melodi.threads.data_models import ThreadResponse
+
+TIMESTAMP = "2024-05-01T12:00:00Z"
+
+
+def make_response(status_code: int = 200, body=b"", headers: dict = None, stream: bool = False) -> requests.Response:
+    """Build a `requests.Response`; a body that is not bytes is encoded as JSON.
+
+    A `stream` response is only readable from `raw`, like one requested
+    with `stream=True`.
+    """
+    if not isinstance(body, bytes):
+        body = json.dumps(body).encode()
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response.raw = io.BytesIO(body)
+    if not stream:
+        response._content = body
+    return response
+
+
+def make_http_error(status_code: int) -> requests.HTTPError:
+    return requests.HTTPError(f"{status_code} error", response=make_response(status_code))
+
+
+def feedback_payload(feedback_id: int, feedback_type: str, project_id: int = 1, created_at: str = TIMESTAMP) -> dict:
+    return {
+        "id": feedback_id,
+        "projectId": project_id,
+        "feedbackType": feedback_type,
+        "createdAt": created_at,
+        "updatedAt": created_at,
+    }
+
+
+def issue_association_payload(
+    association_id: int, issue_id: int, message_id: int, name: str = "test", created_at: str = TIMESTAMP
+) -> dict:
+    return {
+        "id": association_id,
+        "issueId": issue_id,
+        "messageId": message_id,
+        "issue": {"id": issue_id, "name": name, "createdAt": created_at},
+    }
+
+
+def message_payload(
+    message_id: int,
+    role: str = "assistant",
+    content: str = "Hi",
+    feedback: Iterable[dict] = (),
+    issue_associations: Iterable[dict] = (),
+    **fields,
+) -> dict:
+    message = {"id": message_id, "role": role, "content": content, **fields}
+    if feedback:
+        message["externalFeedback"] = list(feedback)
+    if issue_associations:
+        message["issueAssociations"] = list(issue_associations)
+    return message
+
+
+def thread_payload(
+    thread_id: int,
+    messages: Optional[list] = None,
+    project_id: int = 1,
+    created_at: str = TIMESTAMP,
+    **fields,
+) -> dict:
+    """A thread as the API returns it; `fields` override or add top-level keys."""
+    thread = {
+        "id": thread_id,
+        "organizationId": 1,
+        "externalId": f"thread-{thread_id}",
+        "project": {"id": project_id, "name": "test"},
+        "messages": messages if messages is not None else [message_payload(thread_id * 10)],
+        "metadata": {},
+        "createdAt": created_at,
+        "updatedAt": created_at,
+    }
+    thread.update(fields)
+    return thread
+
+
+def make_thread(thread_id: int, **kwargs) -> ThreadResponse:
+    return parse_response(ThreadResponse, thread_payload(thread_id, **kwargs))
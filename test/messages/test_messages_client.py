@@ -0,0 +1,67 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from melodi.messages.data_models import MessageResponse
+from melodi.messages.messages_client import MessagesClient
+
+
+def _get(message_id):
+    if message_id < 0:
+        raise ValueError("Not found")
+    return MessageResponse(id=message_id, role="user")
+
+
+class TestMessagesClient(unittest.TestCase):
+    def setUp(self):
+        self.client = MessagesClient(base_url="http://localhost", api_key="test")
+
+    def test_get_many(self):
+        with patch.object(self.client, "get", side_effect=_get) as get_patch:
+            results = self.client.get_many([3, 1, 3, -1, 2, 1], max_workers=3)
+
+        self.assertEqual(list(results), [3, 1, -1, 2])
+        self.assertEqual(get_patch.call_count, 4)
+        self.assertEqual(results[3].result, MessageResponse(id=3, role="user"))
+        self.assertFalse(results[-1].ok)
+        self.assertIsInstance(results[-1].error, ValueError)
+
+    def test_add_issues_to_messages(self):
+        pairs = [(1, 10), (2, 10), (1, 10), (1, 11)]
+
+        with patch.object(
+            self.client, "add_issue_to_message", wraps=self.client.add_issue_to_message
+        ) as add_patch:
+            results = self.client.add_issues_to_messages(pairs, max_workers=2)
+
+        self.assertEqual(add_patch.call_count, 3)
+        self.assertEqual([result.item for result in results], pairs)
+        self.assertEqual(
+            [(result.result.issueId, result.result.messageId) for result in results], pairs
+        )
+
+    def test_add_intents_to_messages_is_concurrent(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def add(intent_id, message_id):
+            # Only returns once all three calls are in flight together
+            barrier.wait()
+
+        with patch.object(self.client, "add_intent_to_message", side_effect=add):
+            results = self.client.add_intents_to_messages([(1, 10), (1, 11), (2, 10)], max_workers=3)
+
+        self.assertTrue(all(result.ok for result in results))
+
+    def test_remove_intents_from_messages(self):
+        def remove(intent_id, message_id):
+            if message_id < 0:
+                raise ValueError("Not found")
+
+        with patch.object(self.client, "remove_intent_from_message", side_effect=remove):
+            results = self.client.remove_intents_from_messages([(1, 10), (1, -1)])
+
+        self.assertEqual([result.ok for result in results], [True, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
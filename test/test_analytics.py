@@ -0,0 +1,106 @@
+import unittest
+
+try:
+    import numpy as np
+
+    from melodi.analytics import summarize, to_columns
+except ModuleNotFoundError:
+    np = None
+
+from melodi.threads.data_models import ThreadResponse, ThreadsPagedResponse
+from test.helpers import (feedback_payload, issue_association_payload,
+                          make_thread, message_payload)
+
+
+def _thread(thread_id: int, model: str, total_tokens, feedback_type=None, outcome=None, issues=()) -> ThreadResponse:
+    message_id = thread_id * 10
+    return make_thread(
+        thread_id,
+        project_id=2,
+        externalId=None,
+        externalUser={
+            "id": 1,
+            "externalId": "user-1",
+            "segments": [{"id": 5, "name": "enterprise", "type": {"id": 4, "name": "plan"}}],
+        } if thread_id % 2 else None,
+        messages=[
+            message_payload(
+                message_id,
+                metadata={"model": model},
+                feedback=[feedback_payload(thread_id, feedback_type, project_id=2)] if feedback_type else (),
+                issue_associations=[
+                    issue_association_payload(issue_id, issue_id, message_id, name=f"issue-{issue_id}")
+                    for issue_id in issues
+                ],
+            ),
+        ],
+        outcome=outcome,
+        metadata={"total_tokens": total_tokens} if total_tokens is not None else {},
+    )
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.threads = [
+            _thread(1, "gpt-4o", 100, "NEGATIVE", "unsuccessful", issues=[1, 2]),
+            _thread(2, "gpt-4o", 300, "POSITIVE", "successful", issues=[1]),
+            _thread(3, "gpt-4o-mini", "50"),
+            _thread(4, "gpt-4o-mini", None, "NEGATIVE"),
+        ]
+
+    def test_to_columns(self):
+        columns = to_columns([ThreadsPagedResponse(count=4, rows=self.threads[:2]), *self.threads[2:]])
+
+        self.assertEqual(columns.id.tolist(), [1, 2, 3, 4])
+        self.assertEqual(columns.metadata["model"].tolist(), ["gpt-4o", "gpt-4o", "gpt-4o-mini", "gpt-4o-mini"])
+        np.testing.assert_array_equal(columns.metadata["total_tokens"], [100, 300, 50, np.nan])
+        self.assertEqual(columns.negative_feedback.tolist(), [1, 0, 0, 1])
+        self.assertEqual(columns.associations["segment"][1].tolist(), ["plan:enterprise", "plan:enterprise"])
+
+    def test_summarize_by_model(self):
+        summaries = {summary.key: summary for summary in summarize(to_columns(self.threads), by="model")}
+
+        self.assertEqual(summaries["gpt-4o"].threads, 2)
+        self.assertEqual(summaries["gpt-4o"].feedback_rate, 1.0)
+        self.assertEqual(summaries["gpt-4o"].negative_feedback_rate, 0.5)
+        self.assertEqual(summaries["gpt-4o"].total_tokens, 400)
+        self.assertEqual(summaries["gpt-4o"].total_tokens_p50, 200)
+        self.assertEqual(summaries["gpt-4o"].outcomes, {"successful": 1, "unsuccessful": 1})
+        self.assertEqual(summaries["gpt-4o-mini"].total_tokens_p95, 50)
+        self.assertEqual(summaries["gpt-4o-mini"].outcomes, {None: 2})
+        self.assertTrue(np.isnan(summaries["gpt-4o-mini"].latency_ms_p50))
+
+    def test_summarize_by_issue(self):
+        summaries = {summary.key: summary for summary in summarize(to_columns(self.threads), by="issue")}
+
+        self.assertEqual(summaries["issue-1"].threads, 2)
+        self.assertEqual(summaries["issue-2"].negative_feedback, 1)
+        self.assertEqual(summaries[None].threads, 2)
+
+    def test_summarize_by_issue_counts_threads_once(self):
+        thread = _thread(5, "gpt-4o", 200, "NEGATIVE", issues=[1])
+        # Tagged with issue-1 on a second message too
+        thread.messages.append(thread.messages[0].model_copy(update={"id": 51, "externalFeedback": []}))
+
+        summaries = {
+            summary.key: summary for summary in summarize(to_columns([*self.threads, thread]), by="issue")
+        }
+
+        self.assertEqual(summaries["issue-1"].threads, 3)
+        self.assertEqual(summaries["issue-1"].total_tokens, 600)
+        self.assertEqual(summaries["issue-1"].negative_feedback, 2)
+
+    def test_summarize_all(self):
+        [summary] = summarize(to_columns(self.threads))
+
+        self.assertEqual(summary.threads, 4)
+        self.assertEqual(summary.negative_feedback_rate, 0.5)
+
+    def test_unknown_group(self):
+        with self.assertRaises(ValueError):
+            summarize(to_columns(self.threads), by="unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
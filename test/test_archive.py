@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from melodi.archive import ThreadArchive, ThreadArchiveWriter
+from melodi.threads.data_models import ThreadResponse
+from test.helpers import make_thread, message_payload
+
+
+def _thread(thread_id: int, content: str = "Hi") -> ThreadResponse:
+    return make_thread(
+        thread_id,
+        externalId=f"thread-{thread_id}" if thread_id % 3 else None,
+        messages=[message_payload(thread_id * 10, content=content)],
+        metadata={"model": "gpt-4o"},
+    )
+
+
+class TestThreadArchive(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "threads.archive")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        threads = [_thread(thread_id) for thread_id in [5, 1, 9, 3, 7]]
+        with ThreadArchiveWriter(self.path) as writer:
+            self.assertEqual(writer.write(threads), 5)
+
+        with ThreadArchive(self.path) as archive:
+            self.assertEqual(len(archive), 5)
+            self.assertEqual(archive.get(9), threads[2])
+            self.assertEqual(archive.get_by_external_id("thread-7"), threads[4])
+            self.assertIsNone(archive.get(4))
+            self.assertIsNone(archive.get(100))
+            self.assertIsNone(archive.get_by_external_id("thread-3"))
+            self.assertEqual(list(archive), threads)
+
+            raw = archive.get_raw(1)
+            self.assertIsInstance(raw, memoryview)
+            raw.release()
+
+    def test_append(self):
+        with ThreadArchiveWriter(self.path) as writer:
+            writer.write([_thread(1), _thread(2)])
+        with ThreadArchiveWriter(self.path) as writer:
+            writer.write([_thread(3), _thread(1, content="edited")])
+
+        with ThreadArchive(self.path) as archive:
+            self.assertEqual(len(archive), 4)
+            self.assertEqual(archive.get(1).messages[0].content, "edited")
+            self.assertEqual(archive.get_by_external_id("thread-1").messages[0].content, "edited")
+            self.assertEqual(archive.get(2), _thread(2))
+            self.assertEqual([thread.id for thread in archive], [1, 2, 3, 1])
+
+    def test_rebuilds_missing_index(self):
+        with ThreadArchiveWriter(self.path) as writer:
+            writer.write([_thread(1), _thread(2)])
+        os.remove(self.path + ".idx")
+
+        with ThreadArchiveWriter(self.path) as writer:
+            writer.append(_thread(4))
+
+        with ThreadArchive(self.path) as archive:
+            self.assertEqual(archive.get_by_external_id("thread-2"), _thread(2))
+            self.assertEqual(archive.get(4), _thread(4))
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not an archive")
+
+        with self.assertRaises(ValueError):
+            ThreadArchiveWriter(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
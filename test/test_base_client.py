@@ -0,0 +1,95 @@
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from melodi.base_client import BaseClient, _request_key
+from melodi.messages.data_models import MessageResponse
+from melodi.messages.messages_client import MessagesClient
+from melodi.threads.data_models import ThreadsQueryParams
+from test.helpers import make_response
+
+
+class TestBaseClient(unittest.TestCase):
+    def test_get_query_params(self):
+        params = BaseClient._get_query_params(
+            "test",
+            ThreadsQueryParams(
+                projectId=1,
+                externalIds=["a", "b"],
+                after=datetime(2024, 5, 1, 12, tzinfo=timezone.utc),
+                includeFeedback=True,
+                filterInternal=False,
+            ),
+        )
+
+        self.assertEqual(
+            params,
+            {
+                "apiKey": "test",
+                "pageSize": 50,
+                "pageIndex": 0,
+                "projectId": 1,
+                "externalIds": ["a", "b"],
+                "after": "2024-05-01T12:00:00+00:00",
+                "includeFeedback": "true",
+                "filterInternal": "false",
+            },
+        )
+
+    def test_get_query_params_omits_unset(self):
+        self.assertEqual(BaseClient._get_query_params("test", ThreadsQueryParams()), {"apiKey": "test", "pageSize": 50, "pageIndex": 0})
+
+    def test_get_parsed_sized(self):
+        body = b'{"id": 1, "role": "user"}'
+        response = make_response(body=body, stream=True)
+
+        client = MessagesClient(base_url="http://localhost", api_key="test")
+        client.transport = MagicMock()
+        client.transport.request.return_value = response
+
+        self.assertEqual(
+            client._get_parsed_sized("http://localhost/api/external/messages/1", MessageResponse),
+            (MessageResponse(id=1, role="user"), len(body)),
+        )
+
+    def test_coalesced_gets_share_one_request(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def request(method, url, **kwargs):
+            started.set()
+            release.wait(5)
+            return make_response(body=b'{"id": 1, "role": "user", "content": "Hi"}')
+
+        client = MessagesClient(base_url="http://localhost", api_key="test")
+        client.transport = MagicMock()
+        client.transport.request.side_effect = request
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(client.get(1)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=lambda: results.append(client.get(1))) for _ in range(2)]
+        for follower in followers:
+            follower.start()
+        time.sleep(0.01)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join()
+
+        self.assertEqual(client.transport.request.call_count, 1)
+        # The parsed result is shared read-only, not copied per caller
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_request_key_includes_transport(self):
+        url = "http://localhost/api/external/messages/1"
+        self.assertNotEqual(
+            _request_key(url, None, MessageResponse, MagicMock()),
+            _request_key(url, None, MessageResponse, MagicMock()),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from melodi.cache import ResponseCache
+from melodi.melodi_client import MelodiClient
+from melodi.threads.data_models import Thread, ThreadsQueryParams
+from melodi.users.data_models import User, UsersQueryParams
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_get_or_load(self):
+        cache = ResponseCache()
+        load = MagicMock(return_value=([1, 2, 3], 7))
+
+        self.assertEqual(cache.get_or_load("threads", ThreadsQueryParams(), load), [1, 2, 3])
+        self.assertEqual(cache.get_or_load("threads", ThreadsQueryParams(pageSize=50), load), [1, 2, 3])
+        cache.get_or_load("threads", ThreadsQueryParams(pageIndex=1), load)
+
+        self.assertEqual(load.call_count, 2)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    @patch("melodi.cache.time.monotonic")
+    def test_ttl(self, monotonic_patch):
+        cache = ResponseCache(ttls={"users": 10})
+        load = MagicMock(return_value=([], 2))
+
+        monotonic_patch.return_value = 100
+        cache.get_or_load("users", None, load)
+        monotonic_patch.return_value = 109
+        cache.get_or_load("users", None, load)
+        self.assertEqual(load.call_count, 1)
+
+        monotonic_patch.return_value = 111
+        cache.get_or_load("users", None, load)
+        self.assertEqual(load.call_count, 2)
+
+    def test_max_bytes(self):
+        cache = ResponseCache(max_bytes=20)
+        cache.get_or_load("users", UsersQueryParams(pageIndex=0), lambda: ("a", 8))
+        cache.get_or_load("users", UsersQueryParams(pageIndex=1), lambda: ("b", 8))
+        # Touch the first entry so the second one is evicted
+        cache.get_or_load("users", UsersQueryParams(pageIndex=0), lambda: ("unused", 6))
+        cache.get_or_load("users", UsersQueryParams(pageIndex=2), lambda: ("c", 8))
+
+        self.assertEqual(cache.evictions, 1)
+        self.assertLessEqual(cache.size_bytes, 20)
+        self.assertEqual(cache.get_or_load("users", UsersQueryParams(pageIndex=0), lambda: ("miss", 4)), "a")
+        self.assertEqual(cache.get_or_load("users", UsersQueryParams(pageIndex=1), lambda: ("miss", 4)), "miss")
+
+    def test_invalidate(self):
+        cache = ResponseCache()
+        cache.get_or_load("users", None, lambda: ("users", 5))
+        cache.get_or_load("threads", None, lambda: ("threads", 7))
+
+        cache.invalidate("threads")
+
+        self.assertEqual(cache.get_or_load("users", None, lambda: ("miss", 4)), "users")
+        self.assertEqual(cache.get_or_load("threads", None, lambda: ("miss", 4)), "miss")
+
+    def test_invalidate_during_load(self):
+        cache = ResponseCache()
+
+        def load():
+            cache.invalidate("threads")
+            return "stale", 5
+
+        cache.get_or_load("threads", None, load)
+        self.assertEqual(cache.get_or_load("threads", None, lambda: ("fresh", 5)), "fresh")
+
+
+class TestClientCache(unittest.TestCase):
+    def test_writes_invalidate_reads(self):
+        cache = ResponseCache()
+        client = MelodiClient(api_key="test", cache=cache)
+
+        client.threads.get()
+        client.threads.get()
+        client.users.get()
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+        client.users.create_or_update(User(externalId="user-1"))
+        client.threads.get()
+        client.users.get()
+        self.assertEqual(cache.misses, 4)
+
+        client.threads.create(Thread(messages=[]))
+        client.users.get()
+        client.threads.get()
+        self.assertEqual((cache.hits, cache.misses), (2, 5))
+
+    def test_bulk_reads_bypass_cache(self):
+        cache = ResponseCache()
+        client = MelodiClient(api_key="test", cache=cache)
+
+        list(client.threads.iter_all())
+        list(client.users.iter_all())
+        client.threads.get(use_cache=False)
+
+        self.assertEqual((cache.hits, cache.misses), (0, 0))
+        self.assertEqual(cache.size_bytes, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from melodi.circuit_breaker import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker,
+                                    CircuitBreakerOpenError,
+                                    CircuitBreakerTimeoutError, ThreadSpool)
+from melodi.melodi_client import MelodiClient
+from melodi.messages.data_models import Message
+from melodi.threads.data_models import Thread
+from melodi.utils.utils import create_melodi_thread
+
+
+def _fail():
+    raise ConnectionError("down")
+
+
+@patch("melodi.circuit_breaker.time.monotonic")
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.state_changes = []
+        self.breaker = CircuitBreaker(
+            failure_rate_threshold=0.5,
+            latency_threshold=1.0,
+            window_size=4,
+            min_calls=4,
+            open_duration=10.0,
+            on_state_change=lambda previous, state: self.state_changes.append((previous, state)),
+        )
+
+    def test_opens_on_failures(self, monotonic_patch):
+        monotonic_patch.return_value = 0
+        for func in [lambda: 1, _fail, lambda: 1, _fail]:
+            try:
+                self.breaker.call(func)
+            except ConnectionError:
+                pass
+
+        self.assertEqual(self.breaker.state, OPEN)
+        fallback = MagicMock(return_value="shed")
+        self.assertEqual(self.breaker.call(_fail, fallback=fallback), "shed")
+        with self.assertRaises(CircuitBreakerOpenError):
+            self.breaker.call(lambda: 1)
+        self.assertEqual(self.breaker.metrics()["rejected"], 2)
+
+    def test_opens_on_latency(self, monotonic_patch):
+        # Every call takes 2 seconds
+        monotonic_patch.side_effect = [value for call in range(4) for value in (call * 2, call * 2 + 2)] + [8]
+        for _ in range(4):
+            self.breaker.call(lambda: 1)
+
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertEqual(self.breaker.metrics()["slow_calls"], 4)
+
+    def test_half_open_probe(self, monotonic_patch):
+        monotonic_patch.return_value = 0
+        for _ in range(4):
+            with self.assertRaises(ConnectionError):
+                self.breaker.call(_fail)
+
+        monotonic_patch.return_value = 11
+        with self.assertRaises(ConnectionError):
+            self.breaker.call(_fail)
+        self.assertEqual(self.breaker.state, OPEN)
+
+        monotonic_patch.return_value = 22
+        self.assertEqual(self.breaker.call(lambda: 1), 1)
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(
+            self.state_changes,
+            [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)],
+        )
+
+    def test_half_open_needs_every_probe_to_succeed(self, monotonic_patch):
+        monotonic_patch.return_value = 0
+        self.breaker.half_open_max_calls = 2
+        for _ in range(4):
+            with self.assertRaises(ConnectionError):
+                self.breaker.call(_fail)
+
+        monotonic_patch.return_value = 11
+        self.breaker.call(lambda: 1)
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.breaker.call(lambda: 1)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+
+class TestCircuitBreakerTimeout(unittest.TestCase):
+    def test_call_timeout(self):
+        breaker = CircuitBreaker(call_timeout=0.05)
+        release = threading.Event()
+        fallback = MagicMock()
+
+        start = time.monotonic()
+        with self.assertRaises(CircuitBreakerTimeoutError):
+            breaker.call(lambda: release.wait(5), fallback=fallback)
+        release.set()
+
+        self.assertLess(time.monotonic() - start, 1)
+        fallback.assert_not_called()
+        self.assertEqual(breaker.metrics()["failures"], 1)
+        self.assertEqual(breaker.call(lambda: 1), 1)
+        with self.assertRaises(ConnectionError):
+            breaker.call(_fail)
+
+
+class TestThreadSpool(unittest.TestCase):
+    def test_file_spool(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spool.jsonl")
+            spool = ThreadSpool(path, max_size=2)
+            for external_id in ["a", "b", "c"]:
+                spool.add(Thread(externalId=external_id, messages=[]))
+
+            self.assertEqual((spool.size, spool.dropped), (2, 1))
+            self.assertEqual(ThreadSpool(path).size, 2)
+
+            create = MagicMock(side_effect=[None, ConnectionError("down")])
+            self.assertEqual(spool.drain(create), 1)
+            self.assertEqual(create.call_args_list[0].args[0].externalId, "a")
+            self.assertEqual(spool.size, 1)
+
+    def test_file_spool_keeps_threads_until_sent(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spool.jsonl")
+            spool = ThreadSpool(path)
+            spool.add(Thread(externalId="a", messages=[]))
+            spool.add(Thread(externalId="b", messages=[]))
+
+            def create(thread):
+                # The threads being drained are still on disk while they are sent
+                self.assertEqual(ThreadSpool(path).size, 2 + (thread.externalId == "b"))
+                if thread.externalId == "a":
+                    spool.add(Thread(externalId="c", messages=[]))
+                    raise ConnectionError("down")
+
+            self.assertEqual(spool.drain(create), 1)
+
+            create = MagicMock()
+            self.assertEqual(spool.drain(create), 2)
+            self.assertEqual([call.args[0].externalId for call in create.call_args_list], ["a", "c"])
+            self.assertEqual(spool.size, 0)
+
+    def test_drain_stops_when_breaker_opens(self):
+        spool = ThreadSpool()
+        for external_id in ["a", "b", "c", "d"]:
+            spool.add(Thread(externalId=external_id, messages=[]))
+        create = MagicMock(side_effect=[None, CircuitBreakerOpenError("open"), None, None])
+
+        with self.assertLogs("melodi.circuit_breaker") as logs:
+            self.assertEqual(spool.drain(create), 1)
+
+        self.assertEqual(create.call_count, 2)
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(spool.size, 3)
+        self.assertEqual(spool.drain(MagicMock()), 3)
+
+    def test_drains_when_breaker_closes(self):
+        breaker = CircuitBreaker()
+        spool = ThreadSpool()
+        spool.add(Thread(externalId="a", messages=[]))
+        client = MelodiClient(api_key="test", capture_breaker=breaker, capture_spool=spool)
+        client.threads = MagicMock()
+
+        breaker.state = HALF_OPEN
+        breaker.call(lambda: 1)
+
+        deadline = time.monotonic() + 5
+        while client.threads.create.call_count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        client.threads.create.assert_called_once()
+        self.assertEqual(spool.size, 0)
+
+    def test_capture_while_open(self):
+        breaker = CircuitBreaker()
+        breaker.state = OPEN
+        breaker._opened_at = float("inf")
+        spool = ThreadSpool()
+        melodi_client = MagicMock(capture_breaker=breaker, capture_spool=spool)
+
+        create_melodi_thread(
+            melodi_client=melodi_client,
+            melodi_messages=[Message(role="assistant", content="Hi")],
+            response_id="response-1",
+            prompt_messages=[],
+        )
+
+        melodi_client.threads.create.assert_not_called()
+        self.assertEqual(spool.size, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
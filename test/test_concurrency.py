@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from melodi.concurrency import (AsyncSingleFlight, SingleFlight, chunked,
+                                run_bounded)
+
+
+class TestConcurrency(unittest.TestCase):
+    def test_run_bounded(self):
+        in_flight = []
+        max_in_flight = []
+        lock = threading.Lock()
+
+        def square(item):
+            with lock:
+                in_flight.append(item)
+                max_in_flight.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(item)
+            if item == 3:
+                raise ValueError("three")
+            return item * item
+
+        results = run_bounded(square, range(10), max_workers=4)
+
+        self.assertEqual([result.item for result in results], list(range(10)))
+        self.assertEqual(results[2].result, 4)
+        self.assertFalse(results[3].ok)
+        self.assertIsInstance(results[3].error, ValueError)
+        self.assertLessEqual(max(max_in_flight), 4)
+
+    def test_chunked(self):
+        self.assertEqual(list(chunked([1, 2, 3, 4, 5], 2)), [[1, 2], [3, 4], [5]])
+        self.assertEqual(list(chunked([], 2)), [])
+
+    def test_single_flight(self):
+        single_flight = SingleFlight()
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        def load():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return "value"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(single_flight.do("key", load)))
+        leader.start()
+        started.wait()
+        followers = [
+            threading.Thread(target=lambda: results.append(single_flight.do("key", load)))
+            for _ in range(3)
+        ]
+        for follower in followers:
+            follower.start()
+        time.sleep(0.01)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join()
+
+        self.assertEqual(results, ["value"] * 4)
+        self.assertEqual(len(calls), 1)
+        # Once finished, the key is fetched again
+        self.assertEqual(single_flight.do("key", lambda: "new value"), "new value")
+
+    def test_single_flight_exception(self):
+        single_flight = SingleFlight()
+
+        def fail():
+            raise ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            single_flight.do("key", fail)
+        self.assertEqual(single_flight.do("key", lambda: 1), 1)
+
+    def test_async_single_flight(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        async def run():
+            results = await asyncio.gather(*(single_flight.do("key", load) for _ in range(4)))
+            # Once finished, the key is fetched again
+            results.append(await single_flight.do("key", load))
+            return results
+
+        self.assertEqual(asyncio.run(run()), ["value"] * 5)
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from melodi.conditional_cache import ConditionalCache, conditional_key
+from melodi.melodi_client import MelodiClient
+from melodi.messages.data_models import MessageResponse
+from melodi.testing import FakeMelodiTransport
+
+BASE_URL = "https://app.melodi.fyi/api/external"
+
+
+class TestConditionalCache(unittest.TestCase):
+    def test_request_headers(self):
+        cache = ConditionalCache()
+        self.assertEqual(cache.request_headers("a"), {})
+
+        cache.store("a", '"v1"', "Mon, 19 Oct 2026 10:00:00 GMT", b"[]", [])
+        self.assertEqual(
+            cache.request_headers("a"),
+            {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 19 Oct 2026 10:00:00 GMT"},
+        )
+
+        # Responses without validators replace nothing they could be checked against
+        cache.store("a", None, None, b"[]", [])
+        self.assertEqual(cache.request_headers("a"), {})
+
+    def test_not_modified_reuses_parsed_value(self):
+        cache = ConditionalCache()
+        value = [1, 2]
+        cache.store("a", '"v1"', None, b"[1, 2]", value)
+
+        with patch("melodi.conditional_cache.parse_response_body") as parse_patch:
+            self.assertEqual(cache.not_modified("a", list), (value, 6))
+        parse_patch.assert_not_called()
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_max_entries(self):
+        cache = ConditionalCache(max_entries=2)
+        cache.store("a", '"a"', None, b"1", 1)
+        cache.store("b", '"b"', None, b"2", 2)
+        cache.not_modified("a", int)
+        cache.store("c", '"c"', None, b"3", 3)
+
+        self.assertEqual(cache.request_headers("b"), {})
+        self.assertEqual(cache.request_headers("a"), {"If-None-Match": '"a"'})
+        with self.assertRaises(KeyError):
+            cache.not_modified("b", int)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "validators.json")
+            cache = ConditionalCache(path)
+            cache.store("a", '"v1"', None, b"[1, 2]", [1, 2])
+            # Stores stay in memory until saved
+            self.assertFalse(os.path.exists(path))
+
+            cache.save()
+            self.assertEqual(os.stat(path).st_mode & 0o777, 0o600)
+            self.assertEqual(os.listdir(directory), ["validators.json"])
+
+            reloaded = ConditionalCache(path)
+            self.assertEqual(reloaded.request_headers("a"), {"If-None-Match": '"v1"'})
+            self.assertEqual(reloaded.not_modified("a", list), ([1, 2], 6))
+
+            reloaded.clear()
+            self.assertEqual(ConditionalCache(path).request_headers("a"), {})
+
+    def test_corrupt_file_is_ignored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "validators.json")
+            for content in ['{"a": {"etag"', '{"a": {"etag": "v1"}}', "[]"]:
+                with open(path, "w", encoding="utf-8") as cache_file:
+                    cache_file.write(content)
+
+                cache = ConditionalCache(path)
+                self.assertEqual(cache.request_headers("a"), {})
+
+            cache.store("a", '"v1"', None, b"[]", [])
+            cache.save()
+            self.assertEqual(ConditionalCache(path).request_headers("a"), {"If-None-Match": '"v1"'})
+
+    def test_key_hides_api_key(self):
+        key = conditional_key(f"{BASE_URL}/projects", {"apiKey": "secret"}, list)
+        self.assertNotIn("secret", key)
+        self.assertNotEqual(key, conditional_key(f"{BASE_URL}/projects", {"apiKey": "other"}, list))
+
+
+class TestConditionalRequests(unittest.TestCase):
+    def setUp(self):
+        self.transport = FakeMelodiTransport(seed=1)
+        self.cache = ConditionalCache()
+        self.client = MelodiClient(api_key="test", transport=self.transport, conditional_cache=self.cache)
+
+        response = self.transport.request(
+            "POST",
+            f"{BASE_URL}/threads?apiKey=test",
+            json={"projectId": 1, "externalId": "thread-1", "messages": [{"role": "user", "content": "Hello"}]},
+        )
+        self.message_id = response.json()["messages"][0]["id"]
+
+    def test_not_modified(self):
+        first = self.client.messages.get(self.message_id)
+        with patch("melodi.base_client.parse_response_body") as parse_patch:
+            second = self.client.messages.get(self.message_id)
+
+        self.assertIs(second, first)
+        parse_patch.assert_not_called()
+        self.assertEqual(self.transport.status_codes[200], 2)
+        self.assertEqual(self.transport.status_codes[304], 1)
+
+    def test_modified(self):
+        first = self.client.messages.get(self.message_id)
+        self.transport.state.messages[self.message_id]["content"] = "Changed"
+
+        second = self.client.messages.get(self.message_id)
+        self.assertEqual(first.content, "Hello")
+        self.assertEqual(second.content, "Changed")
+        self.assertEqual(self.transport.status_codes[304], 0)
+
+    def test_evicted_between_request_and_not_modified(self):
+        self.client.messages.get(self.message_id)
+
+        with patch.object(ConditionalCache, "not_modified", side_effect=KeyError):
+            message = self.client.messages.get(self.message_id)
+
+        self.assertIsInstance(message, MessageResponse)
+        self.assertEqual(self.transport.status_codes[304], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
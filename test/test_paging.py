@@ -0,0 +1,60 @@
+import threading
+import time
+import unittest
+
+from melodi.paging import iter_all_pages
+from melodi.threads.data_models import ThreadsQueryParams
+from melodi.users.data_models import UsersPagedResponse, UsersQueryParams
+
+
+class _FakePages:
+    def __init__(self, count: int, delay: float = 0.0):
+        self.count = count
+        self.delay = delay
+        self.requested = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def get(self, query_params):
+        with self.lock:
+            self.requested.append(query_params.pageIndex)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        # Later pages answer first to check ordering
+        time.sleep(self.delay / (query_params.pageIndex + 1))
+
+        start = query_params.pageIndex * query_params.pageSize
+        end = min(start + query_params.pageSize, self.count)
+        with self.lock:
+            self.in_flight -= 1
+        return UsersPagedResponse.model_construct(count=self.count, rows=list(range(start, end)))
+
+
+class TestPaging(unittest.TestCase):
+    def test_iter_all_pages(self):
+        pages = _FakePages(count=95, delay=0.01)
+
+        rows = list(iter_all_pages(pages.get, UsersQueryParams(pageSize=10), prefetch=3))
+
+        self.assertEqual(rows, list(range(95)))
+        self.assertEqual(sorted(pages.requested), list(range(10)))
+        self.assertLessEqual(pages.max_in_flight, 3)
+
+    def test_iter_all_pages_from_page_index(self):
+        pages = _FakePages(count=30)
+
+        rows = list(iter_all_pages(pages.get, ThreadsQueryParams(pageSize=10, pageIndex=1)))
+
+        self.assertEqual(rows, list(range(10, 30)))
+
+    def test_iter_all_pages_single_page(self):
+        pages = _FakePages(count=0)
+
+        self.assertEqual(list(iter_all_pages(pages.get, UsersQueryParams())), [])
+        self.assertEqual(pages.requested, [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
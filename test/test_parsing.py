@@ -0,0 +1,74 @@
+import json
+import unittest
+from datetime import datetime, timezone
+from typing import List
+
+from melodi.messages.data_models import MessageResponse
+from melodi.parsing import (_get_type_adapter, iter_paged_rows, parse_response,
+                            parse_response_body)
+from melodi.projects.data_models import ProjectResponse
+
+
+class TestParsing(unittest.TestCase):
+    message = {
+        "id": 1,
+        "externalId": "message_1",
+        "role": "user",
+        "content": "Hello World",
+        "externalFeedback": [
+            {
+                "id": 2,
+                "projectId": 3,
+                "feedbackType": "POSITIVE",
+                "createdAt": "2024-05-01T12:00:00Z",
+                "updatedAt": "2024-05-01T12:00:00Z",
+            }
+        ],
+    }
+
+    def test_parse_response(self):
+        message = parse_response(MessageResponse, self.message)
+
+        self.assertEqual(message.id, 1)
+        self.assertEqual(message.externalFeedback[0].feedbackType, "POSITIVE")
+        self.assertEqual(
+            message.externalFeedback[0].createdAt,
+            datetime(2024, 5, 1, 12, tzinfo=timezone.utc),
+        )
+
+    def test_parse_response_body(self):
+        self.assertEqual(
+            parse_response_body(MessageResponse, json.dumps(self.message).encode()),
+            parse_response(MessageResponse, self.message),
+        )
+        self.assertEqual(parse_response_body(List[ProjectResponse], "[]"), [])
+
+    def test_type_adapter_is_cached(self):
+        self.assertIs(
+            _get_type_adapter(List[ProjectResponse]),
+            _get_type_adapter(List[ProjectResponse]),
+        )
+
+    def test_iter_paged_rows(self):
+        messages = [dict(self.message, id=i, content=f"Héllo {i}") for i in range(3)]
+        body = json.dumps({"count": 12345, "rows": messages, "next": [1, {"a": "]"}]}, indent=1).encode()
+        expected = [parse_response(MessageResponse, message) for message in messages]
+
+        for chunk_size in (1, 7, len(body)):
+            chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+            self.assertEqual(list(iter_paged_rows(MessageResponse, chunks)), expected)
+
+        self.assertEqual(
+            list(iter_paged_rows(MessageResponse, ['{"rows": [], "count": 0}'])), []
+        )
+        self.assertEqual(list(iter_paged_rows(MessageResponse, ["{}"])), [])
+
+    def test_iter_paged_rows_truncated(self):
+        body = json.dumps({"count": 1, "rows": [self.message]})
+
+        with self.assertRaises(ValueError):
+            list(iter_paged_rows(MessageResponse, [body[:-10]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from melodi.messages.messages_client import MessagesClient
+from melodi.rate_limit import (FileTokenBucket, RateLimiter, TokenBucket,
+                               fcntl, group_for_url)
+from test.helpers import make_response
+
+
+class TestTokenBucket(unittest.TestCase):
+    @patch("melodi.rate_limit.time.sleep")
+    @patch("melodi.rate_limit.time.time")
+    def test_acquire(self, time_patch, sleep_patch):
+        time_patch.return_value = 100.0
+        bucket = TokenBucket(rate=2.0, burst=2)
+
+        bucket.acquire()
+        bucket.acquire()
+        sleep_patch.assert_not_called()
+
+        bucket.acquire()
+        sleep_patch.assert_called_once_with(0.5)
+
+        # Tokens refill at the rate while time passes
+        time_patch.return_value = 102.0
+        bucket.acquire()
+        self.assertEqual(sleep_patch.call_count, 1)
+
+    def test_acquire_async(self):
+        bucket = TokenBucket(rate=1000.0, burst=1)
+
+        async def acquire_all():
+            await asyncio.gather(*(bucket.acquire_async() for _ in range(5)))
+
+        asyncio.run(acquire_all())
+
+    def test_adapts_to_rate_limits(self):
+        bucket = TokenBucket(rate=8.0, min_rate=1.0)
+
+        bucket.on_rate_limited()
+        self.assertEqual(bucket.rate, 4.0)
+        for _ in range(3):
+            bucket.on_rate_limited()
+        self.assertEqual(bucket.rate, 1.0)
+
+        for _ in range(20):
+            bucket.on_success()
+        self.assertEqual(bucket.rate, 8.0)
+
+
+@unittest.skipIf(fcntl is None, "fcntl not available")
+class TestFileTokenBucket(unittest.TestCase):
+    @patch("melodi.rate_limit.time.sleep")
+    @patch("melodi.rate_limit.time.time")
+    def test_shared_state(self, time_patch, sleep_patch):
+        time_patch.return_value = 100.0
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "threads.bucket")
+            first = FileTokenBucket(path, rate=1.0, burst=1)
+            second = FileTokenBucket(path, rate=1.0, burst=1)
+
+            first.acquire()
+            second.acquire()
+            sleep_patch.assert_called_once_with(1.0)
+
+            first.on_rate_limited()
+            self.assertEqual(second.rate, 0.5)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_group_for_url(self):
+        self.assertEqual(group_for_url("https://app.melodi.fyi/api/external/threads?apiKey=x"), "threads")
+        self.assertEqual(group_for_url("https://app.melodi.fyi/api/external/messages/1"), "messages")
+        self.assertEqual(group_for_url("https://example.com/other"), "default")
+
+    def test_buckets_per_group(self):
+        limiter = RateLimiter(rates={"threads": 5.0}, default_rate=2.0)
+
+        self.assertEqual(limiter.bucket("threads").rate, 5.0)
+        self.assertEqual(limiter.bucket("users").rate, 2.0)
+        self.assertIs(limiter.bucket("threads"), limiter.bucket("threads"))
+
+        limiter.on_response("http://localhost/api/external/threads", 429)
+        self.assertEqual(limiter.bucket("threads").rate, 2.5)
+        self.assertEqual(limiter.bucket("users").rate, 2.0)
+
+    @patch("melodi.retry.time.sleep")
+    def test_client_requests(self, sleep_patch):
+        client = MessagesClient(base_url="http://localhost", api_key="test")
+        client.rate_limiter = RateLimiter(default_rate=100.0)
+        responses = [make_response(429), make_response(200, body=b'{"id": 1, "role": "user"}')]
+
+        with patch.object(client.transport, "request", side_effect=responses):
+            self.assertEqual(client.get(1).id, 1)
+
+        self.assertEqual(client.rate_limiter.bucket("messages").rate, 51.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from melodi.issues.data_models import IssueResponse, IssueUpsertRequest
+from melodi.projects.data_models import ProjectResponse
+from melodi.resolver import EntityResolver
+from test.helpers import make_http_error
+
+
+def _project(project_id: int, name: str) -> ProjectResponse:
+    return ProjectResponse(
+        id=project_id,
+        name=name,
+        organizationId=1,
+        isDeleted=False,
+        createdAt=datetime.now(),
+        updatedAt=datetime.now(),
+    )
+
+
+class TestEntityResolver(unittest.TestCase):
+    def setUp(self):
+        self.projects_client = MagicMock()
+        self.issues_client = MagicMock()
+        self.intents_client = MagicMock()
+        self.resolver = EntityResolver(
+            self.projects_client, self.issues_client, self.intents_client, ttl=60, negative_ttl=5
+        )
+
+    @patch("melodi.resolver.time.monotonic")
+    def test_project_ttl(self, monotonic_patch):
+        monotonic_patch.return_value = 0
+        self.projects_client.get_by_name.return_value = _project(1, "support-bot")
+
+        self.assertEqual(self.resolver.project("support-bot").id, 1)
+        self.assertEqual(self.resolver.project("support-bot").id, 1)
+        self.assertEqual(self.projects_client.get_by_name.call_count, 1)
+
+        monotonic_patch.return_value = 61
+        self.resolver.project("support-bot")
+        self.assertEqual(self.projects_client.get_by_name.call_count, 2)
+
+    @patch("melodi.resolver.time.monotonic")
+    def test_negative_caching(self, monotonic_patch):
+        monotonic_patch.return_value = 0
+        self.projects_client.get_by_name.side_effect = make_http_error(404)
+
+        self.assertIsNone(self.resolver.project("missing"))
+        self.assertIsNone(self.resolver.project("missing"))
+        self.assertEqual(self.projects_client.get_by_name.call_count, 1)
+
+        monotonic_patch.return_value = 6
+        self.resolver.project("missing")
+        self.assertEqual(self.projects_client.get_by_name.call_count, 2)
+
+    def test_other_errors_are_not_cached(self):
+        self.projects_client.get_by_name.side_effect = make_http_error(500)
+
+        for _ in range(2):
+            with self.assertRaises(requests.HTTPError):
+                self.resolver.project("support-bot")
+        self.assertEqual(self.projects_client.get_by_name.call_count, 2)
+
+    def test_invalidate(self):
+        self.issues_client.upsert.side_effect = lambda request: IssueResponse(
+            id=request.projectId * 10, name=request.name, createdAt=datetime.now()
+        )
+
+        self.assertEqual(self.resolver.issue(IssueUpsertRequest(projectId=1, name="Refunds")).id, 10)
+        self.resolver.issue(IssueUpsertRequest(projectId=2, name="Refunds"))
+        self.resolver.invalidate(kind="issue", project_id=1)
+        self.resolver.issue(IssueUpsertRequest(projectId=1, name="Refunds"))
+        self.resolver.issue(IssueUpsertRequest(projectId=2, name="Refunds"))
+
+        self.assertEqual(self.issues_client.upsert.call_count, 3)
+
+    def test_concurrent_misses_share_one_call(self):
+        def get_by_name(name):
+            time.sleep(0.05)
+            return _project(1, name)
+
+        self.projects_client.get_by_name.side_effect = get_by_name
+        threads = [threading.Thread(target=self.resolver.project, args=("support-bot",)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.projects_client.get_by_name.call_count, 1)
+
+    def test_warm_up(self):
+        self.projects_client.get.return_value = [_project(1, "a"), _project(2, "b")]
+
+        self.resolver.warm_up(issueUpsertRequests=[IssueUpsertRequest(projectId=1, name="Refunds")])
+
+        self.assertEqual(self.resolver.project("b").id, 2)
+        self.resolver.issue(IssueUpsertRequest(projectId=1, name="Refunds"))
+        self.projects_client.get_by_name.assert_not_called()
+        self.assertEqual(self.issues_client.upsert.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
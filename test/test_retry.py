@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from melodi.messages.messages_client import MessagesClient
+from melodi.retry import RetryBudget, RetryPolicy, _retry_after
+from test.helpers import make_response
+
+
+@patch("melodi.retry.time.sleep")
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3, budget=RetryBudget(max_tokens=10))
+
+    def test_retries_idempotent_errors(self, sleep_patch):
+        send = MagicMock(side_effect=[make_response(502), requests.ConnectionError(), make_response(200)])
+
+        self.assertEqual(self.policy.call("GET", send).status_code, 200)
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(sleep_patch.call_count, 2)
+
+    def test_gives_up_after_max_attempts(self, sleep_patch):
+        send = MagicMock(return_value=make_response(503))
+
+        self.assertEqual(self.policy.call("GET", send).status_code, 503)
+        self.assertEqual(send.call_count, 3)
+
+    def test_non_idempotent(self, sleep_patch):
+        send = MagicMock(side_effect=[make_response(502)])
+        self.assertEqual(self.policy.call("POST", send).status_code, 502)
+
+        send = MagicMock(side_effect=requests.ReadTimeout())
+        with self.assertRaises(requests.ReadTimeout):
+            self.policy.call("POST", send)
+        self.assertEqual(send.call_count, 1)
+
+        # Rejected requests were not processed and are safe to repeat
+        send = MagicMock(side_effect=[make_response(429), make_response(201)])
+        self.assertEqual(self.policy.call("POST", send).status_code, 201)
+
+        send = MagicMock(side_effect=[make_response(502), make_response(201)])
+        self.assertEqual(self.policy.call("POST", send, idempotent=True).status_code, 201)
+
+    def test_retry_after(self, sleep_patch):
+        send = MagicMock(side_effect=[make_response(429, headers={"Retry-After": "7"}), make_response(200)])
+
+        self.policy.call("GET", send)
+
+        sleep_patch.assert_called_once_with(7.0)
+
+    def test_retry_after_too_long(self, sleep_patch):
+        send = MagicMock(return_value=make_response(429, headers={"Retry-After": "3600"}))
+
+        self.assertEqual(self.policy.call("GET", send).status_code, 429)
+        sleep_patch.assert_not_called()
+
+    def test_budget(self, sleep_patch):
+        policy = RetryPolicy(max_attempts=5, budget=RetryBudget(ratio=0.0, max_tokens=2, min_retries_per_second=0))
+        send = MagicMock(return_value=make_response(503))
+
+        policy.call("GET", send)
+        policy.call("GET", send)
+
+        # Two retries were available across both calls
+        self.assertEqual(send.call_count, 4)
+
+
+class TestRetryAfter(unittest.TestCase):
+    def test_http_date(self):
+        self.assertEqual(_retry_after(make_response(429, headers={"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})), 0.0)
+        self.assertIsNone(_retry_after(make_response(429, headers={"Retry-After": "soon"})))
+        self.assertIsNone(_retry_after(make_response(429)))
+
+
+class TestClientRetries(unittest.TestCase):
+    @patch("melodi.retry.time.sleep")
+    def test_messages_get(self, sleep_patch):
+        client = MessagesClient(base_url="http://localhost", api_key="test")
+        body = b'{"id": 1, "role": "user"}'
+
+        with patch.object(client.transport, "request", side_effect=[make_response(503), make_response(200, body=body)]):
+            self.assertEqual(client.get(1).id, 1)
+
+        with patch.object(client.transport, "request", return_value=make_response(404)):
+            with self.assertRaises(requests.HTTPError):
+                client.get(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
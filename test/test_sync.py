@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from melodi.sync import ThreadsMirror
+from melodi.threads.data_models import ThreadResponse, ThreadsQueryParams
+from test.helpers import (feedback_payload, issue_association_payload,
+                          make_thread, message_payload)
+
+START = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+def _thread(thread_id: int, feedback_type: str = None, issue_id: int = None) -> ThreadResponse:
+    created_at = (START + timedelta(minutes=thread_id)).isoformat()
+    message_id = thread_id * 10
+    feedback = [feedback_payload(thread_id, feedback_type, created_at=created_at)] if feedback_type else ()
+    issue_associations = [issue_association_payload(thread_id, issue_id, message_id, created_at=created_at)] if issue_id else ()
+    return make_thread(
+        thread_id,
+        messages=[message_payload(message_id, feedback=feedback, issue_associations=issue_associations)],
+        created_at=created_at,
+        externalUser={"id": 7, "externalId": "user-7", "segments": []},
+        metadata={"model": "gpt-4o" if thread_id % 2 else "o4-mini", "total_tokens": thread_id},
+    )
+
+
+class _FakeThreadsClient:
+    def __init__(self, threads):
+        self.threads = threads
+        self.queries = []
+
+    def iter_all(self, query_params):
+        self.queries.append(query_params)
+        return iter([
+            thread for thread in self.threads
+            if query_params.after is None or thread.createdAt > query_params.after
+        ])
+
+
+class TestThreadsMirror(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "melodi.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_sync_is_incremental(self):
+        client = _FakeThreadsClient([_thread(thread_id) for thread_id in range(5)])
+        mirror = ThreadsMirror(client, self.path, resync_window=timedelta(minutes=1, seconds=30))
+
+        self.assertEqual(mirror.sync(), 5)
+        self.assertEqual(mirror.high_water_mark(), START + timedelta(minutes=4))
+
+        client.threads.append(_thread(5))
+        # Threads 3 and 4 fall within the resync window
+        self.assertEqual(mirror.sync(), 3)
+        self.assertEqual(client.queries[-1].after, START + timedelta(minutes=2, seconds=30))
+        self.assertTrue(client.queries[-1].includeFeedback)
+        mirror.close()
+
+        reopened = ThreadsMirror(client, self.path)
+        self.assertEqual(len(reopened.query_threads()), 6)
+        self.assertEqual(reopened.high_water_mark(), START + timedelta(minutes=5))
+        reopened.close()
+
+    def test_sync_picks_up_feedback_within_resync_window(self):
+        client = _FakeThreadsClient([_thread(thread_id) for thread_id in range(3)])
+        mirror = ThreadsMirror(client, self.path, resync_window=timedelta(minutes=5))
+        mirror.sync()
+
+        client.threads[1] = _thread(1, feedback_type="NEGATIVE")
+        mirror.sync()
+
+        self.assertEqual([thread.id for thread in mirror.query_threads(feedback_type="NEGATIVE")], [1])
+        mirror.close()
+
+    def test_high_water_mark_is_per_query(self):
+        client = _FakeThreadsClient([_thread(thread_id) for thread_id in range(3)])
+        mirror = ThreadsMirror(client, self.path)
+        mirror.sync(ThreadsQueryParams(projectId=1))
+
+        self.assertEqual(mirror.high_water_mark(ThreadsQueryParams(projectId=1)), START + timedelta(minutes=2))
+        self.assertIsNone(mirror.high_water_mark(ThreadsQueryParams(projectId=2)))
+
+        mirror.sync(ThreadsQueryParams(projectId=2))
+        self.assertIsNone(client.queries[-1].after)
+        mirror.close()
+
+    def test_timestamps_are_stored_in_utc(self):
+        thread = _thread(1)
+        # Created after thread 0, but its UTC-5 text would sort before thread 0's
+        thread.createdAt = (START + timedelta(minutes=30)).astimezone(timezone(timedelta(hours=-5)))
+        client = _FakeThreadsClient([_thread(0), thread])
+        mirror = ThreadsMirror(client, self.path)
+        mirror.sync()
+
+        self.assertEqual([thread.id for thread in mirror.query_threads()], [1, 0])
+        self.assertEqual(mirror.high_water_mark(), START + timedelta(minutes=30))
+        self.assertEqual(
+            mirror.connection.execute("SELECT createdAt FROM threads WHERE id = 1").fetchone()[0],
+            "2024-05-01T00:30:00+00:00",
+        )
+        mirror.close()
+
+    def test_query_threads(self):
+        client = _FakeThreadsClient([
+            _thread(1, feedback_type="NEGATIVE", issue_id=3),
+            _thread(2, feedback_type="POSITIVE"),
+            _thread(3, feedback_type="NEGATIVE"),
+            _thread(4, issue_id=3),
+        ])
+        mirror = ThreadsMirror(client, self.path)
+        mirror.sync()
+
+        def ids(threads):
+            return [thread.id for thread in threads]
+
+        self.assertEqual(ids(mirror.query_threads()), [4, 3, 2, 1])
+        self.assertEqual(ids(mirror.query_threads(external_ids=["thread-2", "thread-9"])), [2])
+        self.assertEqual(ids(mirror.query_threads(issue_ids=[3])), [4, 1])
+        self.assertEqual(ids(mirror.query_threads(feedback_type="NEGATIVE")), [3, 1])
+        self.assertEqual(ids(mirror.query_threads(feedback_type="NEGATIVE", issue_ids=[3])), [1])
+        self.assertEqual(ids(mirror.query_threads(metadata_field="model", metadata_value="gpt-4o")), [3, 1])
+        self.assertEqual(ids(mirror.query_threads(metadata_field="total_tokens", metadata_value="2")), [2])
+        self.assertEqual(ids(mirror.query_threads(limit=1)), [4])
+        self.assertEqual(mirror.query_threads(external_ids=["thread-1"])[0], client.threads[0])
+        mirror.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
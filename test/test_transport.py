@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from melodi.melodi_client import MelodiClient
+from melodi.messages.messages_client import MessagesClient
+from melodi.transport import RequestsTransport, Transport
+
+
+class TestTransport(unittest.TestCase):
+    def test_transport_is_abstract(self):
+        with self.assertRaises(TypeError):
+            Transport()
+
+    def test_reserve_connections_grows_pool(self):
+        transport = RequestsTransport(pool_maxsize=4)
+        adapter = transport.session.get_adapter("https://app.melodi.fyi")
+
+        transport.reserve_connections(2)
+        self.assertEqual(adapter.poolmanager.connection_pool_kw["maxsize"], 4)
+
+        transport.reserve_connections(32)
+        self.assertEqual(transport.pool_maxsize, 32)
+        self.assertEqual(adapter.poolmanager.connection_pool_kw["maxsize"], 32)
+
+    def test_transport_per_client(self):
+        first = MelodiClient(api_key="test")
+        second = MelodiClient(api_key="test")
+
+        self.assertIsNot(first.transport, second.transport)
+        self.assertTrue(all(client.transport is first.transport for client in first._sub_clients()))
+        self.assertIsNot(
+            MessagesClient(base_url="http://localhost", api_key="test").transport,
+            MessagesClient(base_url="http://localhost", api_key="test").transport,
+        )
+
+    def test_get_many_reserves_connections(self):
+        client = MessagesClient(base_url="http://localhost", api_key="test")
+        client.transport = MagicMock()
+
+        with patch.object(client, "get"):
+            client.get_many([1, 2], max_workers=32)
+
+        client.transport.reserve_connections.assert_called_once_with(32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from melodi.melodi_client import MelodiClient
+from melodi.retry import RetryBudget, RetryPolicy
+from melodi.testing import FakeMelodiTransport
+from melodi.threads.data_models import ThreadsQueryParams
+
+BASE_URL = "https://app.melodi.fyi/api/external"
+
+
+def _create_thread(transport: FakeMelodiTransport, external_id: str) -> dict:
+    response = transport.request(
+        "POST",
+        f"{BASE_URL}/threads?apiKey=test",
+        json={
+            "projectId": 1,
+            "externalId": external_id,
+            "messages": [{"role": "user", "content": "Hello"}, {"role": "assistant", "content": "Hi"}],
+        },
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+class TestFakeMelodiTransport(unittest.TestCase):
+    def setUp(self):
+        self.transport = FakeMelodiTransport(seed=1)
+        self.client = MelodiClient(api_key="test", transport=self.transport)
+
+    def test_messages_get(self):
+        thread = _create_thread(self.transport, "thread-1")
+        message_id = thread["messages"][1]["id"]
+
+        self.assertEqual(self.client.messages.get(message_id).content, "Hi")
+        results = self.client.messages.get_many([message_id, 12345])
+        self.assertTrue(results[message_id].ok)
+        self.assertIsInstance(results[12345].error, requests.HTTPError)
+        self.assertEqual(self.transport.status_codes[404], 1)
+
+    def test_coalesces_identical_gets(self):
+        message_id = _create_thread(self.transport, "thread-1")["messages"][0]["id"]
+        self.transport.latency = 0.05
+        self.transport.stats.clear()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.client.messages.get(message_id)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(sum(len(latencies) for latencies in self.transport.stats.values()), 1)
+
+    def test_coalesces_identical_gets_async(self):
+        message_id = _create_thread(self.transport, "thread-1")["messages"][0]["id"]
+        self.transport.latency = 0.05
+        self.transport.stats.clear()
+
+        async def get_all():
+            return await asyncio.gather(*(self.client.messages.get_async(message_id) for _ in range(8)))
+
+        results = asyncio.run(get_all())
+
+        self.assertEqual({result.id for result in results}, {message_id})
+        self.assertEqual(sum(len(latencies) for latencies in self.transport.stats.values()), 1)
+
+    def test_threads_get_stream(self):
+        for index in range(5):
+            _create_thread(self.transport, f"thread-{index}")
+
+        threads = list(self.client.threads.get_stream(ThreadsQueryParams(pageSize=3, pageIndex=1)))
+
+        self.assertEqual([thread.externalId for thread in threads], ["thread-3", "thread-4"])
+
+    def test_requires_api_key(self):
+        response = self.transport.request("GET", f"{BASE_URL}/threads")
+        self.assertEqual(response.status_code, 401)
+
+    @patch("melodi.retry.time.sleep")
+    def test_error_injection(self, sleep_patch):
+        message_id = _create_thread(self.transport, "thread-1")["messages"][0]["id"]
+        self.transport.error_rate = 0.5
+        self.client.messages.retry_policy = RetryPolicy(max_attempts=10, budget=RetryBudget(max_tokens=100))
+
+        for _ in range(20):
+            self.assertEqual(self.client.messages.get(message_id).id, message_id)
+
+        self.assertGreater(sum(self.transport.status_codes[code] for code in (500, 502, 503)), 0)
+
+    def test_throughput_limit(self):
+        transport = FakeMelodiTransport(max_requests_per_second=5)
+
+        status_codes = [transport.request("GET", f"{BASE_URL}/threads?apiKey=test").status_code for _ in range(10)]
+
+        self.assertEqual(status_codes.count(200), 5)
+        self.assertEqual(status_codes.count(429), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
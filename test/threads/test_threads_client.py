@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from melodi.threads.data_models import ThreadsQueryParams
+from melodi.threads.threads_client import ThreadsClient
+from test.helpers import make_response, message_payload, thread_payload
+
+
+def _thread(thread_id: int) -> dict:
+    return thread_payload(thread_id, messages=[message_payload(thread_id * 10, role="user", content="Hello " * 1000)])
+
+
+class TestThreadsClient(unittest.TestCase):
+    def setUp(self):
+        self.client = ThreadsClient(base_url="http://localhost", api_key="test")
+        self.client.transport = MagicMock()
+
+    def test_get_stream(self):
+        response = make_response(body={"count": 3, "rows": [_thread(i) for i in range(3)]}, stream=True)
+        self.client.transport.request.return_value = response
+
+        with patch("melodi.threads.threads_client.STREAM_CHUNK_SIZE", 512):
+            threads = list(self.client.get_stream(ThreadsQueryParams(pageSize=3, includeFeedback=True)))
+
+        self.assertEqual([thread.externalId for thread in threads], ["thread-0", "thread-1", "thread-2"])
+        self.assertEqual(threads[1].messages[0].id, 10)
+
+        method, url = self.client.transport.request.call_args.args
+        kwargs = self.client.transport.request.call_args.kwargs
+        self.assertEqual((method, url), ("GET", "http://localhost/api/external/threads"))
+        self.assertTrue(kwargs["stream"])
+        self.assertEqual(kwargs["params"]["includeFeedback"], "true")
+
+    def test_get_stream_error(self):
+        response = make_response(400, body={"errors": ["Bad Request"]}, stream=True)
+        self.client.transport.request.return_value = response
+
+        with self.assertRaises(requests.HTTPError):
+            list(self.client.get_stream())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from melodi.exceptions import MelodiAPIError
+from melodi.retry import RetryBudget, RetryPolicy
+from melodi.user_internal_for_project.data_models import \
+    BulkUserInternalForProjectResponse
+from melodi.user_internal_for_project.user_internal_for_project_client import (
+    UserInternalForProjectClient, _chunk_user_ids)
+from test.helpers import make_http_error
+
+
+class TestUserInternalForProjectClient(unittest.TestCase):
+    def setUp(self):
+        self.client = UserInternalForProjectClient(base_url="http://localhost", api_key="test")
+
+    def test_chunk_user_ids(self):
+        self.assertEqual(_chunk_user_ids(list(range(7)), 3, 1000), [[0, 1, 2], [3, 4, 5], [6]])
+        # Each id is counted with its separator: "100," is 4 bytes
+        self.assertEqual(_chunk_user_ids([100, 101, 102], 10, 8), [[100, 101], [102]])
+        self.assertEqual(_chunk_user_ids([], 3, 1000), [])
+
+    def test_set_users_internal(self):
+        progress = []
+
+        with patch.object(
+            self.client, "_set_users_internal_chunk",
+            side_effect=lambda project_id, user_ids: BulkUserInternalForProjectResponse(count=len(user_ids)),
+        ):
+            response = self.client.set_users_internal(
+                1, list(range(5)), chunk_size=2, max_workers=2,
+                on_progress=lambda done, total: progress.append((done, total)),
+            )
+
+        self.assertEqual(response.count, 5)
+        self.assertEqual(sorted(progress)[-1], (5, 5))
+        self.assertEqual(len(progress), 3)
+
+    @patch("melodi.retry.time.sleep")
+    def test_chunks_are_retried_by_retry_policy(self, sleep_patch):
+        self.client.retry_policy = RetryPolicy(budget=RetryBudget())
+        # The first chunk fails twice before succeeding, a 4xx is not retried
+        failures = {0: [requests.ConnectionError("reset"), make_http_error(502)], 2: [make_http_error(400)]}
+
+        def submit(project_id, user_ids):
+            if failures.get(user_ids[0]):
+                raise failures[user_ids[0]].pop(0)
+            return BulkUserInternalForProjectResponse(count=len(user_ids))
+
+        with patch.object(self.client, "_set_users_internal_chunk", side_effect=submit) as submit_patch:
+            with self.assertRaises(MelodiAPIError) as raised:
+                self.client.set_users_internal(1, list(range(3)), chunk_size=1, max_workers=1)
+
+        self.assertIsInstance(raised.exception.__cause__, requests.HTTPError)
+        self.assertEqual(submit_patch.call_count, 5)
+        self.assertEqual(sleep_patch.call_count, 2)
+
+    def test_set_users_not_internal_failure(self):
+        def submit(project_id, user_ids):
+            if 3 in user_ids:
+                raise ConnectionError("reset")
+
+        with patch.object(self.client, "_set_users_not_internal_chunk", side_effect=submit) as submit_patch:
+            with self.assertRaises(MelodiAPIError):
+                self.client.set_users_not_internal(1, list(range(6)), chunk_size=2)
+
+        # Every chunk is attempted, the failing one once
+        self.assertEqual(submit_patch.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
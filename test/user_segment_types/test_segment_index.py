@@ -0,0 +1,106 @@
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from melodi.user_segment_types.data_models import (UserSegmentDefinition,
+                                                   UserSegmentTypeDefinition)
+from melodi.cache import ResponseCache
+from melodi.user_segment_types.segment_index import UserSegmentIndex
+from melodi.user_segment_types.user_segment_types_client import \
+    UserSegmentTypesClient
+
+
+def _segment_type(type_id: int, name: str, segments: dict) -> UserSegmentTypeDefinition:
+    now = datetime.now()
+    return UserSegmentTypeDefinition(
+        id=type_id,
+        name=name,
+        organizationId=1,
+        segments=[
+            UserSegmentDefinition(
+                id=segment_id,
+                name=segment_name,
+                organizationId=1,
+                userSegmentTypeId=type_id,
+                createdAt=now,
+                updatedAt=now,
+            )
+            for segment_name, segment_id in segments.items()
+        ],
+        createdAt=now,
+        updatedAt=now,
+    )
+
+
+class TestUserSegmentIndex(unittest.TestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        self.client.get.return_value = [
+            _segment_type(1, "plan", {"free": 10, "enterprise": 11}),
+            _segment_type(2, "region", {"eu": 20}),
+        ]
+
+    @patch("melodi.user_segment_types.segment_index.time.monotonic")
+    def test_resolve(self, monotonic_patch):
+        monotonic_patch.return_value = 0
+        index = UserSegmentIndex(self.client, ttl=300, miss_refresh_interval=10)
+
+        self.assertEqual(index.resolve("plan", "enterprise"), (1, 11))
+        self.assertEqual(index.segment_id("region", "eu"), 20)
+        self.assertEqual(self.client.get.call_count, 1)
+
+        # Misses only refetch once the refresh interval has passed
+        self.assertIsNone(index.resolve("region", "us"))
+        self.assertEqual(self.client.get.call_count, 1)
+
+        monotonic_patch.return_value = 11
+        self.client.get.return_value = [_segment_type(2, "region", {"eu": 20, "us": 21})]
+        self.assertEqual(index.resolve("region", "us"), (2, 21))
+        self.assertEqual(self.client.get.call_count, 2)
+
+        monotonic_patch.return_value = 400
+        index.resolve("region", "eu")
+        self.assertEqual(self.client.get.call_count, 3)
+
+    def test_concurrent_resolves_refresh_once(self):
+        definitions = self.client.get.return_value
+
+        def get(query_params, use_cache=True):
+            time.sleep(0.05)
+            return definitions
+
+        self.client.get.side_effect = get
+        index = UserSegmentIndex(self.client)
+
+        threads = [threading.Thread(target=index.resolve, args=("plan", "free")) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.client.get.call_count, 1)
+
+    def test_refresh_bypasses_response_cache(self):
+        client = UserSegmentTypesClient(base_url="http://localhost", api_key="test")
+        client.cache = ResponseCache()
+        definitions = [[_segment_type(1, "plan", {"free": 10})], [_segment_type(1, "plan", {"free": 10, "pro": 12})]]
+
+        with patch.object(client, "_get", side_effect=[(definition, 100) for definition in definitions]):
+            index = UserSegmentIndex(client, miss_refresh_interval=0)
+            self.assertEqual(index.resolve("plan", "free"), (1, 10))
+            # The miss refetches the definitions instead of reading the cached ones
+            self.assertEqual(index.resolve("plan", "pro"), (1, 12))
+
+    def test_segment_ids(self):
+        index = UserSegmentIndex(self.client)
+
+        self.assertEqual(
+            index.segment_ids({"plan": ["free", "enterprise", "unknown"], "region": ["eu"]}),
+            [10, 11, 20],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from melodi.users.data_models import User, UserResponse, UsersQueryParams
+from melodi.users.user_client import UserClient
+
+
+def _create_or_update(user):
+    if user.externalId == "broken":
+        raise ValueError("Invalid user")
+    return UserResponse(id=1, externalId=user.externalId, segments=[])
+
+
+class TestUserClient(unittest.TestCase):
+    def setUp(self):
+        self.client = UserClient(base_url="http://localhost", api_key="test")
+
+    def test_iter_all(self):
+        self.assertEqual(list(self.client.iter_all(UsersQueryParams(pageSize=10))), [])
+
+    def test_create_or_update_many(self):
+        users = [User(externalId=f"user-{i}", name=f"User {i}") for i in range(7)] + [User(externalId="broken")]
+
+        with patch.object(self.client, "create_or_update", side_effect=_create_or_update) as upsert_patch:
+            results = self.client.create_or_update_many(users, max_workers=2)
+
+            self.assertEqual([result.item for result in results], users)
+            self.assertEqual(upsert_patch.call_count, 8)
+            self.assertEqual(results[0].result.externalId, "user-0")
+            self.assertIsInstance(results[-1].error, ValueError)
+            self.assertEqual(len(self.client.synced_hashes), 7)
+
+            users[1] = User(externalId="user-1", name="Renamed")
+            results = self.client.create_or_update_many(users)
+
+            self.assertEqual(upsert_patch.call_count, 10)
+            self.assertEqual(
+                [result.skipped for result in results],
+                [True, False, True, True, True, True, True, False],
+            )
+
+    def test_create_or_update_many_is_concurrent(self):
+        users = [User(externalId=f"user-{i}") for i in range(4)]
+        barrier = threading.Barrier(4, timeout=5)
+
+        def create_or_update(user):
+            # Only returns once all four upserts are in flight together
+            barrier.wait()
+            return _create_or_update(user)
+
+        with patch.object(self.client, "create_or_update", side_effect=create_or_update):
+            results = self.client.create_or_update_many(users, max_workers=4)
+
+        self.assertTrue(all(result.ok for result in results))
+
+    def test_create_or_update_many_with_synced_hashes(self):
+        synced_hashes = {}
+        users = [User(externalId="user-1")]
+
+        with patch.object(self.client, "create_or_update", side_effect=_create_or_update):
+            self.client.create_or_update_many(users, synced_hashes=synced_hashes)
+            results = UserClient("http://localhost", "test").create_or_update_many(users, synced_hashes=synced_hashes)
+
+        self.assertEqual(list(synced_hashes), ["user-1"])
+        self.assertTrue(results[0].skipped)
+
+
+if __name__ == "__main__":
+    unittest.main()
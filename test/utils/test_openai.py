@@ -0,0 +1,19 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from melodi.utils.openai import _capture_breaker
+
+
+class TestCaptureBreaker(unittest.TestCase):
+    def test_off_by_default(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(_capture_breaker())
+
+    def test_opt_in(self):
+        with patch.dict(os.environ, {"MELODI_CAPTURE_BREAKER": "true", "MELODI_CAPTURE_TIMEOUT": "2.5"}):
+            self.assertEqual(_capture_breaker().call_timeout, 2.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
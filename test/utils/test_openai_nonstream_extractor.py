@@ -1,13 +1,13 @@
 import unittest
 from unittest.mock import patch
 
-from melodi.messages.data_models import Message
 from melodi.utils.openai_nonstream_extractor import (
     _get_response_metadata,
     _extract_chat_base_response,
     _get_melodi_messages_from_openai_response, create_melodi_thread_from_openai_response,
 )
 from melodi.utils.openai_utils import OpenAiDefinition
+from melodi.utils.records import MessageRecord
 
 
 class TestOpenAINonstreamExtractorTests(unittest.TestCase):
@@ -145,7 +145,7 @@ class TestOpenAINonstreamExtractorTests(unittest.TestCase):
         self.assertEqual(
             messages,
             [
-                Message(
+                MessageRecord(
                     externalId="message_1",
                     role="New Role",
                     content="Hi",
@@ -179,6 +179,7 @@ class TestOpenAINonstreamExtractorTests(unittest.TestCase):
                 "melodi_messages": [],
                 "response_id": None,
                 "prompt_messages": [],
+                "prompt_metadata": None,
             }
         )
 
@@ -214,7 +215,7 @@ class TestOpenAINonstreamExtractorTests(unittest.TestCase):
             {
                 "melodi_client": None,
                 "melodi_messages": [
-                    Message(
+                    MessageRecord(
                         externalId="message_1",
                         role="New Role",
                         content="Hi",
@@ -231,6 +232,7 @@ class TestOpenAINonstreamExtractorTests(unittest.TestCase):
                 ],
                 "response_id": "message_1",
                 "prompt_messages": [],
+                "prompt_metadata": None,
             }
         )
 
@@ -1,6 +1,5 @@
 import unittest
 
-from melodi.messages.data_models import Message
 from melodi.utils.openai_prompt_parser import (
     _process_prompt_message,
     _extract_chat_prompt,
@@ -8,6 +7,7 @@ from melodi.utils.openai_prompt_parser import (
     _get_melodi_messages_from_openai_prompt,
 )
 from melodi.utils.openai_utils import OpenAiDefinition
+from melodi.utils.records import MessageRecord
 
 
 class TestOpenAIPromptParserTests(unittest.TestCase):
@@ -66,7 +66,20 @@ class TestOpenAIPromptParserTests(unittest.TestCase):
             _extract_chat_prompt({"messages": ["hello"]}),
             {"messages": ["hello"]},
         )
-        # TODO add unit tests for function_calls, functions, tools
+        self.assertEqual(
+            _extract_chat_prompt(
+                {
+                    "messages": [],
+                    "function_call": "auto",
+                    "tools": [{"type": "function", "function": {"name": "test"}}],
+                }
+            ),
+            {
+                "function_call": "auto",
+                "tools": '[{"type": "function", "function": {"name": "test"}}]',
+                "messages": [],
+            },
+        )
 
     def test_get_generation_metadata(self):
         self.assertEqual(
@@ -115,7 +128,7 @@ class TestOpenAIPromptParserTests(unittest.TestCase):
                     sync=True,
                 ),
             ),
-            [],
+            ([], {}),
         )
         self.assertEqual(
             _get_melodi_messages_from_openai_prompt(
@@ -128,7 +141,7 @@ class TestOpenAIPromptParserTests(unittest.TestCase):
                     sync=True,
                 ),
             ),
-            [],
+            ([], {}),
         )
         self.assertEqual(
             _get_melodi_messages_from_openai_prompt(
@@ -141,7 +154,7 @@ class TestOpenAIPromptParserTests(unittest.TestCase):
                     sync=True,
                 ),
             ),
-            [],
+            ([], {}),
         )
 
         self.assertEqual(
@@ -159,34 +172,39 @@ class TestOpenAIPromptParserTests(unittest.TestCase):
                     sync=True,
                 ),
             ),
-            [
-                Message(
-                    externalId=f"input_0",
-                    role="Test_Role",
-                    content="Hello World",
-                    metadata={
-                        "type": "input_message",
-                        "frequency_penalty": 0,
-                        "logprobs": 0,
-                        "n": 1,
-                        "parallel_tool_calls": 1,
-                        "presence_penalty": 0,
-                        "reasoning_effort": "medium",
-                        "service_tier": "auto",
-                        "store": 0,
-                        "stream": 0,
-                        "temperature": 1,
-                        "top_p": 1,
-                    },
-                )
-            ],
-        ),
+            (
+                [
+                    MessageRecord(
+                        externalId=f"input_0",
+                        role="Test_Role",
+                        content="Hello World",
+                        metadata={"type": "input_message"},
+                    )
+                ],
+                {
+                    "frequency_penalty": 0,
+                    "logprobs": 0,
+                    "n": 1,
+                    "parallel_tool_calls": 1,
+                    "presence_penalty": 0,
+                    "reasoning_effort": "medium",
+                    "service_tier": "auto",
+                    "store": 0,
+                    "stream": 0,
+                    "temperature": 1,
+                    "top_p": 1,
+                },
+            ),
+        )
 
         self.assertEqual(
             _get_melodi_messages_from_openai_prompt(
                 kwargs={
                     "prompt": {
-                        "messages": [{"role": "test_role", "content": "Hello World"}, {"role": "system", "content": "Hello World Back"}]
+                        "messages": [
+                            {"role": "test_role", "content": "Hello World"},
+                            {"role": "system", "content": "Hello World Back"},
+                        ]
                     },
                     "temperature": 4
                 },
@@ -198,54 +216,45 @@ class TestOpenAIPromptParserTests(unittest.TestCase):
                     sync=True,
                 ),
             ),
-            [
-                Message(
-                    externalId=f"input_0",
-                    role="Test_Role",
-                    content="Hello World",
-                    metadata={
-                        "type": "input_message",
-                        "frequency_penalty": 0,
-                        "logprobs": 0,
-                        "n": 1,
-                        "parallel_tool_calls": 1,
-                        "presence_penalty": 0,
-                        "reasoning_effort": "medium",
-                        "service_tier": "auto",
-                        "store": 0,
-                        "stream": 0,
-                        "temperature": 4,
-                        "top_p": 1,
-                    },
-                ),
-                Message(
-                    externalId=f"input_1",
-                    role="System",
-                    content="Hello World Back",
-                    metadata={
-                        "type": "input_message",
-                        "frequency_penalty": 0,
-                        "logprobs": 0,
-                        "n": 1,
-                        "parallel_tool_calls": 1,
-                        "presence_penalty": 0,
-                        "reasoning_effort": "medium",
-                        "service_tier": "auto",
-                        "store": 0,
-                        "stream": 0,
-                        "temperature": 4,
-                        "top_p": 1,
-                    },
-                )
-            ],
+            (
+                [
+                    MessageRecord(
+                        externalId=f"input_0",
+                        role="Test_Role",
+                        content="Hello World",
+                        metadata={"type": "input_message"},
+                    ),
+                    MessageRecord(
+                        externalId=f"input_1",
+                        role="System",
+                        content="Hello World Back",
+                        metadata={"type": "input_message"},
+                    ),
+                ],
+                {
+                    "frequency_penalty": 0,
+                    "logprobs": 0,
+                    "n": 1,
+                    "parallel_tool_calls": 1,
+                    "presence_penalty": 0,
+                    "reasoning_effort": "medium",
+                    "service_tier": "auto",
+                    "store": 0,
+                    "stream": 0,
+                    "temperature": 4,
+                    "top_p": 1,
+                },
+            ),
         )
 
         self.assertEqual(
             _get_melodi_messages_from_openai_prompt(
                 kwargs={
                     "prompt": {
-                        "messages": [{"role": "test_role", "content": "Hello World"},
-                                     {"role": "system", "content": "Hello World Back"}]
+                        "messages": [
+                            {"role": "test_role", "content": "Hello World"},
+                            {"role": "system", "content": "Hello World Back"},
+                        ]
                     },
                     "temperature": 4
                 },
@@ -257,68 +266,61 @@ class TestOpenAIPromptParserTests(unittest.TestCase):
                     sync=True,
                 ),
             ),
-            [],
+            ([], {}),
         )
 
-        self.assertEqual(
-            _get_melodi_messages_from_openai_prompt(
-                kwargs={
-                    "messages": [
-                        {"role": "test_role", "content": "Hello World"},
-                        {"role": "system", "content": "Hello World Back"}
-                    ],
-                    "temperature": 4,
-                    "frequency_penalty": 2,
-                },
-                openai_resource=OpenAiDefinition(
-                    module="openai",
-                    object="Completion",
-                    method="create",
-                    type="chat",
-                    sync=True,
-                ),
+        messages, metadata = _get_melodi_messages_from_openai_prompt(
+            kwargs={
+                "messages": [
+                    {"role": "test_role", "content": "Hello World"},
+                    {"role": "system", "content": "Hello World Back"}
+                ],
+                "tools": [{"type": "function", "function": {"name": "test"}}],
+                "temperature": 4,
+                "frequency_penalty": 2,
+            },
+            openai_resource=OpenAiDefinition(
+                module="openai",
+                object="Completion",
+                method="create",
+                type="chat",
+                sync=True,
             ),
+        )
+        self.assertEqual(
+            messages,
             [
-                Message(
+                MessageRecord(
                     externalId=f"input_0",
                     role="Test_Role",
                     content="Hello World",
-                    metadata={
-                        "type": "input_message",
-                        "frequency_penalty": 2,
-                        "logprobs": 0,
-                        "n": 1,
-                        "parallel_tool_calls": 1,
-                        "presence_penalty": 0,
-                        "reasoning_effort": "medium",
-                        "service_tier": "auto",
-                        "store": 0,
-                        "stream": 0,
-                        "temperature": 4,
-                        "top_p": 1,
-                    },
+                    metadata={"type": "input_message"},
                 ),
-                Message(
+                MessageRecord(
                     externalId=f"input_1",
                     role="System",
                     content="Hello World Back",
-                    metadata={
-                        "type": "input_message",
-                        "frequency_penalty": 2,
-                        "logprobs": 0,
-                        "n": 1,
-                        "parallel_tool_calls": 1,
-                        "presence_penalty": 0,
-                        "reasoning_effort": "medium",
-                        "service_tier": "auto",
-                        "store": 0,
-                        "stream": 0,
-                        "temperature": 4,
-                        "top_p": 1,
-                    },
-                )
+                    metadata={"type": "input_message"},
+                ),
             ],
         )
+        self.assertEqual(
+            metadata,
+            {
+                "tools": '[{"type": "function", "function": {"name": "test"}}]',
+                "frequency_penalty": 2,
+                "logprobs": 0,
+                "n": 1,
+                "parallel_tool_calls": 1,
+                "presence_penalty": 0,
+                "reasoning_effort": "medium",
+                "service_tier": "auto",
+                "store": 0,
+                "stream": 0,
+                "temperature": 4,
+                "top_p": 1,
+            },
+        )
 
 
 if __name__ == "__main__":
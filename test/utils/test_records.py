@@ -0,0 +1,45 @@
+import unittest
+
+from melodi.messages.data_models import Message
+from melodi.utils.records import MessageRecord, to_messages
+
+
+class TestRecords(unittest.TestCase):
+    def test_to_message(self):
+        record = MessageRecord(
+            externalId="input_0",
+            role="User",
+            content="Hello World",
+            metadata={"type": "input_message", "logprobs": False},
+        )
+
+        self.assertEqual(
+            record.to_message(),
+            Message(
+                externalId="input_0",
+                role="User",
+                content="Hello World",
+                metadata={"type": "input_message", "logprobs": 0},
+            ),
+        )
+
+    def test_to_messages(self):
+        message = Message(externalId="input_0", role="User", content="Hi")
+        record = MessageRecord(externalId="input_1", role="Assistant", content="Hello")
+
+        self.assertEqual(
+            to_messages([message, record]),
+            [message, Message(externalId="input_1", role="Assistant", content="Hello")],
+        )
+
+    def test_slots(self):
+        record = MessageRecord(role="User")
+
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertEqual(record.metadata, {})
+        self.assertEqual(record, MessageRecord(role="User"))
+        self.assertNotEqual(record, MessageRecord(role="Assistant"))
+
+
+if __name__ == "__main__":
+    unittest.main()
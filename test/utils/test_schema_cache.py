@@ -0,0 +1,84 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from melodi.utils.schema_cache import SchemaCache, mark_schemas_sent, schema_cache, serialize_schema
+
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_current_weather",
+            "parameters": {"type": "object", "properties": {"location": {"type": "string"}}},
+        },
+    }
+]
+
+
+class TestSchemaCache(unittest.TestCase):
+    def setUp(self):
+        schema_cache.clear()
+
+    def test_serialize_reuses_identity(self):
+        cache = SchemaCache()
+        serialized, digest = cache.serialize(TOOLS)
+
+        self.assertEqual(serialized, json.dumps(TOOLS))
+
+        with patch("melodi.utils.schema_cache.parse_metadata_value") as parse_patch:
+            self.assertEqual(cache.serialize(TOOLS), (serialized, digest))
+            parse_patch.assert_not_called()
+
+    def test_serialize_detects_in_place_mutation(self):
+        cache = SchemaCache()
+        tools = json.loads(json.dumps(TOOLS))
+        first, digest = cache.serialize(tools)
+
+        tools[0]["function"]["parameters"]["properties"]["unit"] = {"type": "string"}
+        second, second_digest = cache.serialize(tools)
+
+        self.assertEqual(second, json.dumps(tools))
+        self.assertNotEqual(second_digest, digest)
+        self.assertEqual(cache.serialize(tools), (second, second_digest))
+
+    def test_serialize_shares_equal_content(self):
+        cache = SchemaCache()
+        first, digest = cache.serialize(TOOLS)
+        second, second_digest = cache.serialize(json.loads(json.dumps(TOOLS)))
+
+        self.assertIs(first, second)
+        self.assertEqual(digest, second_digest)
+
+    def test_serialize_is_bounded(self):
+        cache = SchemaCache(maxsize=2)
+        schemas = [[{"name": f"tool_{i}"}] for i in range(5)]
+        for schema in schemas:
+            cache.serialize(schema)
+
+        self.assertEqual(len(cache._by_identity), 2)
+        self.assertEqual(len(cache._by_digest), 2)
+
+        digest = cache.serialize(schemas[4])[1]
+        cache.mark_sent(digest)
+        for schema in schemas[:2]:
+            cache.serialize(schema)
+        self.assertFalse(cache.is_sent(digest))
+
+    def test_serialize_schema(self):
+        self.assertEqual(serialize_schema("function_call", "auto"), {"function_call": "auto"})
+        self.assertEqual(serialize_schema("tools", TOOLS), {"tools": json.dumps(TOOLS)})
+
+    @patch.dict("os.environ", {"MELODI_REFERENCE_SCHEMAS_BY_HASH": "true"})
+    def test_serialize_schema_by_hash(self):
+        first = serialize_schema("tools", TOOLS)
+        self.assertEqual(first["tools"], json.dumps(TOOLS))
+
+        # Embedded until a thread carrying the schema was created
+        self.assertEqual(serialize_schema("tools", TOOLS), first)
+
+        mark_schemas_sent(first)
+        self.assertEqual(serialize_schema("tools", TOOLS), {"tools_hash": first["tools_hash"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
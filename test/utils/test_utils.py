@@ -0,0 +1,105 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from melodi.circuit_breaker import CircuitBreaker
+from melodi.messages.data_models import Message
+from melodi.utils.records import MessageRecord
+from melodi.utils.schema_cache import schema_cache, serialize_schema
+from melodi.utils.utils import create_error_melodi_thread, create_melodi_thread
+
+
+class TestUtils(unittest.TestCase):
+    def test_create_melodi_thread(self):
+        melodi_client = MagicMock(capture_breaker=None)
+        create_melodi_thread(
+            melodi_client=melodi_client,
+            melodi_messages=[MessageRecord(externalId="response_1", role="Assistant", content="Hi")],
+            response_id="response_1",
+            prompt_messages=[
+                MessageRecord(
+                    externalId="input_0",
+                    role="User",
+                    content="Hello",
+                    metadata={"type": "input_message"},
+                )
+            ],
+            prompt_metadata={"temperature": 1, "store": False},
+        )
+
+        thread = melodi_client.threads.create.call_args.args[0]
+        self.assertEqual(thread.externalId, "response_1")
+        self.assertEqual(
+            thread.messages,
+            [
+                Message(
+                    externalId="input_0",
+                    role="User",
+                    content="Hello",
+                    metadata={"type": "input_message"},
+                ),
+                Message(externalId="response_1", role="Assistant", content="Hi"),
+            ],
+        )
+        self.assertEqual(thread.metadata["temperature"], 1)
+        self.assertEqual(thread.metadata["store"], 0)
+        self.assertEqual(thread.metadata["response_id"], "response_1")
+
+    def test_create_error_melodi_thread(self):
+        melodi_client = MagicMock(capture_breaker=None)
+        create_error_melodi_thread(
+            melodi_client=melodi_client,
+            prompt_messages=[MessageRecord(externalId="input_0", role="User", content="Hello")],
+            prompt_metadata={"temperature": 1},
+            model="gpt-4o",
+            exception="Rate limited",
+        )
+
+        thread = melodi_client.threads.create.call_args.args[0]
+        self.assertEqual(len(thread.messages), 1)
+        self.assertEqual(thread.metadata["temperature"], 1)
+        self.assertEqual(thread.metadata["model"], "gpt-4o")
+        self.assertEqual(thread.metadata["openai_error"], "Rate limited")
+
+    def test_records_are_validated_off_the_calling_thread(self):
+        melodi_client = MagicMock(capture_breaker=CircuitBreaker(call_timeout=5), capture_spool=None)
+        validated_on = []
+
+        def to_messages(records):
+            validated_on.append(threading.current_thread())
+            return []
+
+        with patch("melodi.utils.utils.to_messages", side_effect=to_messages):
+            create_melodi_thread(
+                melodi_client=melodi_client,
+                melodi_messages=[MessageRecord(role="Assistant", content="Hi")],
+                response_id="response_1",
+                prompt_messages=[],
+            )
+
+        melodi_client.threads.create.assert_called_once()
+        self.assertEqual(len(validated_on), 1)
+        self.assertIsNot(validated_on[0], threading.current_thread())
+
+    @patch.dict("os.environ", {"MELODI_REFERENCE_SCHEMAS_BY_HASH": "true"})
+    def test_schema_marked_sent_only_after_create(self):
+        schema_cache.clear()
+        tools = [{"type": "function", "function": {"name": "lookup"}}]
+        melodi_client = MagicMock(capture_breaker=None)
+        melodi_client.threads.create.side_effect = [Exception("Unavailable"), None, None]
+
+        for _ in range(2):
+            create_error_melodi_thread(
+                melodi_client=melodi_client,
+                prompt_messages=[],
+                prompt_metadata=serialize_schema("tools", tools),
+                model=None,
+                exception="Rate limited",
+            )
+        self.assertIn("tools", melodi_client.threads.create.call_args.args[0].metadata)
+
+        self.assertNotIn("tools", serialize_schema("tools", tools))
+
+
+if __name__ == "__main__":
+    unittest.main()